@@ -15,12 +15,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import getpass
 import sys
 
 import click
 from click_option_group import optgroup
 
+from ibx_sdk.bin.session import wapi_login
 from ibx_sdk.logger.ibx_logger import init_logger, increase_log_level
 from ibx_sdk.nios.exceptions import WapiRequestException
 from ibx_sdk.nios.gift import Gift
@@ -74,6 +74,11 @@ def cli():
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
 @optgroup.option("--debug", is_flag=True, help="enable verbose debug output")
 def upload(
     grid_mgr: str,
@@ -81,6 +86,7 @@ def upload(
     filename: str,
     username: str,
     wapi_ver: str,
+    session_cache: bool,
     certificate_usage: str,
     debug: bool,
 ):
@@ -89,10 +95,9 @@ def upload(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
 
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
@@ -127,12 +132,18 @@ def upload(
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
 @optgroup.option("--debug", is_flag=True, help="enable verbose debug output")
 def download(
     grid_mgr: str,
     member: str,
     username: str,
     wapi_ver: str,
+    session_cache: bool,
     certificate_usage: str,
     debug: bool,
 ):
@@ -141,10 +152,9 @@ def download(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
 
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
@@ -183,6 +193,11 @@ def download(
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
 @optgroup.group("Optional Certificate Parameters")
 @optgroup.option(
     "-a", "--algorithm", default="SHA-256", type=ALGORITHMS, help="The digest algorithm"
@@ -210,6 +225,7 @@ def selfsign(
     days_valid: int,
     username: str,
     wapi_ver: str,
+    session_cache: bool,
     algorithm: str,
     certificate_usage: str,
     comment: str,
@@ -228,10 +244,9 @@ def selfsign(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
 
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
@@ -291,6 +306,11 @@ def selfsign(
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
 @optgroup.group("Optional Certificate Parameters")
 @optgroup.option(
     "-a", "--algorithm", default="SHA-256", type=ALGORITHMS, help="The digest algorithm"
@@ -317,6 +337,7 @@ def gencsr(
     member: str,
     username: str,
     wapi_ver: str,
+    session_cache: bool,
     algorithm: str,
     certificate_usage: str,
     comment: str,
@@ -335,10 +356,9 @@ def gencsr(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
 
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
@@ -15,12 +15,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import getpass
+import os
 import sys
+from datetime import datetime
 
 import click
 from click_option_group import optgroup
 
+from ibx_sdk.bin.session import wapi_login
 from ibx_sdk.logger.ibx_logger import init_logger, increase_log_level
 from ibx_sdk.nios.exceptions import WapiRequestException
 from ibx_sdk.nios.gift import Gift
@@ -38,6 +40,10 @@ wapi = Gift()
 
 help_text = """
 CSV Export by object
+
+Export several objects concurrently with a comma separated --obj list, or all
+common objects with --all. The files are saved in a dated directory under
+--output-dir, with a manifest.json of their row counts, sizes and durations.
 """
 
 
@@ -59,11 +65,55 @@ CSV Export by object
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
-@optgroup.option("-o", "--obj", default="network", help="WAPI export object type")
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
+@optgroup.option(
+    "-o",
+    "--obj",
+    default="network",
+    show_default=True,
+    help="WAPI export object type(s), comma separated",
+)
+@optgroup.option(
+    "--all", "all_objects", is_flag=True, help="export all common object types"
+)
+@optgroup.option(
+    "-d",
+    "--output-dir",
+    default=".",
+    show_default=True,
+    help="directory for the dated export directory of several objects",
+)
+@optgroup.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="objects to export concurrently",
+)
+@optgroup.option(
+    "-z",
+    "--compress",
+    type=click.Choice(["gzip", "zstd"]),
+    help="compress the export file",
+)
 @optgroup.group("Logging Parameters")
 @optgroup.option("--debug", is_flag=True, help="enable verbose debug output")
 def main(
-    grid_mgr: str, filename: str, username: str, wapi_ver: str, obj: str, debug: bool
+    grid_mgr: str,
+    filename: str,
+    username: str,
+    wapi_ver: str,
+    session_cache: bool,
+    obj: str,
+    all_objects: bool,
+    output_dir: str,
+    workers: int,
+    compress: str,
+    debug: bool,
 ) -> None:
     """
     CSV Export
@@ -73,7 +123,12 @@ def main(
         grid_mgr (str): Manager for the wapi grid.
         username (str): Username for the wapi connection.
         wapi_ver (str): Version of wapi.
-        obj (str): Object to be exported to CSV.
+        session_cache (bool): Reuse the grid session between runs.
+        obj (str): Object(s) to be exported to CSV, comma separated.
+        all_objects (bool): Export all common object types.
+        output_dir (str): Directory for the dated export directory of several objects.
+        workers (int): Number of objects to export concurrently.
+        compress (str): Compression (gzip or zstd) of the export file.
         filename (str): Filename/path where the CSV will be exported.
 
     Returns:
@@ -89,21 +144,59 @@ def main(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
 
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
     else:
         log.info("connected to Infoblox grid manager %s", wapi.grid_mgr)
 
+    objects = None if all_objects else [o.strip() for o in obj.split(",") if o.strip()]
+    if objects is not None and len(objects) == 1:
+        try:
+            wapi.csv_export(
+                wapi_object=objects[0], filename=filename, compress=compress
+            )
+        except WapiRequestException as err:
+            log.error(err)
+            sys.exit(1)
+        sys.exit()
+
+    if filename:
+        log.warning("ignoring --filename, exporting several objects")
+    export_dir = os.path.join(
+        output_dir, f"csvexport-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    )
     try:
-        wapi.csv_export(wapi_object=obj, filename=filename)
+        manifest = wapi.csv_export_bulk(
+            wapi_objects=objects,
+            output_dir=export_dir,
+            workers=workers,
+            compress=compress,
+        )
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
+    for result in manifest["objects"]:
+        if result["status"] == "ok":
+            log.info(
+                "%s: %d rows, %d bytes in %.1fs",
+                result["object"],
+                result["rows"],
+                result["size"],
+                result["seconds"],
+            )
+    if manifest["failed"]:
+        log.error(
+            "%d of %d objects failed, see %s",
+            manifest["failed"],
+            manifest["total"],
+            os.path.join(export_dir, "manifest.json"),
+        )
+        sys.exit(1)
+    log.info("exported %d objects into %s", manifest["total"], export_dir)
 
     sys.exit()
 
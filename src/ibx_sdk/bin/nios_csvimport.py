@@ -15,14 +15,15 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import getpass
 import sys
 
 import click
 from click_option_group import optgroup
 
+from ibx_sdk.bin.session import wapi_login
 from ibx_sdk.logger.ibx_logger import init_logger, increase_log_level
-from ibx_sdk.nios.exceptions import WapiRequestException
+from ibx_sdk.nios.csv.reader import count_file_rows
+from ibx_sdk.nios.exceptions import BaseWapiException, WapiRequestException
 from ibx_sdk.nios.gift import Gift
 
 log = init_logger(
@@ -68,6 +69,28 @@ CSV Import Data
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
+@optgroup.option(
+    "--wait",
+    is_flag=True,
+    help="wait for the import to finish, fetching the csv-errors file on failure",
+)
+@optgroup.option(
+    "--shard-rows",
+    type=click.IntRange(min=1),
+    help="import the file as shards of this many rows, in dependency order",
+)
+@optgroup.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="shards of different object types to import at the same time",
+)
 @optgroup.group("Logging Parameters")
 @optgroup.option("--debug", is_flag=True, help="enable verbose debug output")
 def main(
@@ -76,6 +99,10 @@ def main(
     operation: str,
     username: str,
     wapi_ver: str,
+    session_cache: bool,
+    wait: bool,
+    shard_rows: int,
+    concurrency: int,
     debug: bool,
 ) -> None:
     """
@@ -86,8 +113,12 @@ def main(
         grid_mgr (str): Manager for the wapi grid.
         username (str): Username for the wapi connection.
         wapi_ver (str): Version of wapi.
+        session_cache (bool): Reuse the grid session between runs.
         operation (str): Operation to be performed on import.
         filename (str): Filename/path of csv file to be imported.
+        wait (bool): Wait for the import to finish.
+        shard_rows (int): Import the file as shards of this many rows.
+        concurrency (int): Number of shards imported at the same time.
 
     Returns:
         None
@@ -102,17 +133,34 @@ def main(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
+
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
     else:
         log.info("connected to Infoblox grid manager %s", wapi.grid_mgr)
 
+    if shard_rows:
+        try:
+            checkpoint = wapi.csv_import_sharded(
+                task_operation=operation,
+                csv_import_file=filename,
+                shard_rows=shard_rows,
+                concurrency=concurrency,
+            )
+        except BaseWapiException as err:
+            log.error(err)
+            sys.exit(1)
+        lines_failed = sum(shard["lines_failed"] for shard in checkpoint["shards"])
+        if lines_failed:
+            log.error("csv import completed, %d lines failed", lines_failed)
+            sys.exit(1)
+        sys.exit()
+
     try:
-        wapi.csv_import(
+        csvtask = wapi.csv_import(
             task_operation=operation,
             csv_import_file=filename,
             exit_on_error=False,
@@ -121,6 +169,23 @@ def main(
         log.error(err)
         sys.exit(1)
 
+    if wait:
+        try:
+            total = count_file_rows(filename)
+        except (OSError, ValueError) as err:
+            log.warning("unable to count the rows of %s: %s", filename, err)
+            total = None
+        try:
+            result = wapi.wait_csv_import(csvtask, total=total)
+        except WapiRequestException as err:
+            log.error(err)
+            sys.exit(1)
+        if result.failed:
+            log.error(
+                "csv import %s, %d lines failed", result.status, result.lines_failed
+            )
+            sys.exit(1)
+
     sys.exit()
 
 
@@ -15,12 +15,13 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import getpass
+import os
 import sys
 
 import click
-from click_option_group import optgroup
+from click_option_group import RequiredMutuallyExclusiveOptionGroup, optgroup
 
+from ibx_sdk.bin.session import wapi_login
 from ibx_sdk.logger.ibx_logger import init_logger, increase_log_level
 from ibx_sdk.nios.exceptions import WapiRequestException
 from ibx_sdk.nios.gift import Gift
@@ -48,7 +49,16 @@ Get NIOS File from member
 )
 @optgroup.group("Required Parameters")
 @optgroup.option("-g", "--grid-mgr", required=True, help="Infoblox Grid Manager")
-@optgroup.option("-m", "--member", required=True, help="Member to retrieve file from")
+@optgroup.group("Member Selection", cls=RequiredMutuallyExclusiveOptionGroup)
+@optgroup.option(
+    "-m",
+    "--member",
+    multiple=True,
+    help="Member to retrieve file from (repeat for several members)",
+)
+@optgroup.option(
+    "--all-members", is_flag=True, help="Retrieve file from all grid members"
+)
 @optgroup.group("Optional Parameters")
 @optgroup.option(
     "-u",
@@ -68,10 +78,38 @@ Get NIOS File from member
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
+@optgroup.option(
+    "-o",
+    "--output-dir",
+    default=".",
+    show_default=True,
+    help="directory for the files of several members",
+)
+@optgroup.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="members to retrieve file from concurrently",
+)
 @optgroup.group("Logging Parameters")
 @optgroup.option("--debug", is_flag=True, help="enable verbose debug output")
 def main(
-    grid_mgr: str, member: str, username: str, cfg_type: str, wapi_ver: str, debug: bool
+    grid_mgr: str,
+    member: tuple,
+    all_members: bool,
+    username: str,
+    cfg_type: str,
+    wapi_ver: str,
+    session_cache: bool,
+    output_dir: str,
+    workers: int,
+    debug: bool,
 ) -> None:
     """
     Get NIOS Configuration from Member
@@ -79,11 +117,15 @@ def main(
     Args:
         debug (bool): If True, it sets the log level to DEBUG. Default is False.
         grid_mgr (str): Manager for the wapi grid.
-        member (str): Grid Member
+        member (tuple): Grid Member(s)
+        all_members (bool): Retrieve from all grid members.
         username (str): Username for the wapi connection.
         cfg_type (str): Configuration Type: DNS_CACHE | DNS_CFG | DHCP_CFG | DHCPV6_CFG |
                                             TRAFFIC_CAPTURE_FILE | DNS_STATS | DNS_RECURSING_CACHE
         wapi_ver (str): Version of wapi.
+        session_cache (bool): Reuse the grid session between runs.
+        output_dir (str): Directory for the files of several members.
+        workers (int): Number of members to retrieve from concurrently.
 
     Returns:
         None
@@ -98,21 +140,40 @@ def main(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
 
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
     else:
         log.info("connected to Infoblox grid manager %s", wapi.grid_mgr)
 
-    try:
-        wapi.member_config(member=member, conf_type=cfg_type)
-    except WapiRequestException as err:
-        log.error(err)
-        sys.exit(1)
+    if len(member) == 1 and not all_members:
+        try:
+            wapi.member_config(member=member[0], conf_type=cfg_type)
+        except WapiRequestException as err:
+            log.error(err)
+            sys.exit(1)
+    else:
+        try:
+            manifest = wapi.member_config_bulk(
+                conf_type=cfg_type,
+                members=None if all_members else member,
+                output_dir=output_dir,
+                workers=workers,
+            )
+        except WapiRequestException as err:
+            log.error(err)
+            sys.exit(1)
+        if manifest["failed"]:
+            log.error(
+                "%d of %d members failed, see %s",
+                manifest["failed"],
+                manifest["total"],
+                os.path.join(output_dir, "manifest.json"),
+            )
+            sys.exit(1)
 
     log.info("finished!")
     sys.exit()
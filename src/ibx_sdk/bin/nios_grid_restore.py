@@ -15,12 +15,12 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import getpass
 import sys
 
 import click
 from click_option_group import optgroup
 
+from ibx_sdk.bin.session import wapi_login
 from ibx_sdk.logger.ibx_logger import init_logger, increase_log_level
 from ibx_sdk.nios.exceptions import WapiRequestException
 from ibx_sdk.nios.gift import Gift
@@ -78,6 +78,11 @@ Restore NIOS Grid.
 @optgroup.option(
     "-w", "--wapi-ver", default="2.11", show_default=True, help="Infoblox WAPI version"
 )
+@optgroup.option(
+    "--session-cache",
+    is_flag=True,
+    help="reuse the grid session between runs",
+)
 @optgroup.group("Logging Parameters")
 @optgroup.option("--debug", is_flag=True, help="Enable verbose logging")
 def main(
@@ -87,6 +92,7 @@ def main(
     mode: str,
     keep: bool,
     wapi_ver: str,
+    session_cache: bool,
     debug: bool,
 ) -> None:
     """
@@ -98,6 +104,7 @@ def main(
         grid_mgr (str): Manager for the wapi grid.
         username (str): Username for the wapi connection.
         wapi_ver (str): Version of wapi.
+        session_cache (bool): Reuse the grid session between runs.
         filename (str): Filename/path where the backup will be saved.
         keep: (bool): Keep existing
 
@@ -114,10 +121,9 @@ def main(
 
     wapi.grid_mgr = grid_mgr
     wapi.wapi_ver = wapi_ver
-    password = getpass.getpass(f"Enter password for [{username}]: ")
 
     try:
-        wapi.connect(username=username, password=password)
+        wapi_login(wapi, username, session_cache)
     except WapiRequestException as err:
         log.error(err)
         sys.exit(1)
@@ -0,0 +1,54 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import getpass
+import logging
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+from ibx_sdk.nios.gift import Gift
+from ibx_sdk.nios.session_store import SessionStore
+
+
+def wapi_login(wapi: Gift, username: str, session_cache: bool = False) -> None:
+    """
+    Log in to the Grid Manager, prompting for the password of the given username.
+
+    When `session_cache` is set, the session stored by a previous run for this grid manager
+    and username is reused, and the password is only prompted for if there is no stored
+    session or it has expired. The session of a new login is then stored for the next run.
+    Sessions are only cached encrypted: without a key in the IBX_SESSION_KEY environment
+    variable, or without the `cryptography` package, caching is disabled with a warning.
+
+    Args:
+        wapi (Gift): The Gift instance to connect.
+        username (str): The Infoblox admin username.
+        session_cache (bool): Reuse and store the session between runs. Default is False.
+
+    Raises:
+        WapiRequestException: If unable to connect to the Grid Manager.
+    """
+    store = None
+    if session_cache:
+        try:
+            store = SessionStore()
+        except WapiInvalidParameterException as err:
+            logging.warning("session cache disabled, logging in: %s", err)
+    if store is not None and wapi.resume_session(username, store):
+        logging.info("reusing cached session for %s", username)
+        return
+
+    password = getpass.getpass(f"Enter password for [{username}]: ")
+    wapi.connect(username=username, password=password, session_store=store)
@@ -0,0 +1,210 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from ibx_sdk.nios.ratelimit import RateLimiter
+
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class RetryStats:
+    """
+    Thread-safe counters of the retries performed by a WapiRetry policy.
+
+    Counters are kept per cause: `connect` (connection errors), `read` (errors while
+    reading the response), `status` (retryable status codes, e.g. 503), `other` and
+    `exhausted` (requests that failed after running out of retries).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.as_dict()})"
+
+    @property
+    def total(self) -> int:
+        """The total number of retries performed."""
+        with self._lock:
+            return sum(
+                count for cause, count in self._counts.items() if cause != "exhausted"
+            )
+
+    def record(self, cause: str) -> None:
+        """
+        Increment the counter for the given cause.
+        """
+        with self._lock:
+            self._counts[cause] += 1
+
+    def as_dict(self) -> dict:
+        """
+        Return a copy of the counters.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        """
+        Reset all counters to zero.
+        """
+        with self._lock:
+            self._counts.clear()
+
+
+class WapiRetry(Retry):
+    """
+    Retry policy for WAPI requests.
+
+    This is a `urllib3.util.retry.Retry` with defaults suited to the Grid: exponential
+    backoff with jitter, retries on 429/502/503/504 responses, and the Retry-After header
+    honoured. Only idempotent methods are retried on read errors and retryable status
+    codes, so a POST (object creation or a WAPI function call) is not sent twice unless
+    `retry_post` is set. Connection errors are retried for all methods, as the request
+    has not reached the Grid.
+
+    The final response is returned once the retries are exhausted, so the usual WAPI
+    error handling of Gift still applies. Every retry is counted in `stats`.
+
+    Args:
+        total (int): The maximum number of retries. Default is 3.
+        retry_post (bool): Also retry POST requests. Default is False.
+        stats (RetryStats, optional): Counters to record retries in. A new RetryStats is
+                                      created if not provided.
+        **kwargs: Keyword arguments passed to `urllib3.util.retry.Retry`.
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        retry_post: bool = False,
+        stats: Optional[RetryStats] = None,
+        **kwargs: Any,
+    ) -> None:
+        if "allowed_methods" not in kwargs:
+            kwargs["allowed_methods"] = Retry.DEFAULT_ALLOWED_METHODS | (
+                {"POST"} if retry_post else set()
+            )
+        kwargs.setdefault("status_forcelist", RETRY_STATUS_CODES)
+        kwargs.setdefault("backoff_factor", 0.5)
+        kwargs.setdefault("backoff_jitter", 0.5)
+        kwargs.setdefault("backoff_max", 60)
+        kwargs.setdefault("raise_on_status", False)
+        kwargs.setdefault("respect_retry_after_header", True)
+        self.stats = stats if stats is not None else RetryStats()
+        super().__init__(total=total, **kwargs)
+
+    def new(self, **kw: Any) -> "WapiRetry":
+        kw.setdefault("stats", self.stats)
+        return super().new(**kw)
+
+    def increment(
+        self,
+        method: Optional[str] = None,
+        url: Optional[str] = None,
+        response: Any = None,
+        error: Optional[Exception] = None,
+        _pool: Any = None,
+        _stacktrace: Any = None,
+    ) -> "WapiRetry":
+        try:
+            new_retry = super().increment(
+                method, url, response, error, _pool, _stacktrace
+            )
+        except MaxRetryError:
+            self.stats.record("exhausted")
+            raise
+        if error and self._is_connection_error(error):
+            cause = "connect"
+        elif error and self._is_read_error(error):
+            cause = "read"
+        elif error:
+            cause = "other"
+        else:
+            cause = "status"
+        self.stats.record(cause)
+        logging.warning(
+            "retrying %s %s (%s) - %s retries left",
+            method,
+            url,
+            error or (response.status if response else cause),
+            new_retry.total,
+        )
+        return new_retry
+
+
+class WapiHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter used by Gift to talk to the Grid.
+
+    In addition to the connection pool settings of `requests.adapters.HTTPAdapter`, this
+    adapter sets the socket options of every pooled connection.
+
+    Args:
+        tcp_nodelay (bool): Disable Nagle's algorithm on the connections. Default is True.
+        keep_alive (bool): Enable TCP keep-alive probes on the connections so that idle
+                           pooled connections are kept open. Default is True.
+        rate_limiter (RateLimiter, optional): Token bucket every request must take a token
+                                              from before it is sent. Default is None.
+        **kwargs: Keyword arguments passed to `requests.adapters.HTTPAdapter`, e.g.
+                  `pool_connections`, `pool_maxsize` and `max_retries`.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options", "rate_limiter"]
+
+    def __init__(
+        self,
+        tcp_nodelay: bool = True,
+        keep_alive: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.rate_limiter = rate_limiter
+        self.socket_options = []
+        if tcp_nodelay:
+            self.socket_options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+        if keep_alive:
+            self.socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, *args: Any, **kwargs: Any):
+        kwargs["socket_options"] = self.socket_options
+        return super().proxy_manager_for(*args, **kwargs)
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        if self.rate_limiter is None:
+            return super().send(request, *args, **kwargs)
+        self.rate_limiter.acquire()
+        start = time.monotonic()
+        response = super().send(request, *args, **kwargs)
+        self.rate_limiter.update(time.monotonic() - start, response.status_code)
+        return response
@@ -0,0 +1,253 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Union
+
+from requests import Response
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+from ibx_sdk.nios.gift import Gift
+from ibx_sdk.nios.ratelimit import RateLimiter
+
+
+class AsyncGift:
+    """Asyncio interface to the Infoblox WAPI.
+
+    AsyncGift mirrors the request methods of `Gift` as coroutines, so that many WAPI calls,
+    against one or many grids, can be awaited concurrently from a single event loop. The
+    number of requests in flight is capped by `max_concurrency`.
+
+    Each AsyncGift wraps a `Gift` instance; all of its requests share that instance's HTTP
+    session, connection pool and ibapauth cookie, so the grid is only logged in to once.
+    The blocking HTTP calls are run in a dedicated thread pool sized to `max_concurrency`,
+    and the connection pool of the wrapped Gift is sized to match. A `RateLimiter` passed
+    to AsyncGift (or to the wrapped Gift) also applies to these calls, and can be shared
+    with synchronous Gift instances. When a Gift instance is passed with `wapi`, the rate
+    limiter and connection pool size are installed on it, which requires it to not be
+    connected yet.
+
+    Attributes:
+        wapi (Gift): The wrapped Gift instance.
+        max_concurrency (int): The maximum number of concurrent WAPI requests.
+
+    Examples:
+
+    ```python
+    import asyncio
+
+    from ibx_sdk.nios.async_gift import AsyncGift
+
+
+    async def main():
+        async with AsyncGift('gm.example.com', '2.12', max_concurrency=20) as wapi:
+            await wapi.connect(username='admin', password='infoblox')
+            responses = await asyncio.gather(
+                *(wapi.get(ref) for ref in network_refs)
+            )
+
+
+    asyncio.run(main())
+    ```
+    """
+
+    def __init__(
+        self,
+        grid_mgr: str = None,
+        wapi_ver: str = "2.5",
+        ssl_verify: Union[bool, str] = False,
+        max_concurrency: int = 10,
+        wapi: Optional[Gift] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise WapiInvalidParameterException(
+                "max_concurrency must be a positive integer"
+            )
+        if wapi is None:
+            wapi = Gift(
+                grid_mgr=grid_mgr,
+                wapi_ver=wapi_ver,
+                ssl_verify=ssl_verify,
+                pool_maxsize=max_concurrency,
+                rate_limiter=rate_limiter,
+            )
+        else:
+            if rate_limiter is not None and wapi.rate_limiter not in (
+                None,
+                rate_limiter,
+            ):
+                raise WapiInvalidParameterException(
+                    "the Gift instance already has a different rate_limiter"
+                )
+            if wapi.conn is not None and (
+                (rate_limiter is not None and wapi.rate_limiter is None)
+                or wapi.pool_maxsize < max_concurrency
+            ):
+                # the connection pool and rate limiter of a session are set when it is
+                # created, at connect
+                raise WapiInvalidParameterException(
+                    "the Gift instance is already connected, set its rate_limiter and "
+                    "pool_maxsize instead"
+                )
+            if rate_limiter is not None:
+                wapi.rate_limiter = rate_limiter
+            wapi.pool_maxsize = max(wapi.pool_maxsize, max_concurrency)
+        self.wapi = wapi
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="ibx-async-gift"
+        )
+        self._semaphore = None
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(wapi={self.wapi!r}, "
+            f"max_concurrency={self.max_concurrency})"
+        )
+
+    async def __aenter__(self) -> "AsyncGift":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def grid_mgr(self) -> str:
+        """IP address or hostname of the Grid Manager."""
+        return self.wapi.grid_mgr
+
+    @grid_mgr.setter
+    def grid_mgr(self, value: str) -> None:
+        self.wapi.grid_mgr = value
+
+    @property
+    def wapi_ver(self) -> str:
+        """Version of the Infoblox WAPI."""
+        return self.wapi.wapi_ver
+
+    @wapi_ver.setter
+    def wapi_ver(self, value: str) -> None:
+        self.wapi.wapi_ver = value
+
+    @property
+    def ssl_verify(self) -> Union[bool, str]:
+        """Flag or CA bundle path used for SSL certificate verification."""
+        return self.wapi.ssl_verify
+
+    @ssl_verify.setter
+    def ssl_verify(self, value: Union[bool, str]) -> None:
+        self.wapi.ssl_verify = value
+
+    @property
+    def url(self) -> str:
+        """The WAPI base URL of the wrapped Gift instance."""
+        return self.wapi.url
+
+    @property
+    def grid_ref(self) -> Optional[str]:
+        """Reference ID of the connected grid."""
+        return self.wapi.grid_ref
+
+    def close(self) -> None:
+        """
+        Shut down the thread pool used to run the WAPI requests.
+        """
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        # the semaphore is created lazily so that it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def connect(
+        self, username: str = None, password: str = None, certificate: str = None
+    ) -> None:
+        """
+        Make a connection to the grid manager. See `Gift.connect`.
+        """
+        await self._run(
+            self.wapi.connect,
+            username=username,
+            password=password,
+            certificate=certificate,
+        )
+
+    async def object_fields(self, wapi_object: str) -> Union[str, None]:
+        """
+        Retrieve the readable fields of a WAPI object. See `Gift.object_fields`.
+        """
+        return await self._run(self.wapi.object_fields, wapi_object)
+
+    async def max_wapi_ver(self) -> None:
+        """
+        Retrieve and set the maximum supported WAPI version. See `Gift.max_wapi_ver`.
+        """
+        await self._run(self.wapi.max_wapi_ver)
+
+    async def get(
+        self, wapi_object: str, params: Optional[dict] = None, **kwargs: Any
+    ) -> Response:
+        """
+        Return WAPI object(s). See `Gift.get`.
+        """
+        return await self._run(self.wapi.get, wapi_object, params=params, **kwargs)
+
+    async def getone(
+        self, wapi_object: str, params: Optional[dict] = None, **kwargs: Any
+    ) -> str:
+        """
+        Return the reference of a single WAPI object. See `Gift.getone`.
+        """
+        return await self._run(self.wapi.getone, wapi_object, params=params, **kwargs)
+
+    async def post(
+        self,
+        wapi_object: str,
+        data: Optional[Union[dict, str]] = None,
+        json: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """
+        Create a WAPI object. See `Gift.post`.
+        """
+        return await self._run(
+            self.wapi.post, wapi_object, data=data, json=json, **kwargs
+        )
+
+    async def put(
+        self,
+        wapi_object_ref: str,
+        data: Optional[Union[dict, str]] = None,
+        **kwargs: Any,
+    ) -> Response:
+        """
+        Update a WAPI object by its _ref. See `Gift.put`.
+        """
+        return await self._run(self.wapi.put, wapi_object_ref, data=data, **kwargs)
+
+    async def delete(self, wapi_object_ref: str, **kwargs: Any) -> Response:
+        """
+        Delete a WAPI object by its _ref. See `Gift.delete`.
+        """
+        return await self._run(self.wapi.delete, wapi_object_ref, **kwargs)
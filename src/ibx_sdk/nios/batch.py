@@ -0,0 +1,286 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+from typing import Any, Literal, Optional
+
+import requests
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException, WapiRequestException
+
+BatchMethod = Literal["GET", "POST", "PUT", "DELETE"]
+
+
+class WapiBatchItem:
+    """
+    A single operation queued in a WapiBatch.
+
+    Attributes:
+        method (str): The HTTP method of the operation.
+        wapi_object (str): The WAPI object name or _ref the operation applies to.
+        data (dict, optional): The body of the operation.
+        args (dict, optional): The query arguments of the operation.
+        response (Any): The WAPI result of the operation once the batch has been flushed.
+        error (WapiRequestException, optional): The WAPI error if the operation failed.
+        done (bool): Whether the operation has been submitted to the Grid.
+    """
+
+    def __init__(
+        self,
+        method: BatchMethod,
+        wapi_object: str,
+        data: Optional[dict] = None,
+        args: Optional[dict] = None,
+    ) -> None:
+        self.method = method
+        self.wapi_object = wapi_object
+        self.data = data
+        self.args = args
+        self.response = None
+        self.error = None
+        self.done = False
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(method={self.method}, "
+            f"wapi_object={self.wapi_object}, done={self.done}, error={self.error})"
+        )
+
+    @property
+    def payload(self) -> dict:
+        """
+        The WAPI multi-request entry for this operation.
+        """
+        payload = {"method": self.method, "object": self.wapi_object}
+        if self.data is not None:
+            payload["data"] = self.data
+        if self.args:
+            payload["args"] = self.args
+        return payload
+
+    def result(self) -> Any:
+        """
+        Return the WAPI result of the operation.
+
+        Returns:
+            Any: The result returned by WAPI for this operation, e.g. the _ref of a created
+                 object or the list of objects of a GET.
+
+        Raises:
+            WapiRequestException: If the operation failed or has not been flushed yet.
+        """
+        if not self.done:
+            raise WapiRequestException("batch item has not been flushed")
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class WapiBatch:
+    """
+    Queue WAPI operations and submit them as WAPI multi-request (`request` object) calls.
+
+    Operations are queued with the `get`, `post`, `put` and `delete` methods, each of which
+    returns a `WapiBatchItem`. Once `chunk_size` operations are pending, they are submitted to
+    the Grid in a single request. Any remaining operations are submitted by `flush()`.
+
+    WAPI processes a multi-request as a single transaction, so one bad operation rolls back
+    its whole chunk. When WAPI rejects a chunk with a 400 error response, the chunk is split in
+    halves which are re-submitted, down to single operations, so that each item carries its
+    own result or error and the rest of the batch is unaffected.
+
+    A chunk which fails for another reason is not re-submitted: a connection error or
+    timeout, after which the Grid may have committed it, is raised as WapiRequestException
+    and set as the error of the operations of the chunk, and the other operations remain
+    pending. Other error responses, e.g. 401 or 403 when the session expired or lacks
+    permissions, and server errors are set as the error of the operations of the chunk.
+
+    Attributes:
+        wapi (Gift): The connected Gift instance used to submit the requests.
+        chunk_size (int): The maximum number of operations per multi-request.
+        items (list[WapiBatchItem]): All operations queued in this batch, in order.
+    """
+
+    def __init__(self, wapi, chunk_size: int = 100) -> None:
+        if chunk_size < 1:
+            raise WapiInvalidParameterException("chunk_size must be a positive integer")
+        self.wapi = wapi
+        self.chunk_size = chunk_size
+        self.items = []
+        self._pending = []
+
+    @property
+    def errors(self) -> list[WapiBatchItem]:
+        """
+        The flushed operations which failed.
+        """
+        return [item for item in self.items if item.error is not None]
+
+    def get(self, wapi_object: str, params: Optional[dict] = None) -> WapiBatchItem:
+        """
+        Queue a GET of WAPI object(s).
+
+        Args:
+            wapi_object: The name of the WAPI object (or _ref) to retrieve.
+            params: Optional search fields and arguments, as for `Gift.get`. The search
+                    fields are sent as the `data` of the request, and the underscore
+                    arguments, e.g. `_return_fields`, as its `args`.
+
+        Returns:
+            WapiBatchItem: The queued operation.
+        """
+        data = {}
+        args = {}
+        for key, value in (params or {}).items():
+            if key.startswith("_"):
+                args[key] = value
+            else:
+                data[key] = value
+        return self._queue(
+            WapiBatchItem("GET", wapi_object, data=data or None, args=args)
+        )
+
+    def post(
+        self,
+        wapi_object: str,
+        data: Optional[dict] = None,
+        params: Optional[dict] = None,
+    ) -> WapiBatchItem:
+        """
+        Queue the creation of a WAPI object.
+
+        Args:
+            wapi_object: The name of the WAPI object to create.
+            data: The properties of the new object.
+            params: Optional arguments, e.g. `_return_fields`.
+
+        Returns:
+            WapiBatchItem: The queued operation.
+        """
+        return self._queue(WapiBatchItem("POST", wapi_object, data=data, args=params))
+
+    def put(
+        self,
+        wapi_object_ref: str,
+        data: Optional[dict] = None,
+        params: Optional[dict] = None,
+    ) -> WapiBatchItem:
+        """
+        Queue the update of a WAPI object by its _ref.
+
+        Args:
+            wapi_object_ref: The reference string for the WAPI object.
+            data: The properties to update.
+            params: Optional arguments, e.g. `_return_fields`.
+
+        Returns:
+            WapiBatchItem: The queued operation.
+        """
+        return self._queue(
+            WapiBatchItem("PUT", wapi_object_ref, data=data, args=params)
+        )
+
+    def delete(
+        self, wapi_object_ref: str, params: Optional[dict] = None
+    ) -> WapiBatchItem:
+        """
+        Queue the deletion of a WAPI object by its _ref.
+
+        Args:
+            wapi_object_ref: The reference string for the WAPI object.
+            params: Optional arguments.
+
+        Returns:
+            WapiBatchItem: The queued operation.
+        """
+        return self._queue(WapiBatchItem("DELETE", wapi_object_ref, args=params))
+
+    def flush(self) -> list[WapiBatchItem]:
+        """
+        Submit all pending operations to the Grid.
+
+        Returns:
+            list[WapiBatchItem]: All operations queued in this batch.
+
+        Raises:
+            WapiRequestException: If a multi-request failed on a connection error or timeout.
+        """
+        while self._pending:
+            chunk = self._pending[: self.chunk_size]
+            del self._pending[: self.chunk_size]
+            self._submit(chunk)
+        return self.items
+
+    def _queue(self, item: WapiBatchItem) -> WapiBatchItem:
+        self.items.append(item)
+        self._pending.append(item)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+        return item
+
+    def _submit(self, chunk: list[WapiBatchItem]) -> None:
+        logging.debug("submitting multi-request of %s operation(s)", len(chunk))
+        try:
+            res = self.wapi.conn.request(
+                "post",
+                f"{self.wapi.url}/request",
+                json=[item.payload for item in chunk],
+                verify=self.wapi.ssl_verify,
+            )
+        except requests.exceptions.RequestException as err:
+            # the Grid may have committed the multi-request, so it is not sent again
+            error = WapiRequestException(err)
+            logging.error(error)
+            for item in chunk:
+                item.error = error
+                item.done = True
+            raise error from err
+
+        if res.status_code in (200, 201):
+            try:
+                results = res.json()
+            except ValueError:
+                results = None
+            if isinstance(results, list) and len(results) == len(chunk):
+                for item, result in zip(chunk, results):
+                    item.response = result
+                    item.done = True
+                return
+            error = WapiRequestException(
+                f"unexpected multi-request response: {res.text}"
+            )
+        elif res.status_code == 400 and res.text and len(chunk) > 1:
+            # WAPI rejected the whole transaction, find the bad operation(s) by halves
+            logging.warning(
+                "multi-request of %s operation(s) failed, retrying in halves",
+                len(chunk),
+            )
+            half = len(chunk) // 2
+            self._submit(chunk[:half])
+            self._submit(chunk[half:])
+            return
+        else:
+            error = WapiRequestException(res.text)
+            if len(chunk) == 1:
+                logging.error(
+                    "%s %s failed: %s", chunk[0].method, chunk[0].wapi_object, error
+                )
+            else:
+                logging.error(error)
+
+        for item in chunk:
+            item.error = error
+            item.done = True
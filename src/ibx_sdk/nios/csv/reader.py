@@ -0,0 +1,218 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import csv
+import inspect
+import io
+import types
+import typing
+from functools import lru_cache
+from logging import getLogger
+from typing import Dict, Iterable, Iterator, Optional, Type
+
+from pydantic import BaseModel
+
+from ibx_sdk.nios.csv import dhcp, dns, dns_records
+from ibx_sdk.nios.transfer import compression_from_filename, open_compressed
+
+LOG = getLogger(__name__)
+
+HEADER_PREFIX = "header-"
+EMPTY_VALUE = "<empty>"
+
+
+@lru_cache(maxsize=None)
+def csv_models() -> Dict[str, Type[BaseModel]]:
+    """
+    Return the CSV models of the dhcp, dns and dns_records modules by header column.
+
+    Returns:
+        dict: The model class of every `header-*` column, e.g. `header-network` maps to
+              `IPv4Network`.
+    """
+    models = {}
+    for module in (dhcp, dns, dns_records):
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if not issubclass(cls, BaseModel) or cls.__module__ != module.__name__:
+                continue
+            for field in cls.model_fields.values():
+                header = field.alias or field.serialization_alias or ""
+                if header.startswith(HEADER_PREFIX):
+                    models[header] = cls
+                    break
+    return models
+
+
+def model_for_header(header: str) -> Optional[Type[BaseModel]]:
+    """
+    Return the CSV model of a header column, or None if there is none.
+
+    Args:
+        header: The header column, e.g. `header-network` or `header-arecord`.
+    """
+    return csv_models().get(header.lower())
+
+
+def _is_list(annotation) -> bool:
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, getattr(types, "UnionType", None)):
+        return any(_is_list(arg) for arg in typing.get_args(annotation))
+    return annotation is list or origin is list
+
+
+@lru_cache(maxsize=None)
+def _columns(model: Type[BaseModel]) -> tuple:
+    """Map the CSV column names of a model to its validation keys and list fields."""
+    keys = {}
+    lists = set()
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        for column in (name, field.alias, field.serialization_alias):
+            if column:
+                keys[column] = key
+        if _is_list(field.annotation):
+            lists.add(key)
+    return keys, frozenset(lists)
+
+
+def row_to_model(model: Type[BaseModel], row: Dict[str, str]) -> BaseModel:
+    """
+    Validate a CSV row as a model.
+
+    The row is a mapping of column name to value, as written by NIOS. The required
+    column marker (`address*`) is removed, empty values are dropped, and comma separated
+    values of list fields are split. The NIOS `<empty>` value is an empty list for list
+    fields and dropped for the others. The `header-*` column selects the model and is not
+    passed on. Columns the model does not define, like `EA-*` extensible attributes,
+    are kept as extra fields.
+
+    Args:
+        model: The CSV model class, see `model_for_header`.
+        row: The CSV row.
+
+    Returns:
+        The validated model.
+
+    Raises:
+        pydantic.ValidationError: If the row is not valid for the model.
+    """
+    keys, lists = _columns(model)
+    data = {}
+    for column, value in row.items():
+        if column is None or value is None or value == "":
+            continue
+        column = column.rstrip("*")
+        if column.startswith(HEADER_PREFIX):
+            continue
+        key = keys.get(column, column)
+        if key in lists:
+            value = [item.strip() for item in value.split(",") if item.strip()]
+            if value == [EMPTY_VALUE]:
+                value = []
+        elif value == EMPTY_VALUE:
+            continue
+        data[key] = value
+    return model.model_validate(data)
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[BaseModel]:
+    """
+    Parse NIOS CSV data into models, one row at a time.
+
+    NIOS CSV data is made of sections, each starting with a header row whose first
+    column is `header-<object>`. Every following row is validated as the model of that
+    header, see `model_for_header`. Rows of a header without a model are skipped with a
+    warning.
+
+    Args:
+        lines: The CSV lines, e.g. an open file or a streamed response. Only one row is
+               held in memory at a time.
+
+    Returns:
+        An iterator of the validated models.
+
+    Raises:
+        pydantic.ValidationError: If a row is not valid for its model.
+
+    Example:
+
+    ```python
+    with open('networks.csv', newline='') as f:
+        for network in read_csv(f):
+            print(network.address, network.netmask)
+    ```
+    """
+    header = None
+    model = None
+    for values in csv.reader(lines):
+        if not any(value.strip() for value in values):
+            continue
+        first = values[0].lstrip("\ufeff").strip().lower()
+        if first.startswith(HEADER_PREFIX):
+            header = [value.strip() for value in values]
+            header[0] = first
+            model = model_for_header(first)
+            if model is None:
+                LOG.warning("skipping %s rows, no CSV model for this object", first)
+            continue
+        if header is None:
+            LOG.warning("skipping CSV row before the first header row")
+            continue
+        if model is None:
+            continue
+        yield row_to_model(model, dict(zip(header, values)))
+
+
+def count_rows(lines: Iterable[str]) -> int:
+    """
+    Count the data rows of NIOS CSV data, leaving out header and blank rows.
+
+    Args:
+        lines: The CSV lines, e.g. an open file.
+
+    Returns:
+        The number of data rows.
+    """
+    rows = 0
+    for values in csv.reader(lines):
+        if not any(value.strip() for value in values):
+            continue
+        if not values[0].lstrip("\ufeff").strip().lower().startswith(HEADER_PREFIX):
+            rows += 1
+    return rows
+
+
+def count_file_rows(filename: str) -> int:
+    """
+    Count the data rows of a NIOS CSV file, which may be '.gz' or '.zst' compressed.
+
+    Args:
+        filename: The path of the CSV file.
+
+    Returns:
+        The number of data rows.
+    """
+    compression = compression_from_filename(filename)
+    if compression:
+        file = io.TextIOWrapper(
+            open_compressed(filename, "rb", compression),
+            encoding="utf-8-sig",
+            newline="",
+        )
+    else:
+        file = open(filename, "r", encoding="utf-8-sig", newline="")
+    with file:
+        return count_rows(file)
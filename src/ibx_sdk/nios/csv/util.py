@@ -7,22 +7,39 @@ from ibx_sdk.nios.csv.enums import ImportActionEnum
 LOG = getLogger(__name__)
 
 
+def dump_row(item) -> dict:
+    """Dump a single item as a CSV row, by column name."""
+    return item.model_dump(by_alias=True, exclude_defaults=False, exclude_none=True)
+
+
 def extract_columns(item) -> list:
     """Extract column names from a single item."""
-    return item.model_dump(
-        by_alias=True, exclude_defaults=False, exclude_none=True
-    ).keys()
+    return dump_row(item).keys()
+
+
+def get_header(*, data: list, rows: list = None) -> list:
+    """
+    Generate a unique header from the given data.
 
+    The columns are in the order they first appear in the items. Each item is dumped
+    once, and the dumps can be kept to write the rows without dumping them again.
 
-def get_header(*, data: list) -> list:
-    """Generate a unique header from the given data."""
-    header_columns = []
+    Args:
+        data: list of objects
+        rows: optional list, extended with the dump of every object, see `dump_row`
+
+    Returns:
+        The column names.
+    """
+    # a dict is an insertion ordered set of its keys, the values are not used
+    header_columns = {}
     for item in data:
-        cols = extract_columns(item)
-        for col in cols:
-            if col not in header_columns:
-                header_columns.append(col)
+        row = dump_row(item)
+        header_columns.update(row)
+        if rows is not None:
+            rows.append(row)
 
+    header_columns = list(header_columns)
     LOG.debug(header_columns)
     return header_columns
 
@@ -70,7 +87,8 @@ def output_to_file(
         LOG.warning("Skipping %s file, no data to write to file", output_file_name)
         return
 
-    header = get_header(data=data)
+    rows = []
+    header = get_header(data=data, rows=rows)
     if import_action:
         LOG.debug("Adding import-action to header using %s", import_action)
         header.insert(1, "import-action")
@@ -78,9 +96,9 @@ def output_to_file(
     with open(output_file_name, "w") as f:
         mywriter = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
         mywriter.writeheader()
-        for row in data:
-            if import_action is not None:
-                row.import_action = ImportActionEnum(import_action)
-            mywriter.writerow(
-                row.model_dump(by_alias=True, exclude_defaults=False, exclude_none=True)
-            )
+        if import_action is not None:
+            action = ImportActionEnum(import_action)
+            for item, row in zip(data, rows):
+                item.import_action = action
+                row["import-action"] = action
+        mywriter.writerows(rows)
@@ -0,0 +1,355 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from logging import getLogger
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import dns.exception
+import dns.name
+import dns.rdata
+import dns.rdataclass
+import dns.rdatatype
+from pydantic import BaseModel, ValidationError
+
+from ibx_sdk.nios.csv import dns_records
+from ibx_sdk.nios.csv.util import output_to_file
+
+LOG = getLogger(__name__)
+
+BATCH_SIZE = 100000
+
+ADDRESS_TYPES = ("A", "AAAA")
+
+
+def _text(rdata) -> str:
+    if len(rdata.strings) == 1:
+        return rdata.strings[0].decode("utf8", "backslashreplace")
+    return rdata.to_text()
+
+
+# model and field values of each supported record type, from the rdata text of the
+# address records, which the models validate, and from the rdata of the others. SOA and
+# NS records are not imported, NIOS creates them for its authoritative zones.
+RECORD_MAPPERS = {
+    "A": lambda text: (dns_records.ARecord, {"address": text}),
+    "AAAA": lambda text: (dns_records.AAAARecord, {"address": text}),
+    "CNAME": lambda rd: (
+        dns_records.CNAMERecord,
+        {"canonical_name": rd.target.to_text(omit_final_dot=True)},
+    ),
+    "DNAME": lambda rd: (
+        dns_records.DNAMERecord,
+        {"target": rd.target.to_text(omit_final_dot=True)},
+    ),
+    "MX": lambda rd: (
+        dns_records.MXRecord,
+        {
+            "mx": rd.exchange.to_text(omit_final_dot=True),
+            "priority": rd.preference,
+        },
+    ),
+    "NAPTR": lambda rd: (
+        dns_records.NAPTRRecord,
+        {
+            "order": rd.order,
+            "preference": rd.preference,
+            "flags": rd.flags.decode(),
+            "services": rd.service.decode(),
+            "regexp": rd.regexp.decode(),
+            "replacement": rd.replacement.to_text(omit_final_dot=True),
+        },
+    ),
+    "PTR": lambda rd: (
+        dns_records.PTRRecord,
+        {"dname": rd.target.to_text(omit_final_dot=True)},
+    ),
+    "SRV": lambda rd: (
+        dns_records.SRVRecord,
+        {
+            "priority": rd.priority,
+            "weight": rd.weight,
+            "port": rd.port,
+            "target": rd.target.to_text(omit_final_dot=True),
+        },
+    ),
+    "TXT": lambda rd: (dns_records.TXTRecord, {"text": _text(rd)}),
+    "CAA": lambda rd: (
+        dns_records.CAARecord,
+        {"flag": rd.flags, "type": rd.tag.decode(), "ca": rd.value.decode()},
+    ),
+}
+
+
+def iter_zone_records(
+    zone_name: str,
+    zone_file: str,
+    view: Optional[str] = None,
+    host_records: bool = False,
+    keep_ttl: bool = True,
+    stats: Optional[Counter] = None,
+) -> Iterator[BaseModel]:
+    """
+    Read a compiled zone file and yield its records as dns_records models.
+
+    The zone file must have one record per line with its absolute owner name, TTL, class
+    and type, as written by named_compilezone or dnspython_compilezone. Records are read
+    one line at a time, so memory does not grow with the size of the zone.
+
+    SOA and NS records, which NIOS creates for its authoritative zones, and the record
+    types without a model are skipped. Records that are not valid for their model, like
+    a CAA record with flag 0, are skipped with a warning.
+
+    Args:
+        zone_name: The name of the DNS zone.
+        zone_file: The path of the compiled zone file.
+        view: The DNS view of the records. Defaults to None, the default view.
+        host_records: Import the first A and AAAA record of each name as a host record.
+                      The names of the zone are expected to be grouped, as in compiled
+                      zone files. Defaults to False.
+        keep_ttl: Set the TTL of the records. Defaults to True.
+        stats: A Counter updated with the number of `skipped` and `invalid` records and
+               of the records of each type.
+
+    Returns:
+        An iterator of the dns_records models.
+
+    Example:
+
+    ```python
+    for record in iter_zone_records('example.com', 'db.example.com.compiled'):
+        print(record.fqdn)
+    ```
+    """
+    stats = Counter() if stats is None else stats
+    origin = dns.name.from_text(zone_name)
+    host = None
+    with open(zone_file, "r", encoding="utf8") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip() or line.startswith((";", "$")):
+                continue
+            try:
+                owner, ttl, rdclass, rdtype, text = line.split(None, 4)
+                rdtype = rdtype.upper()
+                mapper = RECORD_MAPPERS.get(rdtype)
+                if mapper is None or rdclass.upper() != "IN":
+                    stats["skipped"] += 1
+                    continue
+                ttl = int(ttl)
+                fqdn = _fqdn(owner, origin)
+                if rdtype in ADDRESS_TYPES:
+                    model, values = mapper(text.strip())
+                else:
+                    rdata = dns.rdata.from_text(
+                        dns.rdataclass.IN,
+                        dns.rdatatype.from_text(rdtype),
+                        text.strip(),
+                        origin=origin,
+                        relativize=False,
+                    )
+                    model, values = mapper(rdata)
+                values["fqdn"] = fqdn
+                if keep_ttl and ttl > 0:
+                    values["ttl"] = ttl
+                if view:
+                    values["view"] = view
+                record = model(**values)
+            except ValidationError as err:
+                LOG.warning(
+                    "%s:%d: skipping %s record, %s",
+                    zone_file,
+                    line_number,
+                    rdtype,
+                    err.errors()[0]["msg"],
+                )
+                stats["invalid"] += 1
+                continue
+            except (ValueError, dns.exception.DNSException) as err:
+                LOG.warning("%s:%d: skipping record, %s", zone_file, line_number, err)
+                stats["invalid"] += 1
+                continue
+
+            if host_records and rdtype in ADDRESS_TYPES:
+                field = "addresses" if rdtype == "A" else "ipv6_addresses"
+                if host is None or host.fqdn != fqdn:
+                    if host is not None:
+                        stats[_record_type(host)] += 1
+                        yield host
+                    host = dns_records.HostRecord(
+                        **record.model_dump(include={"fqdn", "view", "ttl"}),
+                        **{field: record.address},
+                        configure_for_dns=True,
+                    )
+                    continue
+                if getattr(host, field) is None:
+                    setattr(host, field, record.address)
+                    continue
+            stats[_record_type(record)] += 1
+            yield record
+    if host is not None:
+        stats[_record_type(host)] += 1
+        yield host
+
+
+def _fqdn(owner: str, origin: dns.name.Name) -> str:
+    # compiled zone files have absolute owner names, which only need parsing when they
+    # have escapes
+    if owner.endswith(".") and "\\" not in owner:
+        return owner[:-1]
+    return dns.name.from_text(owner, origin).to_text(omit_final_dot=True)
+
+
+def _record_type(record: BaseModel) -> str:
+    # the first field of the models is their header column, e.g. arecord
+    return next(iter(type(record).model_fields))
+
+
+def zone_to_csv(
+    zone_name: str,
+    zone_file: str,
+    output_dir: str = ".",
+    view: Optional[str] = None,
+    host_records: bool = False,
+    keep_ttl: bool = True,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    Convert a compiled zone file to NIOS CSV import files, one per record type.
+
+    The records of `iter_zone_records` are written with `output_to_file` in batches of
+    `batch_size` rows, so memory stays constant for zones with millions of records. The
+    files are named `<zone>-<type>_<NNNN>.csv`, e.g. `example.com-arecord_0001.csv`, and
+    can be imported in any order once the zone exists.
+
+    Args:
+        zone_name: The name of the DNS zone.
+        zone_file: The path of the compiled zone file.
+        output_dir: The directory of the CSV files. Defaults to the current directory.
+        view: The DNS view of the records. Defaults to None, the default view.
+        host_records: Import the first A and AAAA record of each name as a host record.
+                      Defaults to False.
+        keep_ttl: Set the TTL of the records. Defaults to True.
+        batch_size: The maximum number of rows of a CSV file. Defaults to 100000.
+
+    Returns:
+        The number of rows written by record type, e.g. `arecord`, and the number of
+        `skipped` and `invalid` records.
+
+    Example:
+
+    ```python
+    counts = zone_to_csv('example.com', 'db.example.com.compiled', output_dir='csv')
+    print(counts['arecord'])
+    ```
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = zone_name.rstrip(".") or "root"
+    stats = Counter()
+    batches = {}
+    parts = Counter()
+
+    def flush(record_type: str) -> None:
+        parts[record_type] += 1
+        output_to_file(
+            filename=f"{record_type}_{parts[record_type]:04d}",
+            data=batches.pop(record_type),
+            output_dir=output_dir,
+            file_prefix=prefix,
+        )
+
+    for record in iter_zone_records(
+        zone_name, zone_file, view, host_records, keep_ttl, stats
+    ):
+        record_type = _record_type(record)
+        batches.setdefault(record_type, []).append(record)
+        if len(batches[record_type]) >= batch_size:
+            flush(record_type)
+    for record_type in list(batches):
+        flush(record_type)
+    return dict(stats)
+
+
+def zones_to_csv(
+    zone_list: Iterable[Tuple[str, str]],
+    output_dir: str = ".",
+    workers: int = None,
+    **kwargs,
+) -> Iterator[dict]:
+    """
+    Convert many compiled zone files to NIOS CSV import files in a pool of worker
+    processes, see `zone_to_csv`.
+
+    Args:
+        zone_list: The `(zone_name, zone_file)` of each zone, e.g. the zone and output
+                   file of the `compile_zones` results. It is consumed lazily.
+        output_dir: The directory of the CSV files. Defaults to the current directory.
+        workers: The number of worker processes. Defaults to the number of CPUs.
+        **kwargs: The `view`, `host_records`, `keep_ttl` and `batch_size` arguments of
+                  `zone_to_csv`.
+
+    Returns:
+        An iterator of the result of each zone, in completion order, with its `zone`,
+        `input` file, `status` 'ok' or 'failed' with the `error`, and the `counts`
+        returned by `zone_to_csv`.
+
+    Example:
+
+    ```python
+    compiled = compile_zones(zones, manifest='compile.json')
+    todo = ((r['zone'], r['output']) for r in compiled if r['status'] == 'ok')
+    for result in zones_to_csv(todo, output_dir='csv'):
+        print(result['zone'], result['counts'])
+    ```
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = set()
+
+    def collect(limit: int) -> Iterator[dict]:
+        nonlocal pending
+        while len(pending) > limit:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for zone_name, zone_file in zone_list:
+                pending.add(
+                    executor.submit(
+                        _zone_to_csv, zone_name, zone_file, output_dir, kwargs
+                    )
+                )
+                yield from collect(workers * 4 - 1)
+            yield from collect(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _zone_to_csv(zone_name: str, zone_file: str, output_dir: str, kwargs: dict) -> dict:
+    result = {"zone": zone_name, "input": zone_file}
+    try:
+        result["counts"] = zone_to_csv(zone_name, zone_file, output_dir, **kwargs)
+    except (OSError, ValueError) as err:
+        LOG.error("%s: %s", zone_name, err)
+        result.update(status="failed", error=str(err), counts={})
+        return result
+    result["status"] = "ok"
+    return result
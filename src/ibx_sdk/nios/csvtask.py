@@ -0,0 +1,175 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import time
+from typing import Callable, Optional
+
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+POLL_BACKOFF = 1.5
+
+FINAL_STATUSES = ("COMPLETED", "FAILED", "STOPPED")
+FAILED_STATUSES = ("FAILED", "STOPPED")
+
+
+class CsvImportProgress:
+    """
+    Progress of a NIOS CSV import task.
+
+    An instance is updated with the csvimporttask object every time the task is polled,
+    and passed to the progress callback of `wait_csv_import`. The rate is measured from
+    the lines processed between polls.
+
+    The time until the next poll adapts to the task: it starts at `min_interval` and
+    grows by half on every poll up to `max_interval`, so that short imports are seen to
+    finish quickly and long ones are not polled needlessly. Once the end of the task can
+    be estimated, the next poll is never later than half of the remaining time.
+
+    Attributes:
+        ref (str): The reference of the csvimporttask object.
+        file_name (str): The name of the imported file.
+        import_id (int): The import id of the task.
+        status (str): The status of the task, e.g. PENDING, RUNNING or COMPLETED.
+        total (int, optional): The number of lines to import, if known.
+        lines_processed (int): The number of lines processed so far.
+        lines_failed (int): The number of lines that failed to import.
+        lines_warning (int): The number of lines imported with a warning.
+        errors_file (str, optional): The csv-errors file fetched for a failed task.
+        interval (float): The seconds until the next poll.
+    """
+
+    def __init__(
+        self,
+        csvtask: dict,
+        total: Optional[int] = None,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+    ) -> None:
+        task = csvtask.get("csv_import_task", csvtask)
+        self.ref = task["_ref"]
+        self.file_name = task.get("file_name")
+        self.import_id = task.get("import_id")
+        self.status = task.get("status")
+        self.total = total
+        self.lines_processed = 0
+        self.lines_failed = 0
+        self.lines_warning = 0
+        self.errors_file = None
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.next_poll = time.monotonic()
+        self._start = time.monotonic()
+        self._first = None
+        self._last = None
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(file_name={self.file_name}, "
+            f"status={self.status}, lines_processed={self.lines_processed}, "
+            f"total={self.total}, rate={self.rate:.0f}/s)"
+        )
+
+    @property
+    def done(self) -> bool:
+        """Whether the task has finished."""
+        return self.status in FINAL_STATUSES
+
+    @property
+    def failed(self) -> bool:
+        """Whether the task stopped, or finished with lines that failed to import."""
+        return self.status in FAILED_STATUSES or (self.done and self.lines_failed > 0)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the task started being monitored."""
+        return time.monotonic() - self._start
+
+    @property
+    def rate(self) -> float:
+        """Lines processed per second between the first and the last poll."""
+        if self._first is None or self._last is None:
+            return 0.0
+        lines = self._last[0] - self._first[0]
+        seconds = self._last[1] - self._first[1]
+        return lines / seconds if seconds > 0 else 0.0
+
+    @property
+    def percent(self) -> Optional[float]:
+        """Percentage of the lines processed, or None if the total is unknown."""
+        if not self.total:
+            return None
+        return min(100.0, 100.0 * self.lines_processed / self.total)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the task finishes, or None if it cannot be estimated."""
+        if self.done:
+            return 0.0
+        if not self.total or self.rate <= 0:
+            return None
+        return max(0.0, (self.total - self.lines_processed) / self.rate)
+
+    def update(self, status: dict) -> bool:
+        """
+        Update the progress with a csvimporttask object, and schedule the next poll.
+
+        Args:
+            status (dict): The csvimporttask object, as returned by `csvtask_status`.
+
+        Returns:
+            bool: Whether the task made progress or changed status since the last poll.
+        """
+        now = time.monotonic()
+        previous = (self.status, self.lines_processed)
+        self.status = status.get("status", self.status)
+        self.file_name = status.get("file_name", self.file_name)
+        self.import_id = status.get("import_id", self.import_id)
+        self.lines_processed = status.get("lines_processed") or 0
+        self.lines_failed = status.get("lines_failed") or 0
+        self.lines_warning = status.get("lines_warning") or 0
+        if status.get("lines_total"):
+            self.total = status["lines_total"]
+
+        if self.status == "RUNNING" or self.done:
+            if self._first is None:
+                self._first = (self.lines_processed, now)
+            self._last = (self.lines_processed, now)
+
+        self.interval = min(self.max_interval, self.interval * POLL_BACKOFF)
+        eta = self.eta
+        if eta is not None:
+            self.interval = max(self.min_interval, min(self.interval, eta / 2))
+        self.next_poll = now + self.interval
+        return (self.status, self.lines_processed) != previous
+
+    def log(self) -> None:
+        """Log the progress at INFO level."""
+        eta = self.eta
+        logging.info(
+            "csv import %s: %s, %d%s lines processed, %d failed, %.0f lines/s%s",
+            self.file_name,
+            self.status,
+            self.lines_processed,
+            f"/{self.total}" if self.total else "",
+            self.lines_failed,
+            self.rate,
+            f", ETA {eta:.0f}s" if eta and not self.done else "",
+        )
+
+
+CsvImportCallback = Callable[[CsvImportProgress], None]
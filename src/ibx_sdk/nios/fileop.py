@@ -14,14 +14,47 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import io
+import json
 import logging
 import os
 import pprint
-from typing import Literal, Optional
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Literal, Optional
 
 import requests.exceptions
-
-from ibx_sdk.nios.exceptions import WapiRequestException
+import urllib3.exceptions
+from pydantic import BaseModel
+
+from ibx_sdk.nios.csv.reader import count_file_rows, read_csv
+from ibx_sdk.nios.csvtask import (
+    FAILED_STATUSES,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    CsvImportCallback,
+    CsvImportProgress,
+)
+from ibx_sdk.nios.exceptions import (
+    BaseWapiException,
+    WapiInvalidParameterException,
+    WapiRequestException,
+)
+from ibx_sdk.nios.transfer import (
+    DEFAULT_CHUNK_SIZE,
+    Compression,
+    MultipartFileStream,
+    ProgressCallback,
+    RangeDownload,
+    check_compression,
+    compressed_filename,
+    compression_from_filename,
+    open_compressed,
+    uncompressed_size,
+    write_response,
+)
 from ibx_sdk.util import util
 
 CsvOperation = Literal[
@@ -45,6 +78,41 @@ LogType = Literal[
     "PTOPLOG",
     "DISCOVERY_CSV_ERRLOG",
 ]
+# WAPI objects exported by csv_export_bulk when no objects are given, in import order.
+# Network containers are part of the network and ipv6network exports.
+CSV_EXPORT_OBJECTS = (
+    "networkview",
+    "view",
+    "nsgroup",
+    "network",
+    "ipv6network",
+    "sharednetwork",
+    "ipv6sharednetwork",
+    "range",
+    "ipv6range",
+    "fixedaddress",
+    "ipv6fixedaddress",
+    "filtermac",
+    "macfilteraddress",
+    "filteroption",
+    "filterrelayagent",
+    "filterfingerprint",
+    "fingerprint",
+    "zone_auth",
+    "zone_delegated",
+    "zone_forward",
+    "zone_stub",
+    "record:a",
+    "record:aaaa",
+    "record:cname",
+    "record:dname",
+    "record:host",
+    "record:mx",
+    "record:naptr",
+    "record:ptr",
+    "record:srv",
+    "record:txt",
+)
 MemberDataType = Literal[
     "DNS_CACHE",
     "DNS_CFG",
@@ -61,7 +129,12 @@ class NiosFileopMixin:
     NiosFileopMixin class
     """
 
-    def csv_export(self, wapi_object: str, filename: Optional[str] = None) -> None:
+    def csv_export(
+        self,
+        wapi_object: str,
+        filename: Optional[str] = None,
+        compress: Optional[Compression] = None,
+    ) -> None:
         """
         Perform a NIOS CSV Export Task for a given WAPI object
 
@@ -70,6 +143,8 @@ class NiosFileopMixin:
             filename: Optional. The name of the file to save the exported data to. If not
                                 provided, a default filename will be generated based on the
                                 download URL.
+            compress: Optional. Write the file as a 'gzip' or 'zstd' stream, adding the
+                                '.gz' or '.zst' extension to the filename.
 
         Raises:
             requests.exceptions.RequestException: If there is an error in the request.
@@ -78,24 +153,13 @@ class NiosFileopMixin:
             None
 
         """
+        if compress:
+            check_compression(compress)
         if filename:
             (_, filename) = os.path.split(filename)
             filename = os.path.join(_, filename.replace("-", "_"))
 
-        # Call WAPI fileop  csv_export function
-        logging.info("performing csv export for %s object(s)", wapi_object)
-        payload = {"_object": wapi_object}
-        try:
-            response = self.post(
-                "fileop", params={"_function": "csv_export"}, json=payload
-            )
-            logging.debug(response.text)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as err:
-            logging.error(err)
-            raise WapiRequestException(err)
-
-        obj = response.json()
+        obj = self.__csv_export_request(wapi_object)
         download_url = obj.get("url")
         download_token = obj.get("token")
 
@@ -104,52 +168,238 @@ class NiosFileopMixin:
 
         if not filename:
             filename = util.extract_filename_from_url(download_url)
+        if compress:
+            filename = compressed_filename(filename, compress)
 
-        NiosFileopMixin.__write_file(filename=filename, data=response)
+        NiosFileopMixin.__write_file(
+            filename=filename, data=response, compress=compress
+        )
 
         self.__download_complete(download_token, filename, self.__get_cookies())
 
+    def csv_export_iter(self, wapi_object: str) -> Iterator[BaseModel]:
+        """
+        Perform a NIOS CSV Export Task and stream the rows as CSV models
+
+        The export is parsed while it is downloaded, without writing it to disk or
+        holding it in memory. Every row is validated as the `ibx_sdk.nios.csv` model of
+        its `header-*` column, e.g. `IPv4Network`, `AuthZone` or `HostRecord`. Rows of
+        objects without a model are skipped with a warning.
+
+        Args:
+            wapi_object: The name of the WAPI object to perform a CSV export on.
+
+        Returns:
+            An iterator of the validated models.
+
+        Raises:
+            WapiRequestException: If the export or the download fails.
+            pydantic.ValidationError: If a row is not valid for its model.
+
+        Example:
+
+        ```python
+        for network in wapi.csv_export_iter('network'):
+            print(network.address, network.netmask)
+        ```
+        """
+        obj = self.__csv_export_request(wapi_object)
+        download_url = obj.get("url")
+        download_token = obj.get("token")
+
+        logging.info("streaming data from %s", download_url)
+        try:
+            response = self.conn.get(
+                download_url,
+                headers={"Content-type": "application/force-download"},
+                stream=True,
+                cookies=self.__get_cookies(),
+                verify=self.ssl_verify,
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            logging.error(err)
+            raise WapiRequestException(err)
+
+        filename = util.extract_filename_from_url(download_url)
+        count = 0
+        completed = False
+        try:
+            response.raw.decode_content = True
+            # keep the raw stream open at EOF, so TextIOWrapper can tell it ended
+            response.raw.auto_close = False
+            lines = io.TextIOWrapper(response.raw, encoding="utf-8-sig", newline="")
+            for count, model in enumerate(read_csv(lines), start=1):
+                yield model
+            completed = True
+        except (
+            requests.exceptions.RequestException,
+            urllib3.exceptions.HTTPError,
+        ) as err:
+            logging.error(err)
+            raise WapiRequestException(err)
+        finally:
+            response.close()
+            if completed:
+                logging.info("parsed %d %s object(s)", count, wapi_object)
+            # the Grid keeps the export file until the download is marked complete
+            self.__download_complete(
+                download_token, filename, self.__get_cookies(), aborted=not completed
+            )
+
+    def csv_export_bulk(
+        self,
+        wapi_objects: Optional[Iterable[str]] = None,
+        output_dir: str = ".",
+        workers: int = 4,
+        compress: Optional[Compression] = None,
+    ) -> dict:
+        """
+        Perform the NIOS CSV Export Tasks of many WAPI objects concurrently.
+
+        The csv_export request, download and download complete steps are run for up to
+        `workers` objects at a time. Each object is saved in `output_dir` as
+        `<object>.csv`, with `:` replaced by `_`, and a `manifest.json` summarising the
+        run is written next to them. An object that fails is recorded in the manifest and
+        does not stop the others.
+
+        Args:
+            wapi_objects: The WAPI objects to export. Defaults to `CSV_EXPORT_OBJECTS`.
+            output_dir: The directory to save the files in. Default is ".".
+            workers: The maximum number of objects exported concurrently. Default is 4.
+            compress: Optional. Write the files as 'gzip' or 'zstd' streams, adding the
+                      '.gz' or '.zst' extension to the filenames.
+
+        Returns:
+            dict: The manifest, with an `objects` list holding the `file`, `rows`, `size`
+                  and `seconds` of each object, or its `error`.
+
+        Example:
+
+        ```python
+        manifest = wapi.csv_export_bulk(['network', 'zone_auth'], output_dir='export')
+        for obj in manifest['objects']:
+            print(obj['object'], obj['status'], obj.get('rows'))
+        ```
+        """
+        if compress:
+            check_compression(compress)
+        if wapi_objects is None:
+            wapi_objects = CSV_EXPORT_OBJECTS
+
+        def fetch(wapi_object: str) -> str:
+            obj = self.__csv_export_request(wapi_object)
+            filename = os.path.join(output_dir, f"{wapi_object.replace(':', '_')}.csv")
+            if compress:
+                filename = compressed_filename(filename, compress)
+            self.file_download(
+                token=obj.get("token"),
+                url=obj.get("url"),
+                filename=filename,
+                compress=compress,
+            )
+            return filename
+
+        def details(filename: str) -> dict:
+            return {"rows": count_file_rows(filename)}
+
+        return self.__bulk_run(
+            fetch,
+            wapi_objects,
+            output_dir,
+            workers,
+            {"csv_export": {"compress": compress}},
+            key="object",
+            details=details,
+        )
+
     def file_download(
         self,
         token: str,
         url: str,
         filename: str = None,
+        progress: Optional[ProgressCallback] = None,
+        parallel: int = 1,
+        resume: bool = True,
+        compress: Optional[Compression] = None,
     ) -> None:
         """
         file_download downloads the generated file from the NIOS Grid using a token and url
 
+        The file is written to `<filename>.part` and only renamed to `filename` once it is
+        complete. When the Grid supports HTTP range requests, a failed connection is
+        resumed from the last byte received, and the file can be fetched in several
+        parallel ranges. The download is only reported complete to the Grid after the file
+        is verified.
+
         Args:
             token: Authentication token required for the download completion.
             url: URL of the file to be downloaded.
             filename: Optional; name for the downloaded file. If not provided, it will be extracted from the URL.
+            progress: Optional; called with a `TransferProgress` (bytes transferred and
+                      bytes/sec) after every write to the file.
+            parallel: Optional; the number of byte ranges to download concurrently. Default
+                      is 1.
+            resume: Optional; resume an interrupted download of the same file from its
+                    `.part` file. Default is True.
+            compress: Optional; write the file as a 'gzip' or 'zstd' stream, adding the
+                      '.gz' or '.zst' extension to the filename. The file is then fetched
+                      in a single stream.
 
         Returns:
             None
         """
         logging.info("downloading data from %s", url)
+        if not filename:
+            filename = util.extract_filename_from_url(url)
+        if compress:
+            check_compression(compress)
+            filename = compressed_filename(filename, compress)
+
+        download = RangeDownload(
+            self.conn,
+            url,
+            filename,
+            parallel=parallel,
+            resume=resume,
+            progress=progress,
+            compress=compress,
+            headers={"Content-type": "application/force-download"},
+            cookies=self.__get_cookies(),
+            verify=self.ssl_verify,
+        )
         try:
-            res = self.__download_file(url, self.__get_cookies())
+            download.run()
         except requests.exceptions.RequestException as err:
             logging.error(err)
             raise WapiRequestException(err)
 
-        if not filename:
-            filename = util.extract_filename_from_url(url)
-
-        NiosFileopMixin.__write_file(filename=filename, data=res)
-
         try:
             self.__download_complete(token, filename, self.__get_cookies())
         except requests.exceptions.RequestException as err:
             logging.error(err)
             raise WapiRequestException(err)
 
-    def file_upload(self, filename: str) -> str:
+    def file_upload(
+        self,
+        filename: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        decompress: bool = False,
+    ) -> str:
         """
         Perform a file upload into the NIOS Grid.
 
+        The file is streamed to the Grid in chunks of `chunk_size` bytes, so memory use does
+        not depend on the size of the file.
+
         Args:
             filename: The path of the file to be uploaded.
+            chunk_size: The size of the chunks the file is sent in. Default is 1 MiB.
+            progress: Optional; called with a `TransferProgress` (bytes transferred and
+                      bytes/sec) after every chunk.
+            decompress: Optional; when the file has a '.gz' or '.zst' extension, upload its
+                        uncompressed content, decompressing it on the fly. Default is False.
 
         Returns:
             str: The token received upon successful upload initialization.
@@ -159,6 +409,9 @@ class NiosFileopMixin:
         """
         (path, filename) = os.path.split(filename)
         valid_filename = filename.replace("-", "_")
+        compression = compression_from_filename(filename) if decompress else None
+        if compression:
+            valid_filename = os.path.splitext(valid_filename)[0]
 
         # Call WAPI fileop Upload INIT
         logging.info("step 1 - request uploadinit %s", filename)
@@ -172,15 +425,22 @@ class NiosFileopMixin:
         token = obj.get("token")
 
         # specify a file handle for the file data to be uploaded
-        with open(os.path.join(path, filename), "rb") as fh:
-            # reset to top of the file
-            fh.seek(0)
-            upload_file = {"file": fh.read()}
+        size = None
+        if compression:
+            # the multipart body needs the uncompressed size up front
+            size = uncompressed_size(os.path.join(path, filename), compression)
+            fh = open_compressed(os.path.join(path, filename), "rb", compression)
+        else:
+            fh = open(os.path.join(path, filename), "rb")
+        with fh:
+            upload_body = MultipartFileStream(
+                fh, chunk_size=chunk_size, progress=progress, size=size
+            )
 
             # Upload the contents of the CSV file
             logging.info("step 2 - post the files using the upload_url provided")
             try:
-                self.__upload_file(upload_url, upload_file, self.__get_cookies())
+                self.__upload_file(upload_url, upload_body, self.__get_cookies())
             except requests.exceptions.RequestException as err:
                 logging.error(err)
                 raise WapiRequestException(err)
@@ -231,6 +491,7 @@ class NiosFileopMixin:
         task_operation: CsvOperation,
         csv_import_file: str,
         exit_on_error: bool = False,
+        progress: Optional[ProgressCallback] = None,
     ) -> dict:
         """
         Perform a CSV import task using the NIOS CSV Task Manager
@@ -238,9 +499,13 @@ class NiosFileopMixin:
         Args:
             task_operation (CsvOperation): The operation to be performed on the CSV file. Should be
                                            a value from the `CsvOperation` enum.
-            csv_import_file (str): The path to the CSV file to be imported.
+            csv_import_file (str): The path to the CSV file to be imported. A '.gz' or '.zst'
+                                   compressed file is decompressed on the fly while it is
+                                   uploaded.
             exit_on_error (bool): Indicates whether the program should exit if an error occurs
                                   during the import process. Default value is `False`.
+            progress (ProgressCallback, optional): Called with the `TransferProgress` of the
+                                                   file upload.
 
         Returns:
             A dictionary containing the result of the CSV import task.
@@ -248,7 +513,9 @@ class NiosFileopMixin:
         Raises:
             requests.exceptions.RequestException: If an error occurs while making HTTP requests.
         """
-        token = self.file_upload(filename=csv_import_file)
+        token = self.file_upload(
+            filename=csv_import_file, progress=progress, decompress=True
+        )
 
         # submit task to CSV Job Manager
         logging.info(
@@ -266,6 +533,158 @@ class NiosFileopMixin:
         else:
             return csvtask
 
+    def csv_import_sharded(
+        self,
+        task_operation: CsvOperation,
+        csv_import_file: str,
+        shard_rows: int = 100000,
+        work_dir: Optional[str] = None,
+        concurrency: int = 1,
+        exit_on_error: bool = False,
+        progress: Optional[CsvImportCallback] = None,
+    ) -> dict:
+        """
+        Perform a large CSV import as a series of smaller CSV import tasks
+
+        The file is split with `util.ibx_csv_file_shard` into shards of a single object
+        type and at most `shard_rows` rows, which are imported in dependency order: network
+        views and DNS views, then containers, then networks, then ranges, then hosts and
+        records (see `util.CSV_IMPORT_ORDER`). A level starts only once all shards of the
+        previous level are imported. Within a level, up to `concurrency` object types are
+        imported at the same time, while the shards of one object type are always
+        imported one after the other.
+
+        Progress is saved in `checkpoint.json` in `work_dir` after every step. When the
+        import stops, because a shard fails or the script is interrupted, running it again
+        with the same file skips the shards that completed, and waits for any task that
+        was still running instead of submitting it again.
+
+        Args:
+            task_operation (CsvOperation): The operation to be performed on the CSV file.
+            csv_import_file (str): The path to the CSV file to be imported. A '.gz' or
+                                   '.zst' compressed file is decompressed while it is split.
+            shard_rows (int): The maximum number of rows of a shard. Default is 100000.
+            work_dir (str, optional): The directory of the shards and the checkpoint.
+                                      Defaults to `<csv_import_file>.shards`.
+            concurrency (int): The maximum number of import tasks run at the same time.
+                               Default is 1.
+            exit_on_error (bool): Stop a task at its first error. Default is False.
+            progress (CsvImportCallback, optional): Called with the `CsvImportProgress` of a
+                                                    shard every time it makes progress.
+
+        Returns:
+            dict: The checkpoint, with a `shards` list holding the `file`, `object`, `rows`,
+                  `status` and `lines_failed` of each shard.
+
+        Raises:
+            WapiInvalidParameterException: If the file cannot be split.
+            WapiRequestException: If a shard fails to import. The checkpoint is kept so
+                                  that the import can be resumed.
+
+        Example:
+
+        ```python
+        checkpoint = wapi.csv_import_sharded(
+            task_operation='INSERT', csv_import_file='hosts.csv.gz', shard_rows=50000
+        )
+        failed = sum(shard['lines_failed'] for shard in checkpoint['shards'])
+        ```
+        """
+        if shard_rows < 1 or concurrency < 1:
+            raise WapiInvalidParameterException(
+                "shard_rows and concurrency must be positive integers"
+            )
+        work_dir = work_dir or f"{csv_import_file}.shards"
+        checkpoint_file = os.path.join(work_dir, "checkpoint.json")
+        try:
+            stat = os.stat(csv_import_file)
+        except OSError as err:
+            logging.error(err)
+            raise WapiInvalidParameterException(err)
+        source = {
+            "source": os.path.abspath(csv_import_file),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "operation": task_operation.upper(),
+            "shard_rows": shard_rows,
+        }
+
+        state = NiosFileopMixin.__load_checkpoint(checkpoint_file, source)
+        if state is None:
+            try:
+                shards = util.ibx_csv_file_shard(csv_import_file, work_dir, shard_rows)
+            except (OSError, ValueError) as err:
+                logging.error(err)
+                raise WapiInvalidParameterException(err)
+            for shard in shards:
+                shard["status"] = "pending"
+            state = {**source, "shards": shards}
+            NiosFileopMixin.__save_checkpoint(checkpoint_file, state)
+        else:
+            logging.info(
+                "resuming csv import of %s, %d of %d shards completed",
+                csv_import_file,
+                sum(1 for shard in state["shards"] if shard["status"] == "completed"),
+                len(state["shards"]),
+            )
+
+        for level in sorted({shard["level"] for shard in state["shards"]}):
+            queues = {}
+            for shard in state["shards"]:
+                if shard["level"] == level and shard["status"] != "completed":
+                    queues.setdefault(shard["object"], []).append(shard)
+            while any(queues.values()):
+                batch = [queue[0] for queue in queues.values() if queue][:concurrency]
+                tasks = []
+                for shard in batch:
+                    if shard["status"] == "submitted":
+                        tasks.append({"csv_import_task": shard["task"]})
+                        continue
+                    csvtask = self.csv_import(
+                        task_operation,
+                        os.path.join(work_dir, shard["file"]),
+                        exit_on_error=exit_on_error,
+                    )
+                    task = csvtask["csv_import_task"]
+                    shard["status"] = "submitted"
+                    shard["task"] = {
+                        "_ref": task["_ref"],
+                        "file_name": task.get("file_name"),
+                        "import_id": task.get("import_id"),
+                    }
+                    NiosFileopMixin.__save_checkpoint(checkpoint_file, state)
+                    tasks.append(csvtask)
+
+                results = self.wait_csv_imports(
+                    tasks, totals=[shard["rows"] for shard in batch], progress=progress
+                )
+                failed = []
+                for shard, result in zip(batch, results):
+                    shard["lines_failed"] = result.lines_failed
+                    shard["errors_file"] = result.errors_file
+                    if result.status in FAILED_STATUSES:
+                        shard["status"] = "failed"
+                        failed.append(shard["file"])
+                    else:
+                        shard["status"] = "completed"
+                    queues[shard["object"]].remove(shard)
+                NiosFileopMixin.__save_checkpoint(checkpoint_file, state)
+                if failed:
+                    err = (
+                        f"csv import of {', '.join(failed)} failed, run the import again "
+                        f"to resume from {checkpoint_file}"
+                    )
+                    logging.error(err)
+                    raise WapiRequestException(err)
+
+        logging.info(
+            "imported %d rows of %s in %d shards",
+            sum(shard["rows"] for shard in state["shards"]),
+            csv_import_file,
+            len(state["shards"]),
+        )
+        return state
+
     def csvtask_status(self, csvtask: dict) -> dict:
         """
         Fetch the status of a CSV submitted task
@@ -327,6 +746,143 @@ class NiosFileopMixin:
 
         return res.json()
 
+    def wait_csv_import(
+        self,
+        csvtask: dict,
+        total: Optional[int] = None,
+        progress: Optional[CsvImportCallback] = None,
+        fetch_errors: bool = True,
+        timeout: Optional[float] = None,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+    ) -> CsvImportProgress:
+        """
+        Wait for a CSV import task to finish
+
+        The task is polled with an adaptive interval, see `CsvImportProgress`, and its
+        progress is logged with the lines processed per second and, when the number of
+        lines is known, the estimated time until it finishes. When the task fails or has
+        lines that failed to import, its csv-errors file is fetched with
+        `get_csv_errors_file`.
+
+        Args:
+            csvtask (dict): The CSV import task, as returned by `csv_import`.
+            total (int, optional): The number of lines of the imported file, used to
+                                   estimate the time until the task finishes.
+            progress (CsvImportCallback, optional): Called with the `CsvImportProgress`
+                                                    every time the task makes progress.
+            fetch_errors (bool): Fetch the csv-errors file of a failed task. Default is
+                                 True.
+            timeout (float, optional): The maximum number of seconds to wait.
+            min_interval (float): The minimum seconds between polls. Default is 1.
+            max_interval (float): The maximum seconds between polls. Default is 30.
+
+        Returns:
+            CsvImportProgress: The final progress of the task. Check `failed` for the
+                               outcome.
+
+        Raises:
+            WapiRequestException: If the task cannot be polled, or the timeout expires.
+
+        Example:
+
+        ```python
+        task = wapi.csv_import(task_operation='INSERT', csv_import_file='networks.csv')
+        result = wapi.wait_csv_import(task)
+        if result.failed:
+            print(f'{result.lines_failed} lines failed, see {result.errors_file}')
+        ```
+        """
+        return self.wait_csv_imports(
+            [csvtask],
+            totals=[total],
+            progress=progress,
+            fetch_errors=fetch_errors,
+            timeout=timeout,
+            min_interval=min_interval,
+            max_interval=max_interval,
+        )[0]
+
+    def wait_csv_imports(
+        self,
+        csvtasks: Iterable[dict],
+        totals: Optional[Iterable[Optional[int]]] = None,
+        progress: Optional[CsvImportCallback] = None,
+        fetch_errors: bool = True,
+        timeout: Optional[float] = None,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+    ) -> List[CsvImportProgress]:
+        """
+        Wait for several CSV import tasks to finish
+
+        Works like `wait_csv_import`, polling every task on its own schedule.
+
+        Args:
+            csvtasks (Iterable[dict]): The CSV import tasks, as returned by `csv_import`.
+            totals (Iterable[int], optional): The number of lines of each imported file.
+            progress (CsvImportCallback, optional): Called with the `CsvImportProgress` of a
+                                                    task every time it makes progress.
+            fetch_errors (bool): Fetch the csv-errors file of failed tasks. Default is True.
+            timeout (float, optional): The maximum number of seconds to wait.
+            min_interval (float): The minimum seconds between polls. Default is 1.
+            max_interval (float): The maximum seconds between polls. Default is 30.
+
+        Returns:
+            List[CsvImportProgress]: The final progress of the tasks, in the same order.
+
+        Raises:
+            WapiRequestException: If a task cannot be polled, or the timeout expires.
+        """
+        csvtasks = list(csvtasks)
+        totals = list(totals) if totals is not None else [None] * len(csvtasks)
+        tasks = [
+            CsvImportProgress(csvtask, total, min_interval, max_interval)
+            for csvtask, total in zip(csvtasks, totals)
+        ]
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        errors = {task.ref: 0 for task in tasks}
+
+        while True:
+            pending = [task for task in tasks if not task.done]
+            if not pending:
+                return tasks
+            for task in pending:
+                if task.next_poll > time.monotonic():
+                    continue
+                try:
+                    status = self.csvtask_status(
+                        {"csv_import_task": {"_ref": task.ref}}
+                    )
+                except WapiRequestException:
+                    # tolerate transient errors during a long import
+                    errors[task.ref] += 1
+                    if errors[task.ref] >= 5:
+                        raise
+                    task.interval = min(max_interval, task.interval * 2)
+                    task.next_poll = time.monotonic() + task.interval
+                    continue
+                errors[task.ref] = 0
+                if task.update(status):
+                    task.log()
+                    if progress:
+                        progress(task)
+                if task.done and task.failed and fetch_errors:
+                    self.__fetch_csv_errors(task)
+
+            pending = [task for task in tasks if not task.done]
+            if not pending:
+                return tasks
+            wake = min(task.next_poll for task in pending)
+            if deadline is not None and wake > deadline:
+                err = (
+                    f"timed out waiting for CSV import of "
+                    f"{', '.join(str(task.file_name) for task in pending)}"
+                )
+                logging.error(err)
+                raise WapiRequestException(err)
+            time.sleep(max(0.0, wake - time.monotonic()))
+
     def get_csv_errors_file(self, filename: str, job_id: str) -> None:
         """
         Fetches the csv-errors file for a specific job ID.
@@ -578,6 +1134,7 @@ class NiosFileopMixin:
         member: Optional[str] = None,
         msserver: Optional[str] = None,
         node_type: Optional[Literal["ACTIVE", "BACKUP"]] = None,
+        parallel: int = 1,
     ):
         """
         Fetch the log files for the provided member or msserver
@@ -591,6 +1148,7 @@ class NiosFileopMixin:
             msserver (str): The msserver for which to fetch log files. (Default: None)
             node_type: The type of node for which to fetch log files. Can be 'ACTIVE' or
                        'BACKUP'. (Default: None)
+            parallel (int): The number of byte ranges to download concurrently. (Default: 1)
         """
         logging.info("fetching %s log files for %s", log_type, member)
         payload = {"log_type": log_type, "include_rotated": include_rotated}
@@ -606,21 +1164,13 @@ class NiosFileopMixin:
 
         logging.debug("json payload %s", payload)
 
-        try:
-            res = self.post(
-                "fileop", params={"_function": "get_log_files"}, json=payload
-            )
-            logging.debug(res.text)
-            res.raise_for_status()
-        except requests.exceptions.RequestException as err:
-            logging.error(err)
-            raise WapiRequestException(err)
-
-        obj = res.json()
+        obj = self.__request_download("get_log_files", payload)
         download_url = obj.get("url")
         download_token = obj.get("token")
 
-        self.file_download(token=download_token, url=download_url, filename=filename)
+        self.file_download(
+            token=download_token, url=download_url, filename=filename, parallel=parallel
+        )
 
     def get_support_bundle(
         self,
@@ -633,6 +1183,7 @@ class NiosFileopMixin:
         recursive_cache_file: bool = False,
         remote_url: Optional[str] = None,
         rotate_log_files: bool = False,
+        parallel: int = 1,
     ):
         """
         Get the support bundle for a member.
@@ -654,6 +1205,8 @@ class NiosFileopMixin:
                                         Defaults to None.
             rotate_log_files (bool, optional): Whether to rotate log files before creating the
                                                support bundle. Defaults to False.
+            parallel (int, optional): The number of byte ranges to download concurrently.
+                                      Defaults to 1.
 
         Raises:
             requests.exceptions.RequestException: If an error occurs during the request.
@@ -686,14 +1239,18 @@ class NiosFileopMixin:
         download_url = obj.get("url")
         download_token = obj.get("token")
 
-        self.file_download(token=download_token, url=download_url, filename=filename)
+        self.file_download(
+            token=download_token, url=download_url, filename=filename, parallel=parallel
+        )
 
-    def grid_backup(self, filename: Optional[str] = None) -> None:
+    def grid_backup(self, filename: Optional[str] = None, parallel: int = 1) -> None:
         """
         Perform a NIOS Grid Backup.
 
         Args:
             filename: str, optional. The name of the backup file. Default is 'database.bak'.
+            parallel: int, optional. The number of byte ranges to download concurrently.
+                      Default is 1.
 
         Returns:
             None
@@ -714,13 +1271,16 @@ class NiosFileopMixin:
         download_url = res.get("url")
 
         logging.info("step 2 - saving backup to %s", filename)
-        self.file_download(token=token, url=download_url, filename=filename)
+        self.file_download(
+            token=token, url=download_url, filename=filename, parallel=parallel
+        )
 
     def grid_restore(
         self,
         filename: str = "database.bak",
         mode: GridRestoreMode = "NORMAL",
         keep_grid_ip: bool = False,
+        progress: Optional[ProgressCallback] = None,
     ):
         """
         Perform a NIOS Grid restore of a database using a given file.
@@ -730,9 +1290,11 @@ class NiosFileopMixin:
                             "database.bak".
             mode (GridRestoreMode): The restore mode to be used. Default is "NORMAL".
             keep_grid_ip (bool): Indicates whether to keep the grid IP address. Default is False.
+            progress (ProgressCallback, optional): Called with the `TransferProgress` of the
+                                                   backup file upload.
 
         """
-        token = self.file_upload(filename=filename)
+        token = self.file_upload(filename=filename, progress=progress)
 
         # Execute the restore
         logging.info("step 3 - execute the grid restore")
@@ -749,6 +1311,7 @@ class NiosFileopMixin:
         conf_type: MemberDataType,
         filename: Optional[str] = None,
         remote_url: str = None,
+        parallel: int = 1,
     ) -> None:
         """
         Fetch member configuration file for given service type.
@@ -758,6 +1321,7 @@ class NiosFileopMixin:
             conf_type: An enum representing the type of config file.
             filename: A string value of the filename to save
             remote_url: An optional string representing the remote URL.
+            parallel: The number of byte ranges to download concurrently. Default is 1.
 
         Returns:
             A string representing the downloaded file.
@@ -768,21 +1332,100 @@ class NiosFileopMixin:
         payload = {"member": member, "type": conf_type}
         if remote_url:
             payload["remote_url"] = remote_url
-        try:
-            res = self.post(
-                "fileop", params={"_function": "getmemberdata"}, json=payload
-            )
-            logging.debug(res.text)
-            res.raise_for_status()
-        except requests.exceptions.RequestException as err:
-            logging.error(err)
-            raise WapiRequestException(err)
-
-        obj = res.json()
+        obj = self.__request_download("getmemberdata", payload)
         download_url = obj.get("url")
         download_token = obj.get("token")
 
-        self.file_download(token=download_token, url=download_url, filename=filename)
+        self.file_download(
+            token=download_token, url=download_url, filename=filename, parallel=parallel
+        )
+
+    def get_log_files_bulk(
+        self,
+        log_type: LogType,
+        members: Optional[Iterable[str]] = None,
+        output_dir: str = ".",
+        workers: int = 8,
+        include_rotated: bool = False,
+        node_type: Optional[Literal["ACTIVE", "BACKUP"]] = None,
+    ) -> dict:
+        """
+        Fetch the log files of many members concurrently.
+
+        The get_log_files request, download and download complete steps are run for up to
+        `workers` members at a time. Each member's file is saved in `output_dir` as
+        `<member>_<filename>`, and a `manifest.json` summarising the run is written next to
+        them. A member that fails is recorded in the manifest and does not stop the others.
+
+        Args:
+            log_type (LogType): The type of log files to fetch.
+            members (Iterable[str], optional): The members to fetch the log files of. Defaults
+                                               to all members of the Grid.
+            output_dir (str): The directory to save the files in. (Default: ".")
+            workers (int): The maximum number of members fetched concurrently. (Default: 8)
+            include_rotated (bool): Whether to include rotated log files. (Default: False)
+            node_type: The type of node for which to fetch log files. Can be 'ACTIVE' or
+                       'BACKUP'. (Default: None)
+
+        Returns:
+            dict: The manifest, with a `members` list holding the `file`, `size` and
+                  `seconds` of each member, or its `error`.
+
+        Raises:
+            WapiRequestException: If the list of Grid members cannot be fetched.
+        """
+
+        def fetch(member: str) -> str:
+            payload = {
+                "log_type": log_type,
+                "include_rotated": include_rotated,
+                "member": member,
+            }
+            if node_type:
+                payload["node_type"] = node_type
+            obj = self.__request_download("get_log_files", payload)
+            return self.__bulk_file_download(obj, member, output_dir)
+
+        return self.__bulk_run(
+            fetch, members, output_dir, workers, {"get_log_files": log_type}
+        )
+
+    def member_config_bulk(
+        self,
+        conf_type: MemberDataType,
+        members: Optional[Iterable[str]] = None,
+        output_dir: str = ".",
+        workers: int = 8,
+    ) -> dict:
+        """
+        Fetch the configuration file of a service from many members concurrently.
+
+        Works like `get_log_files_bulk`: each member's file is saved in `output_dir` as
+        `<member>_<filename>`, with a `manifest.json` summarising the run.
+
+        Args:
+            conf_type: An enum representing the type of config file.
+            members: The members to fetch the file of. Defaults to all members of the Grid.
+            output_dir: The directory to save the files in. Default is ".".
+            workers: The maximum number of members fetched concurrently. Default is 8.
+
+        Returns:
+            dict: The manifest, with a `members` list holding the `file`, `size` and
+                  `seconds` of each member, or its `error`.
+
+        Raises:
+            WapiRequestException: If the list of Grid members cannot be fetched.
+        """
+        conf_type = conf_type.upper()
+
+        def fetch(member: str) -> str:
+            payload = {"member": member, "type": conf_type}
+            obj = self.__request_download("getmemberdata", payload)
+            return self.__bulk_file_download(obj, member, output_dir)
+
+        return self.__bulk_run(
+            fetch, members, output_dir, workers, {"getmemberdata": conf_type}
+        )
 
     def get_lease_history(
         self,
@@ -790,6 +1433,7 @@ class NiosFileopMixin:
         start_time: int = None,
         end_time: int = None,
         remove_url: str = None,
+        compress: Optional[Compression] = None,
     ) -> None:
         """
         fetch DHCP lease history files from a NIOS Grid Member
@@ -799,6 +1443,8 @@ class NiosFileopMixin:
             start_time: An optional integer representing the start time in epoch format. Defaults to None.
             end_time: An optional integer representing the end time in epoch format. Defaults to None.
             remove_url: An optional string representing the remove URL. Defaults to None.
+            compress: An optional compression ('gzip' or 'zstd') to write the file with.
+                      Defaults to None.
 
         Returns:
             A string representing the filename of the downloaded DHCP lease history file.
@@ -808,6 +1454,8 @@ class NiosFileopMixin:
 
         """
         logging.info("fetching DHCP lease history from grid member %s", member)
+        if compress:
+            check_compression(compress)
         payload = {"member": member}
         if start_time is not None:
             payload["start_time"] = start_time
@@ -829,7 +1477,81 @@ class NiosFileopMixin:
         download_url = obj.get("url")
         download_token = obj.get("token")
 
-        self.file_download(token=download_token, url=download_url)
+        self.file_download(token=download_token, url=download_url, compress=compress)
+
+    def __bulk_file_download(self, obj: dict, member: str, output_dir: str) -> str:
+        download_url = obj.get("url")
+        filename = os.path.join(
+            output_dir, f"{member}_{util.extract_filename_from_url(download_url)}"
+        )
+        self.file_download(token=obj.get("token"), url=download_url, filename=filename)
+        return filename
+
+    def __bulk_run(
+        self,
+        fetch: Callable[[str], str],
+        items: Optional[Iterable[str]],
+        output_dir: str,
+        workers: int,
+        request: dict,
+        key: str = "member",
+        details: Optional[Callable[[str], dict]] = None,
+    ) -> dict:
+        if workers < 1:
+            raise WapiInvalidParameterException("workers must be a positive integer")
+        if items is None:
+            items = self.__grid_members()
+        elif isinstance(items, str):
+            items = [items]
+        items = list(dict.fromkeys(items))
+        os.makedirs(output_dir, exist_ok=True)
+
+        def run(item: str) -> dict:
+            start = time.monotonic()
+            try:
+                filename = fetch(item)
+                result = {
+                    key: item,
+                    "status": "ok",
+                    "file": os.path.basename(filename),
+                    "size": os.path.getsize(filename),
+                }
+                if details:
+                    result.update(details(filename))
+            except (BaseWapiException, OSError, ValueError) as err:
+                logging.error("%s: %s", item, err)
+                return {key: item, "status": "failed", "error": str(err)}
+            result["seconds"] = round(time.monotonic() - start, 3)
+            return result
+
+        started = datetime.now(timezone.utc)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ibx-fileop-bulk"
+        ) as executor:
+            results = list(executor.map(run, items))
+        failed = sum(1 for result in results if result["status"] != "ok")
+
+        manifest = {
+            "grid_mgr": self.grid_mgr,
+            "request": request,
+            "started": started.isoformat(),
+            "finished": datetime.now(timezone.utc).isoformat(),
+            "total": len(results),
+            "failed": failed,
+            f"{key}s": results,
+        }
+        with open(
+            os.path.join(output_dir, "manifest.json"), "w", encoding="utf8"
+        ) as file:
+            json.dump(manifest, file, indent=2)
+        logging.info(
+            "fetched %d of %d %ss into %s",
+            len(results) - failed,
+            len(results),
+            key,
+            output_dir,
+        )
+        return manifest
 
     def __csv_import(
         self,
@@ -875,7 +1597,63 @@ class NiosFileopMixin:
 
         return res.json()
 
-    def __download_complete(self, token: str, filename: str, req_cookies: dict) -> None:
+    def __fetch_csv_errors(self, task: CsvImportProgress) -> None:
+        try:
+            self.get_csv_errors_file(filename=task.file_name, job_id=task.import_id)
+        except WapiRequestException as err:
+            logging.error("unable to fetch csv-errors of %s: %s", task.file_name, err)
+        else:
+            task.errors_file = f"csv-errors-{task.file_name}.csv"
+            logging.warning(
+                "csv import %s: %d lines failed, see %s",
+                task.file_name,
+                task.lines_failed,
+                task.errors_file,
+            )
+
+    @staticmethod
+    def __load_checkpoint(checkpoint_file: str, source: dict) -> Optional[dict]:
+        try:
+            with open(checkpoint_file, "r", encoding="utf8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if any(state.get(key) != value for key, value in source.items()):
+            logging.warning(
+                "ignoring checkpoint %s of a different csv import", checkpoint_file
+            )
+            return None
+        return state
+
+    @staticmethod
+    def __save_checkpoint(checkpoint_file: str, state: dict) -> None:
+        # write to a temp file and rename it, so that an interruption never leaves a
+        # partial checkpoint
+        directory = os.path.dirname(checkpoint_file) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf8") as file:
+            json.dump(state, file, indent=2)
+        os.replace(tmp_path, checkpoint_file)
+
+    def __csv_export_request(self, wapi_object: str) -> dict:
+        # Call WAPI fileop  csv_export function
+        logging.info("performing csv export for %s object(s)", wapi_object)
+        payload = {"_object": wapi_object}
+        try:
+            response = self.post(
+                "fileop", params={"_function": "csv_export"}, json=payload
+            )
+            logging.debug(response.text)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            logging.error(err)
+            raise WapiRequestException(err)
+
+        return response.json()
+
+    def __download_complete(
+        self, token: str, filename: str, req_cookies: dict, aborted: bool = False
+    ) -> None:
         header = {"Content-type": "application/json"}
         payload = {"token": token}
         try:
@@ -886,7 +1664,10 @@ class NiosFileopMixin:
                 headers=header,
                 cookies=req_cookies,
             )
-            logging.info("file %s download complete", filename)
+            if aborted:
+                logging.info("file %s download aborted", filename)
+            else:
+                logging.info("file %s download complete", filename)
             res.raise_for_status()
         except requests.exceptions.RequestException as err:
             logging.error(err)
@@ -952,13 +1733,14 @@ class NiosFileopMixin:
         return res
 
     def __upload_file(
-        self, upload_url: str, upload_file: dict, req_cookies: dict
+        self, upload_url: str, upload_body: MultipartFileStream, req_cookies: dict
     ) -> None:
         logging.debug(upload_url)
         try:
             res = self.conn.post(
                 upload_url,
-                files=upload_file,
+                data=upload_body,
+                headers={"Content-Type": upload_body.content_type},
                 cookies=req_cookies,
                 verify=self.ssl_verify,
             )
@@ -968,6 +1750,26 @@ class NiosFileopMixin:
             logging.error(err)
             raise WapiRequestException(err)
 
+    def __grid_members(self) -> list:
+        try:
+            res = self.get("member", params={"_return_fields": "host_name"})
+            res.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            logging.error(err)
+            raise WapiRequestException(err)
+        return [member["host_name"] for member in res.json()]
+
+    def __request_download(self, function: str, payload: dict) -> dict:
+        try:
+            res = self.post("fileop", params={"_function": function}, json=payload)
+            logging.debug(res.text)
+            res.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            logging.error(err)
+            raise WapiRequestException(err)
+
+        return res.json()
+
     def __upload_init(self, filename: str) -> dict:
         headers = {"content-type": "application/json"}
         payload = {"filename": filename}
@@ -992,9 +1794,11 @@ class NiosFileopMixin:
         return {"ibapauth": ibapauth_cookie}
 
     @staticmethod
-    def __write_file(filename: str, data: requests.Response) -> None:
+    def __write_file(
+        filename: str,
+        data: requests.Response,
+        progress: Optional[ProgressCallback] = None,
+        compress: Optional[Compression] = None,
+    ) -> None:
         logging.info("writing file: %s", filename)
-        with open(filename, "wb") as file:
-            for chunk in data.iter_content(chunk_size=1024):
-                if chunk:
-                    file.write(chunk)
+        write_response(data, filename, progress=progress, compress=compress)
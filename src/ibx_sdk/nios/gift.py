@@ -15,18 +15,33 @@ limitations under the License.
 """
 
 import logging
-from typing import Union, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Union, Any, Optional, Iterator, Iterable, Literal
 
 import requests
 import urllib3
 from requests import Response
-
-from ibx_sdk.nios.exceptions import WapiInvalidParameterException, WapiRequestException
+from urllib3.util.retry import Retry
+
+from ibx_sdk.nios.adapter import RetryStats, WapiHTTPAdapter, WapiRetry
+from ibx_sdk.nios.batch import WapiBatch
+from ibx_sdk.nios.exceptions import (
+    BaseWapiException,
+    WapiInvalidParameterException,
+    WapiRequestException,
+)
 from ibx_sdk.nios.fileop import NiosFileopMixin
+from ibx_sdk.nios.ratelimit import RateLimiter
+from ibx_sdk.nios.schema_cache import SchemaCache
 from ibx_sdk.nios.service import NiosServiceMixin
+from ibx_sdk.nios.session_store import SessionStore
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+MapMethod = Literal["get", "getone", "post", "put", "delete"]
+MapErrorPolicy = Literal["raise", "collect"]
+
 
 class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
     """Handles interactions with the Infoblox WAPI.
@@ -41,6 +56,28 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
         conn (requests.sessions.Session, optional): Active session to the WAPI grid. Default is
                                                     None.
         grid_ref (str, optional): Reference ID of the connected grid. Default is None.
+        pool_connections (int): Number of connection pools to cache. Default is 10.
+        pool_maxsize (int): Maximum number of connections kept open per pool. Set this to
+                            at least the number of concurrent callers. Default is 10.
+        keep_alive (bool): Reuse connections between requests and enable TCP keep-alive
+                           on them. If False, every request opens a new connection.
+                           Default is True.
+        tcp_nodelay (bool): Set TCP_NODELAY on the connections. Default is True.
+        retries (Union[int, Retry]): The retry policy for failed requests. An integer
+                                     is the maximum number of retries of a `WapiRetry`
+                                     policy (exponential backoff with jitter, Retry-After
+                                     honoured, POST not retried); a `urllib3` Retry
+                                     instance is used as-is. Default is 0 (no retries).
+        rate_limiter (RateLimiter, optional): Token bucket limiting the request rate of this
+                                              instance. Share one RateLimiter between
+                                              instances to limit their combined rate.
+                                              Default is None (no limit).
+        schema_cache (SchemaCache, optional): Cache of the `_schema` data used by
+                                              `object_fields` and `max_wapi_ver`.
+                                              Default is None (no caching).
+        nios_build (str, optional): The NIOS build of the Grid, used to key the schema
+                                    cache so that an upgrade does not serve stale
+                                    schemas. Default is None.
 
     Examples:
 
@@ -79,11 +116,27 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
         grid_mgr: str = None,
         wapi_ver: str = "2.5",
         ssl_verify: Union[bool, str] = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        tcp_nodelay: bool = True,
+        retries: Union[int, Retry] = 0,
+        rate_limiter: Optional[RateLimiter] = None,
+        schema_cache: Optional[SchemaCache] = None,
+        nios_build: Optional[str] = None,
     ) -> None:
         super().__init__()
         self.grid_mgr = grid_mgr
         self.wapi_ver = wapi_ver
         self.ssl_verify = ssl_verify
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.tcp_nodelay = tcp_nodelay
+        self.retries = retries
+        self.rate_limiter = rate_limiter
+        self.schema_cache = schema_cache
+        self.nios_build = nios_build
         self.conn = None
         self.grid_ref = None
 
@@ -93,6 +146,26 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
             args.append(f"{key}={value}")
         return f"{self.__class__.__qualname__}({', '.join(args)})"
 
+    @property
+    def retry_stats(self) -> Optional[RetryStats]:
+        """
+        The retry counters of the current connection, or None if the connection has no
+        `WapiRetry` policy.
+
+        Example:
+
+        ```python
+        wapi = Gift(grid_mgr='gm.example.com', wapi_ver='2.12', retries=5)
+        wapi.connect(username='admin', password='infoblox')
+        ...
+        print(wapi.retry_stats.as_dict())  # e.g. {'status': 3, 'connect': 1}
+        ```
+        """
+        if self.conn is None:
+            return None
+        retries = self.conn.get_adapter(self.url).max_retries
+        return getattr(retries, "stats", None)
+
     @property
     def url(self) -> str:
         """
@@ -132,7 +205,11 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
         return ""
 
     def connect(
-        self, username: str = None, password: str = None, certificate: str = None
+        self,
+        username: str = None,
+        password: str = None,
+        certificate: str = None,
+        session_store: Optional[SessionStore] = None,
     ) -> None:
         """
         Make a connection to the grid manager using the WAPI instance
@@ -141,6 +218,8 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
             username: A string representing the username for the connection. (default: None)
             password: A string representing the password for the connection. (default: None)
             certificate: A string representing the certificate for the connection. (default: None)
+            session_store: Optional SessionStore to save the session cookie of a username and
+                           password login in, for reuse with `resume_session`. (default: None)
 
         Raises:
             WapiInvalidParameterException: If neither a username and password nor a certificate
@@ -153,11 +232,68 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
 
         if username and password:
             self.__basic_auth_request(username, password)
+            if session_store is not None and self.conn.cookies.get("ibapauth"):
+                session_store.save(
+                    self.grid_mgr, username, self.conn.cookies.get("ibapauth")
+                )
         elif certificate:
             self.__certificate_auth_request(certificate)
         else:
             raise WapiInvalidParameterException
 
+    def resume_session(self, username: str, session_store: SessionStore) -> bool:
+        """
+        Connect to the grid manager by reusing a stored session cookie.
+
+        The ibapauth cookie stored for the grid manager and username is validated with a
+        single GET of the grid object, which does not perform a new login. If the Grid
+        rejects the cookie (e.g. the session expired), the stored session is removed and
+        False is returned, and the caller should log in again with `connect`.
+
+        Args:
+            username: The username of the stored session.
+            session_store: The SessionStore holding the session cookie.
+
+        Returns:
+            bool: True if the stored session is valid and the instance is now connected.
+
+        Example:
+
+        ```python
+        store = SessionStore()
+        if not wapi.resume_session('admin', store):
+            wapi.connect(username='admin', password=getpass.getpass(), session_store=store)
+        ```
+        """
+        if not self.url:
+            logging.error("invalid url %s - unable to connect!", self.url)
+            raise WapiInvalidParameterException
+
+        ibapauth = session_store.load(self.grid_mgr, username)
+        if not ibapauth:
+            return False
+
+        conn = self.__new_session()
+        conn.cookies.set("ibapauth", ibapauth)
+        try:
+            res = conn.get(f"{self.url}/grid", verify=self.ssl_verify)
+        except requests.exceptions.RequestException as err:
+            conn.close()
+            logging.debug("unable to resume session: %s", err)
+            return False
+        if res.status_code != 200:
+            conn.close()
+            logging.info("stored session for %s is no longer valid", username)
+            if res.status_code in (401, 403):
+                session_store.delete(self.grid_mgr, username)
+            return False
+
+        grid = res.json()
+        self.__set_conn(conn)
+        setattr(self, "grid_ref", grid[0].get("_ref"))
+        logging.debug("resumed session for %s@%s", username, self.grid_mgr)
+        return True
+
     def __certificate_auth_request(self, certificate: str) -> Union[dict, None]:
         """
         This private method performs a certificate authentication request to the API. It uses the
@@ -174,20 +310,22 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
             WapiRequestException: If there is an error with the request to the API.
 
         """
-        with requests.sessions.Session() as conn:
-            try:
-                res = conn.get(
-                    f"{self.url}/grid", cert=certificate, verify=self.ssl_verify
-                )
-                res.raise_for_status()
-            except requests.exceptions.RequestException as err:
-                logging.error(err)
-                raise WapiRequestException(err) from err
-            else:
-                grid = res.json()
-                setattr(self, "conn", conn)
-                setattr(self, "grid_ref", grid[0].get("_ref"))
-                return grid[0].get("_ref", "")
+        conn = self.__new_session()
+        try:
+            res = conn.get(f"{self.url}/grid", cert=certificate, verify=self.ssl_verify)
+            res.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            conn.close()
+            logging.error(err)
+            raise WapiRequestException(err) from err
+        except OSError:
+            conn.close()
+            raise
+        else:
+            grid = res.json()
+            self.__set_conn(conn)
+            setattr(self, "grid_ref", grid[0].get("_ref"))
+            return grid[0].get("_ref", "")
 
     def __basic_auth_request(self, username: str, password: str) -> Union[dict, None]:
         """
@@ -208,22 +346,52 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
         Raises:
             WapiRequestException: If an error occurs during the request.
         """
-        with requests.sessions.Session() as conn:
-            try:
-                res = conn.get(
-                    f"{self.url}/grid",
-                    auth=(username, password),
-                    verify=self.ssl_verify,
-                )
-                res.raise_for_status()
-            except requests.exceptions.RequestException as err:
-                logging.error(err)
-                raise WapiRequestException(err) from err
-            else:
-                grid = res.json()
-                setattr(self, "conn", conn)
-                setattr(self, "grid_ref", grid[0].get("_ref"))
-                return grid[0].get("_ref", "")
+        conn = self.__new_session()
+        try:
+            res = conn.get(
+                f"{self.url}/grid",
+                auth=(username, password),
+                verify=self.ssl_verify,
+            )
+            res.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            conn.close()
+            logging.error(err)
+            raise WapiRequestException(err) from err
+        else:
+            grid = res.json()
+            self.__set_conn(conn)
+            setattr(self, "grid_ref", grid[0].get("_ref"))
+            return grid[0].get("_ref", "")
+
+    def __new_session(self) -> requests.sessions.Session:
+        """
+        Create the session used for all requests to the Grid, with its connection pool and
+        retry policy mounted through a WapiHTTPAdapter.
+        """
+        conn = requests.sessions.Session()
+        retries = self.retries
+        if isinstance(retries, int) and not isinstance(retries, bool) and retries > 0:
+            retries = WapiRetry(total=retries)
+        adapter = WapiHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            keep_alive=self.keep_alive,
+            tcp_nodelay=self.tcp_nodelay,
+            max_retries=retries,
+            rate_limiter=self.rate_limiter,
+        )
+        conn.mount("https://", adapter)
+        conn.mount("http://", adapter)
+        if not self.keep_alive:
+            conn.headers["Connection"] = "close"
+        return conn
+
+    def __set_conn(self, conn: requests.sessions.Session) -> None:
+        # release the pooled connections of a previous login before replacing it
+        if self.conn is not None and self.conn is not conn:
+            self.conn.close()
+        setattr(self, "conn", conn)
 
     def object_fields(self, wapi_object: str) -> Union[str, None]:
         """
@@ -248,22 +416,17 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
             print(f"Fields: {fields}")
         ```
         """
-        try:
-            logging.debug("trying %s/%s?_schema", self.url, wapi_object)
-            res = self.conn.get(
-                f"{self.url}/{wapi_object}?_schema", verify=self.ssl_verify
-            )
-            res.raise_for_status()
-            data = res.json()
-        except requests.exceptions.RequestException as err:
-            logging.error(err)
-            raise WapiRequestException(err)
-        else:
-            fields = ",".join(
-                field["name"]
-                for field in data.get("fields")
-                if "r" in field.get("supports")
-            )
+        data = self.__get_schema(
+            f"{self.url}/{wapi_object}?_schema",
+            self.wapi_ver,
+            wapi_object,
+            self.ssl_verify,
+        )
+        fields = ",".join(
+            field["name"]
+            for field in data.get("fields")
+            if "r" in field.get("supports")
+        )
         return fields
 
     def max_wapi_ver(self) -> None:
@@ -292,20 +455,39 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
         """
 
         url = f"https://{self.grid_mgr}/wapi/v1.0/?_schema"
+        data = self.__get_schema(url, "1.0", "_schema", False)
+        versions = list(data.get("supported_versions"))
+        versions.sort(key=lambda s: list(map(int, s.split("."))))
+        logging.debug(versions)
+        max_wapi_ver = versions.pop()
+        setattr(self, "wapi_ver", max_wapi_ver)
+
+    def __get_schema(
+        self, url: str, wapi_ver: str, wapi_object: str, verify: Union[bool, str]
+    ) -> dict:
+        """
+        Return the `_schema` data of a WAPI object from the schema cache, or fetch it from
+        the Grid and store it in the cache.
+        """
+        if self.schema_cache is not None:
+            data = self.schema_cache.get(
+                self.grid_mgr, wapi_ver, wapi_object, self.nios_build
+            )
+            if data is not None:
+                return data
         try:
             logging.debug("trying %s", url)
-            res = self.conn.get(url, verify=False)
+            res = self.conn.get(url, verify=verify)
             res.raise_for_status()
             data = res.json()
         except requests.exceptions.RequestException as err:
             logging.error(err)
             raise WapiRequestException(err)
-        else:
-            versions = data.get("supported_versions")
-            versions.sort(key=lambda s: list(map(int, s.split("."))))
-            logging.debug(versions)
-            max_wapi_ver = versions.pop()
-            setattr(self, "wapi_ver", max_wapi_ver)
+        if self.schema_cache is not None:
+            self.schema_cache.set(
+                self.grid_mgr, wapi_ver, wapi_object, data, self.nios_build
+            )
+        return data
 
     def get(
         self, wapi_object: str, params: Optional[dict] = None, **kwargs: Any
@@ -332,6 +514,57 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
                 raise WapiRequestException(res.text)
         return res
 
+    def iter_objects(
+        self,
+        wapi_object: str,
+        params: Optional[dict] = None,
+        page_size: int = 1000,
+        **kwargs: Any,
+    ) -> Iterator[dict]:
+        """
+        Iterate over WAPI object(s) using WAPI result paging.
+
+        The objects are fetched one page at a time using the `_paging` and `_page_id`
+        WAPI options, and yielded one object at a time. Only a single page of results is
+        held in memory, regardless of how large the overall result set is.
+
+        Args:
+            wapi_object (str): The name of the WAPI object to retrieve.
+            params (Optional[dict]): Optional parameters to include in the request URL.
+            page_size (int): The number of objects to fetch per page. Default is 1000.
+            **kwargs: Additional keyword arguments to pass to the request.
+
+        Yields:
+            dict: Each WAPI object in the result set.
+
+        Raises:
+            WapiInvalidParameterException: If `page_size` is not a positive integer.
+            WapiRequestException: If any page request fails.
+
+        Example:
+
+        ```python
+        for host in wapi.iter_objects('record:host', params={'view': 'default'}):
+            print(host['name'])
+        ```
+        """
+        if page_size < 1:
+            raise WapiInvalidParameterException("page_size must be a positive integer")
+
+        page_params = dict(params or {})
+        page_params.update(
+            {"_paging": 1, "_return_as_object": 1, "_max_results": page_size}
+        )
+        while True:
+            res = self.get(wapi_object, params=page_params, **kwargs)
+            data = res.json()
+            yield from data.get("result", [])
+            next_page_id = data.get("next_page_id")
+            if not next_page_id:
+                break
+            logging.debug("fetching next page %s of %s", next_page_id, wapi_object)
+            page_params = {"_page_id": next_page_id}
+
     def getone(
         self, wapi_object: str, params: Optional[dict] = None, **kwargs: Any
     ) -> str:
@@ -442,3 +675,131 @@ class Gift(requests.sessions.Session, NiosServiceMixin, NiosFileopMixin):
             raise WapiRequestException(err)
         else:
             return res
+
+    @contextmanager
+    def batch(self, chunk_size: int = 100) -> Iterator[WapiBatch]:
+        """
+        Queue WAPI operations and submit them as WAPI multi-requests.
+
+        Operations queued on the yielded `WapiBatch` are sent to the Grid `chunk_size` at a
+        time using the WAPI `request` object, instead of one HTTPS round trip per operation.
+        Pending operations are flushed when the `with` block exits normally; if the block
+        raises, operations not yet submitted are discarded.
+
+        Each queued call returns a `WapiBatchItem`. Calling its `result()` method returns the
+        WAPI result of that operation or raises `WapiRequestException` for that operation
+        alone; a failing operation does not fail the rest of the batch.
+
+        Args:
+            chunk_size (int): The maximum number of operations per multi-request. Default
+                              is 100.
+
+        Yields:
+            WapiBatch: The batch to queue operations on.
+
+        Raises:
+            WapiInvalidParameterException: If `chunk_size` is not a positive integer.
+
+        Example:
+
+        ```python
+        with wapi.batch(chunk_size=500) as batch:
+            items = [
+                batch.post('fixedaddress', data={'ipv4addr': ip, 'mac': mac})
+                for ip, mac in addresses
+            ]
+
+        for item in items:
+            try:
+                print(item.result())
+            except WapiRequestException as err:
+                log.error(err)
+        ```
+        """
+        wapi_batch = WapiBatch(self, chunk_size=chunk_size)
+        yield wapi_batch
+        wapi_batch.flush()
+
+    def map(
+        self,
+        method: MapMethod,
+        items: Iterable[Union[str, tuple, dict]],
+        workers: int = 8,
+        on_error: MapErrorPolicy = "raise",
+    ) -> list:
+        """
+        Run a request method for many items across a bounded thread pool.
+
+        All calls share this instance's HTTP session, so they reuse the same connection pool
+        and ibapauth cookie. Results are returned in the same order as `items`.
+
+        Each item is passed to `method` as follows:
+
+        - a `str` is passed as the first positional argument, e.g. the object name or _ref
+        - a `tuple` is unpacked as positional arguments
+        - a `dict` is unpacked as keyword arguments
+
+        Args:
+            method (MapMethod): The request method to call, one of 'get', 'getone', 'post',
+                                'put' or 'delete'.
+            items (Iterable): The arguments of each call.
+            workers (int): The maximum number of concurrent calls. Default is 8.
+            on_error (MapErrorPolicy): With 'raise', the first failed call (in input order)
+                                       raises its exception and calls not yet started are
+                                       cancelled. With 'collect', the exception is returned
+                                       in place of that call's result. Default is 'raise'.
+
+        Returns:
+            list: The result of each call, in input order.
+
+        Raises:
+            WapiInvalidParameterException: If `method`, `workers` or `on_error` is invalid.
+            WapiRequestException: If a call fails and `on_error` is 'raise'.
+
+        Example:
+
+        ```python
+        responses = wapi.map(
+            'post',
+            [{'wapi_object': 'network', 'json': {'network': net}} for net in networks],
+            workers=16,
+            on_error='collect',
+        )
+        failed = [res for res in responses if isinstance(res, Exception)]
+        ```
+        """
+        if method not in MapMethod.__args__:
+            raise WapiInvalidParameterException(f"unsupported map method {method}")
+        if on_error not in MapErrorPolicy.__args__:
+            raise WapiInvalidParameterException(f"unsupported error policy {on_error}")
+        if workers < 1:
+            raise WapiInvalidParameterException("workers must be a positive integer")
+
+        func = getattr(self, method)
+        results = []
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="ibx-gift-map"
+        ) as executor:
+            futures = [executor.submit(Gift.__map_call, func, item) for item in items]
+            try:
+                for future in futures:
+                    try:
+                        results.append(future.result())
+                    except BaseWapiException as err:
+                        if on_error == "raise":
+                            raise
+                        logging.error(err)
+                        results.append(err)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+
+    @staticmethod
+    def __map_call(func, item: Union[str, tuple, dict]) -> Any:
+        if isinstance(item, dict):
+            return func(**item)
+        if isinstance(item, tuple):
+            return func(*item)
+        return func(item)
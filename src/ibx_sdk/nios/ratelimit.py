@@ -0,0 +1,144 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Optional
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket limiting the rate of WAPI requests.
+
+    Every request takes one token from the bucket. Tokens are refilled at `rate` per second
+    up to `burst`; when the bucket is empty, the request waits for the next token. A single
+    RateLimiter can be shared by several Gift (and AsyncGift) instances to cap their
+    combined load on a Grid.
+
+    When `adaptive` is set, the limiter lowers its rate when the Grid slows down: a response
+    slower than `latency_target`, or a 429/503 response, halves the current rate (at most
+    once per `latency_target` seconds, and never below `min_rate`). Each fast response then
+    raises the rate again by 5% of `rate`, until the configured `rate` is reached.
+
+    Args:
+        rate (float): The maximum sustained number of requests per second.
+        burst (int, optional): The bucket size, i.e. the number of requests that can be sent
+                               at once after an idle period. Defaults to `rate`, rounded up.
+        adaptive (bool): Adapt the rate to the response latency. Default is False.
+        latency_target (float): The response time, in seconds, above which the Grid is
+                                considered overloaded. Default is 2.0.
+        min_rate (float): The lowest rate the adaptive limiter will go down to. Default
+                          is 1.0.
+
+    Example:
+
+    ```python
+    limiter = RateLimiter(rate=20, burst=40, adaptive=True)
+    wapi = Gift(grid_mgr='gm.example.com', wapi_ver='2.12', rate_limiter=limiter)
+    ```
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        adaptive: bool = False,
+        latency_target: float = 2.0,
+        min_rate: float = 1.0,
+    ) -> None:
+        if rate <= 0:
+            raise WapiInvalidParameterException("rate must be a positive number")
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else math.ceil(rate)
+        if self.burst < 1:
+            raise WapiInvalidParameterException("burst must be a positive integer")
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.min_rate = min(float(min_rate), self.rate)
+        self.current_rate = self.rate
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(rate={self.rate}, burst={self.burst}, "
+            f"adaptive={self.adaptive}, current_rate={self.current_rate:.2f})"
+        )
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take a token from the bucket, waiting until one is available.
+
+        Returns:
+            float: The time waited, in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst),
+                self._tokens + (now - self._last_refill) * self.current_rate,
+            )
+            self._last_refill = now
+            # reserve the token now, so that concurrent callers queue up behind each other
+            self._tokens -= 1
+            wait = -self._tokens / self.current_rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def update(self, latency: float, status_code: Optional[int] = None) -> None:
+        """
+        Feed back the outcome of a request to the adaptive limiter.
+
+        Args:
+            latency (float): The response time of the request, in seconds.
+            status_code (int, optional): The HTTP status code of the response.
+        """
+        if not self.adaptive:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if latency > self.latency_target or status_code in OVERLOAD_STATUS_CODES:
+                if now - self._last_decrease < self.latency_target:
+                    return
+                self._last_decrease = now
+                self.current_rate = max(self.min_rate, self.current_rate / 2)
+                logging.warning(
+                    "grid overloaded (latency %.2fs, status %s) - reducing request "
+                    "rate to %.2f/s",
+                    latency,
+                    status_code,
+                    self.current_rate,
+                )
+            elif self.current_rate < self.rate:
+                self.current_rate = min(self.rate, self.current_rate + self.rate / 20)
@@ -0,0 +1,281 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def default_cache_dir() -> str:
+    """
+    Return the default directory of the on-disk schema cache.
+
+    This is `$XDG_CACHE_HOME/ibx_sdk/schema`, or `~/.cache/ibx_sdk/schema` when
+    XDG_CACHE_HOME is not set.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "ibx_sdk", "schema")
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", value)
+
+
+class SchemaCache:
+    """
+    Two-level cache of WAPI schema data.
+
+    Entries are keyed by grid manager, WAPI version and NIOS build, plus the WAPI object
+    name. They are held in an in-process LRU and, when `persist` is set, written as JSON
+    files to `<cache_dir>/<grid_mgr>/v<wapi_ver>-<nios_build>/` so that later runs do not
+    need to query the Grid at all. Entries older than `ttl` seconds are ignored and
+    re-fetched.
+
+    Note:
+        The NIOS build is only part of the key when it is given, e.g. with the
+        `nios_build` argument of Gift. Entries stored without it are shared by all the
+        builds of the Grid, so after a NIOS upgrade they are served until they expire.
+        Call `invalidate(grid_mgr)` after upgrading the Grid to drop them.
+
+    Args:
+        cache_dir (str, optional): The directory of the on-disk cache. Defaults to
+                                   `default_cache_dir()`.
+        ttl (int): The time to live of an entry, in seconds. Default is 86400 (1 day).
+        maxsize (int): The maximum number of entries in the in-process LRU. Default is 256.
+        persist (bool): Write entries to disk. Default is True.
+
+    Example:
+
+    ```python
+    cache = SchemaCache(ttl=7 * 86400)
+    wapi = Gift(grid_mgr='gm.example.com', wapi_ver='2.12', schema_cache=cache)
+    wapi.connect(username='admin', password='infoblox')
+    fields = wapi.object_fields('record:host')  # served from cache on later runs
+    ```
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl: int = 86400,
+        maxsize: int = 256,
+        persist: bool = True,
+    ) -> None:
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.persist = persist
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(cache_dir={self.cache_dir}, ttl={self.ttl}, "
+            f"maxsize={self.maxsize}, persist={self.persist})"
+        )
+
+    def _namespace(
+        self, grid_mgr: str, wapi_ver: str, nios_build: Optional[str]
+    ) -> tuple:
+        return grid_mgr, wapi_ver, nios_build or "any"
+
+    def _namespace_dir(self, namespace: tuple) -> str:
+        grid_mgr, wapi_ver, nios_build = namespace
+        return os.path.join(
+            self.cache_dir,
+            _safe_name(grid_mgr),
+            _safe_name(f"v{wapi_ver}-{nios_build}"),
+        )
+
+    def _path(self, namespace: tuple, wapi_object: str) -> str:
+        return os.path.join(
+            self._namespace_dir(namespace), f"{_safe_name(wapi_object)}.json"
+        )
+
+    def get(
+        self,
+        grid_mgr: str,
+        wapi_ver: str,
+        wapi_object: str,
+        nios_build: Optional[str] = None,
+    ) -> Optional[Any]:
+        """
+        Return a cached entry, or None if it is missing or expired.
+
+        Args:
+            grid_mgr: The grid manager the entry was fetched from.
+            wapi_ver: The WAPI version the entry was fetched with.
+            wapi_object: The WAPI object name of the entry.
+            nios_build: The NIOS build of the grid, if known.
+
+        Returns:
+            The cached value, or None.
+        """
+        namespace = self._namespace(grid_mgr, wapi_ver, nios_build)
+        key = namespace + (wapi_object,)
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                timestamp, value = entry
+                if now - timestamp <= self.ttl:
+                    self._lru.move_to_end(key)
+                    return value
+                del self._lru[key]
+
+        if not self.persist:
+            return None
+        path = self._path(namespace, wapi_object)
+        try:
+            with open(path, "r", encoding="utf8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        timestamp = entry.get("timestamp", 0)
+        if now - timestamp > self.ttl:
+            logging.debug("schema cache entry %s expired", path)
+            return None
+        logging.debug("schema cache hit %s", path)
+        self._remember(key, timestamp, entry.get("value"))
+        return entry.get("value")
+
+    def set(
+        self,
+        grid_mgr: str,
+        wapi_ver: str,
+        wapi_object: str,
+        value: Any,
+        nios_build: Optional[str] = None,
+    ) -> None:
+        """
+        Store an entry in the cache.
+
+        Args:
+            grid_mgr: The grid manager the entry was fetched from.
+            wapi_ver: The WAPI version the entry was fetched with.
+            wapi_object: The WAPI object name of the entry.
+            value: The JSON serializable value to store.
+            nios_build: The NIOS build of the grid, if known.
+        """
+        namespace = self._namespace(grid_mgr, wapi_ver, nios_build)
+        timestamp = time.time()
+        self._remember(namespace + (wapi_object,), timestamp, value)
+        if not self.persist:
+            return
+
+        path = self._path(namespace, wapi_object)
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temp file and rename it, so that readers never see partial data
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf8") as file:
+                json.dump({"timestamp": timestamp, "value": value}, file)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except OSError as err:
+            logging.warning("unable to write schema cache %s: %s", path, err)
+        finally:
+            if tmp_path is not None:
+                _remove(tmp_path)
+
+    def invalidate(
+        self,
+        grid_mgr: Optional[str] = None,
+        wapi_ver: Optional[str] = None,
+        nios_build: Optional[str] = None,
+    ) -> None:
+        """
+        Remove entries from the cache.
+
+        Without arguments the whole cache is cleared. Otherwise only the entries of
+        `grid_mgr` are removed, of all its WAPI versions and NIOS builds unless `wapi_ver`
+        or `nios_build` are given. Only the entry files and directories of the cache are
+        deleted from `cache_dir`, other files in it are left alone.
+
+        Args:
+            grid_mgr: The grid manager to remove the entries of.
+            wapi_ver: The WAPI version to remove the entries of.
+            nios_build: The NIOS build to remove the entries of.
+        """
+
+        def matches(namespace: tuple) -> bool:
+            return all(
+                wanted is None or wanted == value
+                for wanted, value in zip((grid_mgr, wapi_ver, nios_build), namespace)
+            )
+
+        with self._lock:
+            for key in [key for key in self._lru if matches(key[:3])]:
+                del self._lru[key]
+        if not self.persist:
+            return
+
+        if grid_mgr is None:
+            grid_dirs = _subdirs(self.cache_dir)
+        else:
+            grid_dirs = [os.path.join(self.cache_dir, _safe_name(grid_mgr))]
+        for grid_dir in grid_dirs:
+            for namespace_dir in _subdirs(grid_dir):
+                version, sep, build = os.path.basename(namespace_dir).partition("-")
+                if not (version.startswith("v") and sep):
+                    continue
+                if wapi_ver is not None and version != _safe_name(f"v{wapi_ver}"):
+                    continue
+                if nios_build is not None and build != _safe_name(nios_build):
+                    continue
+                for entry in os.scandir(namespace_dir):
+                    if entry.name.endswith(".json") and entry.is_file():
+                        _remove(entry.path)
+                _remove_dir(namespace_dir)
+            _remove_dir(grid_dir)
+
+    def _remember(self, key: tuple, timestamp: float, value: Any) -> None:
+        with self._lock:
+            self._lru[key] = (timestamp, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+
+def _subdirs(path: str) -> list[str]:
+    try:
+        return [entry.path for entry in os.scandir(path) if entry.is_dir()]
+    except OSError:
+        return []
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _remove_dir(path: str) -> None:
+    # only empty directories are removed, so files not created by the cache are kept
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
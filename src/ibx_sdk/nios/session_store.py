@@ -0,0 +1,194 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Optional, Union
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+
+SESSION_KEY_ENV = "IBX_SESSION_KEY"
+
+
+def default_session_dir() -> str:
+    """
+    Return the default directory of the session store.
+
+    This is `$XDG_CACHE_HOME/ibx_sdk/sessions`, or `~/.cache/ibx_sdk/sessions` when
+    XDG_CACHE_HOME is not set.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "ibx_sdk", "sessions")
+
+
+class SessionStore:
+    """
+    Local store of WAPI ibapauth session cookies, one per grid manager and username.
+
+    Storing the session cookie lets separate runs of a script reuse one login to the Grid
+    instead of authenticating every time. See `Gift.resume_session`.
+
+    Sessions are saved in files only readable by the current user, encrypted with Fernet
+    (AES-128-CBC with HMAC-SHA256) using the key given, or set in the IBX_SESSION_KEY
+    environment variable. Encryption requires the optional `cryptography` package, e.g.
+    `pip install ibx-sdk[session]`. A key can be generated with
+    `cryptography.fernet.Fernet.generate_key()`.
+
+    A stored session cookie gives access to the Grid until it expires, so the store
+    refuses to save sessions in plaintext unless `allow_plaintext` is set.
+
+    Args:
+        store_dir (str, optional): The directory of the session files. Defaults to
+                                   `default_session_dir()`.
+        key (str | bytes, optional): The Fernet key used to encrypt the session files.
+                                     Defaults to the IBX_SESSION_KEY environment variable.
+        allow_plaintext (bool, optional): Store the sessions unencrypted when no key is
+                                          set. Defaults to False.
+
+    Raises:
+        WapiInvalidParameterException: If no key is set and `allow_plaintext` is False, or
+                                       the `cryptography` package is not installed, or the
+                                       key is invalid.
+    """
+
+    def __init__(
+        self,
+        store_dir: Optional[str] = None,
+        key: Optional[Union[str, bytes]] = None,
+        allow_plaintext: bool = False,
+    ) -> None:
+        self.store_dir = store_dir or default_session_dir()
+        key = key or os.environ.get(SESSION_KEY_ENV)
+        self._fernet = None
+        if key:
+            try:
+                from cryptography.fernet import Fernet
+            except ImportError as err:
+                raise WapiInvalidParameterException(
+                    "encrypting the session store requires the cryptography package"
+                ) from err
+            try:
+                self._fernet = Fernet(key)
+            except ValueError as err:
+                raise WapiInvalidParameterException(
+                    f"invalid session store key: {err}"
+                ) from err
+        elif allow_plaintext:
+            logging.warning(
+                "session store %s is not encrypted, session cookies are saved in "
+                "plaintext",
+                self.store_dir,
+            )
+        else:
+            raise WapiInvalidParameterException(
+                f"no session store key, set {SESSION_KEY_ENV} to a Fernet key to "
+                f"encrypt the stored sessions"
+            )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(store_dir={self.store_dir}, "
+            f"encrypted={self.encrypted})"
+        )
+
+    @property
+    def encrypted(self) -> bool:
+        """Whether the session files are encrypted."""
+        return self._fernet is not None
+
+    def _path(self, grid_mgr: str, username: str) -> str:
+        digest = hashlib.sha256(f"{grid_mgr}\0{username}".encode()).hexdigest()
+        return os.path.join(self.store_dir, f"{digest}.session")
+
+    def load(self, grid_mgr: str, username: str) -> Optional[str]:
+        """
+        Return the stored ibapauth cookie of a grid manager and username.
+
+        Args:
+            grid_mgr: The grid manager of the session.
+            username: The username of the session.
+
+        Returns:
+            The ibapauth cookie value, or None if no usable session is stored.
+        """
+        path = self._path(grid_mgr, username)
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+        except OSError:
+            return None
+        try:
+            if self._fernet is not None:
+                content = self._fernet.decrypt(content)
+            session = json.loads(content)
+        except Exception as err:
+            logging.warning("ignoring unreadable session file %s: %s", path, err)
+            return None
+        if session.get("grid_mgr") != grid_mgr or session.get("username") != username:
+            return None
+        return session.get("ibapauth")
+
+    def save(self, grid_mgr: str, username: str, ibapauth: str) -> None:
+        """
+        Store the ibapauth cookie of a grid manager and username.
+
+        Args:
+            grid_mgr: The grid manager of the session.
+            username: The username of the session.
+            ibapauth: The ibapauth cookie value.
+        """
+        content = json.dumps(
+            {
+                "grid_mgr": grid_mgr,
+                "username": username,
+                "ibapauth": ibapauth,
+                "saved": int(time.time()),
+            }
+        ).encode()
+        if self._fernet is not None:
+            content = self._fernet.encrypt(content)
+
+        path = self._path(grid_mgr, username)
+        try:
+            os.makedirs(self.store_dir, mode=0o700, exist_ok=True)
+            # mkstemp creates the file with 0600 permissions
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.replace(tmp_path, path)
+        except OSError as err:
+            logging.warning("unable to save session to %s: %s", path, err)
+        else:
+            logging.debug("saved session for %s@%s", username, grid_mgr)
+
+    def delete(self, grid_mgr: str, username: str) -> None:
+        """
+        Remove the stored session of a grid manager and username.
+
+        Args:
+            grid_mgr: The grid manager of the session.
+            username: The username of the session.
+        """
+        try:
+            os.remove(self._path(grid_mgr, username))
+        except FileNotFoundError:
+            pass
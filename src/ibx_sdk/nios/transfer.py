@@ -0,0 +1,732 @@
+"""
+Copyright 2023 Infoblox
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import functools
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Iterator, Literal, Optional
+
+import requests
+import urllib3
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MIN_BUFFER_SIZE = 256 * 1024
+MAX_BUFFER_SIZE = 8 * 1024 * 1024
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+O_BINARY = getattr(os, "O_BINARY", 0)
+
+Compression = Literal["gzip", "zstd"]
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+
+class TransferProgress:
+    """
+    Progress of a file upload or download.
+
+    An instance is passed to the progress callback of the fileop methods every time a chunk
+    has been transferred. `done` is set on the last call, which for downloads is made once
+    the whole file has been written.
+
+    Attributes:
+        filename (str): The name of the file being transferred.
+        total (int, optional): The size of the transfer in bytes, if known.
+        transferred (int): The number of bytes transferred so far, including the bytes of a
+                           resumed transfer that were already on disk.
+        resumed (int): The number of bytes that were already on disk when a resumed
+                       transfer started. These are not counted in `rate`.
+        done (bool): Whether the transfer is finished.
+    """
+
+    def __init__(
+        self, filename: str, total: Optional[int] = None, resumed: int = 0
+    ) -> None:
+        self.filename = filename
+        self.total = total
+        self.transferred = resumed
+        self.resumed = resumed
+        self.done = False
+        self._start = time.monotonic()
+        self._end = None
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(filename={self.filename}, "
+            f"transferred={self.transferred}, total={self.total}, "
+            f"rate={self.rate:.0f}B/s)"
+        )
+
+    @property
+    def elapsed(self) -> float:
+        """The time spent on the transfer, in seconds."""
+        end = self._end if self._end is not None else time.monotonic()
+        return end - self._start
+
+    @property
+    def rate(self) -> float:
+        """The average throughput of the transfer, in bytes per second."""
+        elapsed = self.elapsed
+        return (self.transferred - self.resumed) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def percent(self) -> Optional[float]:
+        """The percentage of the transfer completed, if the size is known."""
+        if not self.total:
+            return None
+        return 100.0 * self.transferred / self.total
+
+    def update(self, size: int) -> None:
+        """
+        Record that `size` more bytes have been transferred.
+        """
+        self.transferred += size
+
+    def finish(self) -> None:
+        """
+        Mark the transfer as finished and log its throughput.
+        """
+        if self.done:
+            return
+        self.done = True
+        self._end = time.monotonic()
+        logging.info(
+            "transferred %s (%d bytes) in %.2fs at %.2f MB/s",
+            self.filename,
+            self.transferred - self.resumed,
+            self.elapsed,
+            self.rate / 1e6,
+        )
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+class MultipartFileStream:
+    """
+    Streaming multipart/form-data body for a file upload.
+
+    The body is produced on the fly from the multipart headers, the file and the closing
+    boundary, so the file is never held in memory as a whole, whatever its size. Iterating
+    over the stream yields the body in chunks of `chunk_size` bytes, each of which is
+    written to the socket as is. Its length is known up front, so the request is sent with
+    a Content-Length header rather than chunked transfer encoding. The stream supports
+    `tell`/`seek`, so that the request can be re-sent if the connection fails.
+
+    Args:
+        fileobj (BinaryIO): The open (binary) file to upload.
+        field (str): The name of the form field. Default is "file".
+        filename (str, optional): The filename sent in the form field. Defaults to `field`.
+        chunk_size (int): The size of the chunks sent to the socket. Default is 1 MiB.
+        progress (ProgressCallback, optional): Called with a `TransferProgress` after every
+                                               chunk.
+        size (int, optional): The number of bytes to read from `fileobj`. Defaults to the
+                              size of the underlying file, and must be given when
+                              `fileobj` is not a plain file, e.g. a decompressing reader.
+
+    Example:
+
+    ```python
+    with open('database.bak', 'rb') as fh:
+        body = MultipartFileStream(fh, chunk_size=4 * 1024 * 1024)
+        requests.post(url, data=body, headers={'Content-Type': body.content_type})
+    ```
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        field: str = "file",
+        filename: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; '
+            f'filename="{filename or field}"\r\n\r\n'
+        ).encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file_start = fileobj.tell()
+        if size is None:
+            size = os.fstat(fileobj.fileno()).st_size - self._file_start
+        self._file_size = size
+        self._length = len(self._head) + self._file_size + len(self._tail)
+        self._pos = 0
+        self._rewound = True
+        self._callback = progress
+        self.progress = TransferProgress(filename or field, total=self._length)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        # start from the current position, so that a rewound stream resends the whole body
+        while self._pos < self._length:
+            chunk = self._next_chunk()
+            self._pos += len(chunk)
+            self.progress.update(len(chunk))
+            if self._pos >= self._length:
+                self.progress.finish()
+            if self._callback is not None:
+                self._callback(self.progress)
+            yield chunk
+
+    @property
+    def content_type(self) -> str:
+        """The Content-Type header of the body."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def tell(self) -> int:
+        """
+        Return the current position in the body.
+        """
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Move to a position in the body, e.g. back to the start to resend it.
+        """
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._length
+        self._pos = min(max(offset, 0), self._length)
+        self._rewound = True
+        self.progress = TransferProgress(self.progress.filename, total=self._length)
+        self.progress.update(self._pos)
+        return self._pos
+
+    def _next_chunk(self) -> bytes:
+        head_len = len(self._head)
+        body_end = head_len + self._file_size
+        if self._pos < head_len:
+            return self._head[self._pos :]
+        if self._pos < body_end:
+            if self._rewound:
+                # readers of compressed files may only seek forwards, so avoid no-op seeks
+                offset = self._file_start + self._pos - head_len
+                if self.fileobj.tell() != offset:
+                    self.fileobj.seek(offset)
+                self._rewound = False
+            chunk = self.fileobj.read(min(self.chunk_size, body_end - self._pos))
+            if not chunk:
+                raise IOError(f"{self.progress.filename} was truncated during upload")
+            return chunk
+        return self._tail[self._pos - body_end :]
+
+
+def write_response(
+    response: requests.Response,
+    filename: str,
+    buffer_size: int = MIN_BUFFER_SIZE,
+    max_buffer_size: int = MAX_BUFFER_SIZE,
+    progress: Optional[ProgressCallback] = None,
+    compress: Optional[Compression] = None,
+) -> TransferProgress:
+    """
+    Write the body of a streamed response to a file.
+
+    The body is read straight from the connection into a reusable buffer with `readinto`
+    and written to the file descriptor with `os.write`, without creating a bytes object per
+    chunk. The buffer starts at `buffer_size` bytes and doubles, up to `max_buffer_size`,
+    whenever a read fills it, so fast transfers are done in few large system calls. A
+    response with a Content-Encoding (e.g. gzip) is decoded through
+    `requests.Response.iter_content` instead, in chunks of `max_buffer_size` bytes.
+
+    With `compress`, the body is compressed on the fly as it is written, so the
+    uncompressed data never touches the disk.
+
+    Args:
+        response (requests.Response): The response, requested with `stream=True`.
+        filename (str): The path of the file to write.
+        buffer_size (int): The initial size of the read buffer. Default is 256 KiB.
+        max_buffer_size (int): The maximum size of the read buffer. Default is 8 MiB.
+        progress (ProgressCallback, optional): Called with a `TransferProgress` after every
+                                               write.
+        compress (Compression, optional): Write the file as a 'gzip' or 'zstd' stream.
+
+    Returns:
+        TransferProgress: The final progress of the download, including its throughput.
+
+    Raises:
+        requests.exceptions.ConnectionError: If the connection failed, or the response
+                                             ended before its Content-Length was received.
+    """
+    length = response.headers.get("Content-Length")
+    stats = TransferProgress(filename, total=int(length) if length else None)
+    encoding = response.headers.get("Content-Encoding", "identity").lower()
+
+    if compress:
+        out = open_compressed(filename, "wb", compress)
+        write, close = out.write, out.close
+    else:
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY, 0o666)
+        write, close = (
+            functools.partial(_write_all, fd),
+            functools.partial(os.close, fd),
+        )
+    try:
+        if encoding != "identity":
+            for chunk in response.iter_content(chunk_size=max_buffer_size):
+                write(chunk)
+                stats.update(len(chunk))
+                if progress is not None:
+                    progress(stats)
+        else:
+            buffer = bytearray(buffer_size)
+            view = memoryview(buffer)
+            while True:
+                try:
+                    size = response.raw.readinto(buffer)
+                except urllib3.exceptions.HTTPError as err:
+                    raise requests.exceptions.ConnectionError(err) from err
+                if not size:
+                    break
+                write(view[:size])
+                stats.update(size)
+                if progress is not None:
+                    progress(stats)
+                if size == len(buffer) and len(buffer) < max_buffer_size:
+                    view.release()
+                    buffer = bytearray(min(len(buffer) * 2, max_buffer_size))
+                    view = memoryview(buffer)
+            view.release()
+    finally:
+        close()
+
+    if (
+        stats.total is not None
+        and encoding == "identity"
+        and stats.transferred < stats.total
+    ):
+        raise requests.exceptions.ConnectionError(
+            f"{filename} is incomplete: received {stats.transferred} of "
+            f"{stats.total} bytes"
+        )
+    stats.finish()
+    if progress is not None:
+        progress(stats)
+    return stats
+
+
+def _write_all(fd: int, data) -> None:
+    # os.write may write less than asked for, e.g. when interrupted by a signal
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def compression_from_filename(filename: str) -> Optional[Compression]:
+    """
+    Return the compression of a file, based on its '.gz' or '.zst' extension.
+
+    Args:
+        filename (str): The path of the file.
+
+    Returns:
+        The compression ('gzip' or 'zstd') of the file, or None.
+    """
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if filename.lower().endswith(suffix):
+            return compression
+    return None
+
+
+def compressed_filename(filename: str, compression: Compression) -> str:
+    """
+    Add the extension of a compression to a filename, unless it already has it.
+    """
+    if compression_from_filename(filename) == compression:
+        return filename
+    return f"{filename}{COMPRESSION_SUFFIXES[compression]}"
+
+
+def check_compression(compression: Compression) -> None:
+    """
+    Check that a compression is supported and available.
+
+    zstd is provided by the `compression.zstd` module of Python 3.14 and later, or by the
+    optional `zstandard` package.
+
+    Raises:
+        WapiInvalidParameterException: If the compression is unsupported, or zstd is not
+                                       available.
+    """
+    if compression not in COMPRESSION_SUFFIXES:
+        raise WapiInvalidParameterException(f"unsupported compression {compression}")
+    if compression == "zstd":
+        _zstd()
+
+
+def open_compressed(filename: str, mode: str, compression: Compression) -> BinaryIO:
+    """
+    Open a gzip or zstd compressed file in binary mode.
+
+    Args:
+        filename (str): The path of the file.
+        mode (str): 'rb' or 'wb'.
+        compression (Compression): 'gzip' or 'zstd'.
+
+    Returns:
+        A binary file object reading or writing the uncompressed data.
+
+    Raises:
+        WapiInvalidParameterException: If the compression is unsupported, or zstd is not
+                                       available.
+    """
+    check_compression(compression)
+    if compression == "zstd":
+        return _zstd().open(filename, mode)
+    # level 6 compresses nearly as well as the default 9 at a fraction of the CPU cost
+    return gzip.open(filename, mode, compresslevel=6)
+
+
+def _zstd():
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError as err:
+            raise WapiInvalidParameterException(
+                "zstd compression requires Python 3.14+ or the zstandard package"
+            ) from err
+    return zstd
+
+
+def uncompressed_size(filename: str, compression: Compression) -> int:
+    """
+    Return the size of the uncompressed data of a gzip or zstd file.
+
+    The file is decompressed, without writing anything to disk, to count its bytes, since
+    neither format reliably records the uncompressed size.
+    """
+    size = 0
+    buffer = bytearray(DEFAULT_CHUNK_SIZE)
+    with open_compressed(filename, "rb", compression) as file:
+        while True:
+            count = file.readinto(buffer)
+            if not count:
+                return size
+            size += count
+
+
+class RangeDownload:
+    """
+    Resumable download of a file, optionally fetched in parallel byte ranges.
+
+    The file is first written to `<filename>.part`. When the server supports HTTP range
+    requests, the download is split into `parallel` segments which are fetched
+    concurrently and written at their offsets in the `.part` file. Their progress is kept
+    in a `<filename>.part.json` sidecar. A segment whose connection fails is retried from
+    its last byte rather than from the start. An interrupted download is resumed from the
+    sidecar on the next run, as long as the server reports the same file (same size and
+    ETag/Last-Modified, or the same URL when the server sends neither).
+
+    When the server does not support ranges, the file is downloaded in a single stream.
+    In both cases the `.part` file is only renamed to `filename` once all of its bytes are
+    received and its size matches the size reported by the server.
+
+    Args:
+        session (requests.Session): The session used to send the requests.
+        url (str): The URL of the file.
+        filename (str): The path of the downloaded file.
+        parallel (int): The number of ranges to fetch concurrently. Default is 1.
+        resume (bool): Resume from an existing `.part` file. Default is True.
+        retries (int): The number of times a failed range is retried. Default is 3.
+        progress (ProgressCallback, optional): Called with a `TransferProgress` after every
+                                               write. With `parallel` > 1 it is called from
+                                               several threads.
+        compress (Compression, optional): Write the file as a 'gzip' or 'zstd' stream. The
+                                          file is then downloaded in a single stream and
+                                          cannot be resumed.
+        **kwargs: Keyword arguments passed to every `session.get` call, e.g. `headers`,
+                  `cookies` and `verify`.
+
+    Example:
+
+    ```python
+    RangeDownload(wapi.conn, url, 'bundle.tar.gz', parallel=4, verify=False).run()
+    ```
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        url: str,
+        filename: str,
+        parallel: int = 1,
+        resume: bool = True,
+        retries: int = 3,
+        progress: Optional[ProgressCallback] = None,
+        compress: Optional[Compression] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.session = session
+        self.url = url
+        self.filename = filename
+        self.parallel = max(1, parallel)
+        self.resume = resume
+        self.retries = retries
+        self.compress = compress
+        self.part_file = f"{filename}.part"
+        self.state_file = f"{filename}.part.json"
+        self._callback = progress
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._state = None
+        self._saved = 0.0
+        self.progress = None
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__qualname__}(url={self.url}, filename={self.filename}, "
+            f"parallel={self.parallel}, resume={self.resume})"
+        )
+
+    def run(self) -> TransferProgress:
+        """
+        Download the file.
+
+        Returns:
+            TransferProgress: The final progress of the download, including its throughput.
+
+        Raises:
+            requests.exceptions.RequestException: If the download failed. The `.part` file
+                                                  and its sidecar are kept for a later
+                                                  resume.
+        """
+        if self.compress:
+            response = self._get()
+            response.raise_for_status()
+            self.progress = write_response(
+                response,
+                self.part_file,
+                progress=self._callback,
+                compress=self.compress,
+            )
+            self._finish()
+            return self.progress
+
+        # a 1 byte range request tells whether the server supports ranges, and the size
+        probe = self._get(Range="bytes=0-0")
+        if probe.status_code == 416:
+            # an empty file has no byte 0
+            probe.close()
+            probe = self._get()
+        if probe.status_code != 206:
+            probe.raise_for_status()
+            if self.parallel > 1:
+                logging.info(
+                    "server does not support range requests, downloading %s in a "
+                    "single stream",
+                    self.filename,
+                )
+            self._remove(self.state_file)
+            self.progress = write_response(
+                probe, self.part_file, progress=self._callback
+            )
+            self._finish(self.progress.transferred)
+            return self.progress
+
+        content_range = _CONTENT_RANGE.match(probe.headers.get("Content-Range", ""))
+        validator = probe.headers.get("ETag") or probe.headers.get("Last-Modified")
+        probe.close()
+        if not content_range:
+            raise requests.exceptions.ConnectionError(
+                f"invalid Content-Range in the response from {self.url}"
+            )
+        size = int(content_range.group(3))
+
+        self._state = self._load_state(size, validator) if self.resume else None
+        if self._state is None:
+            self._state = self._new_state(size, validator)
+        done = sum(pos - start for start, _, pos in self._state["segments"])
+        if done:
+            logging.info("resuming %s at %d of %d bytes", self.filename, done, size)
+        self.progress = TransferProgress(self.filename, total=size, resumed=done)
+
+        pending = [seg for seg in self._state["segments"] if seg[2] < seg[1]]
+        try:
+            if len(pending) == 1:
+                self._fetch(pending[0])
+            elif pending:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.parallel, len(pending)),
+                    thread_name_prefix="ibx-range-download",
+                ) as executor:
+                    for future in [
+                        executor.submit(self._fetch, seg) for seg in pending
+                    ]:
+                        future.result()
+        finally:
+            with self._lock:
+                self._save_state()
+
+        self._finish(size)
+        return self.progress
+
+    def _fetch(self, segment: list) -> None:
+        attempt = 0
+        while segment[2] < segment[1]:
+            start = segment[2]
+            try:
+                self._fetch_range(segment)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout,
+            ) as err:
+                # failures in a row that made no progress count against the retry limit
+                attempt = 1 if segment[2] > start else attempt + 1
+                if attempt > self.retries:
+                    raise
+                logging.warning(
+                    "range download of %s failed at byte %d (%s), retrying",
+                    self.filename,
+                    segment[2],
+                    err,
+                )
+                time.sleep(min(0.5 * 2**attempt, 10))
+
+    def _fetch_range(self, segment: list) -> None:
+        start, end = segment[2], segment[1]
+        with self._get(Range=f"bytes={start}-{end - 1}") as response:
+            response.raise_for_status()
+            content_range = _CONTENT_RANGE.match(
+                response.headers.get("Content-Range", "")
+            )
+            if response.status_code != 206 or not (
+                content_range and int(content_range.group(1)) == start
+            ):
+                raise requests.exceptions.ConnectionError(
+                    f"server did not honour range {start}-{end - 1} of {self.url}"
+                )
+            buffer = bytearray(min(MAX_BUFFER_SIZE, end - start))
+            view = memoryview(buffer)
+            fd = os.open(self.part_file, os.O_WRONLY | O_BINARY)
+            try:
+                os.lseek(fd, start, os.SEEK_SET)
+                while segment[2] < end:
+                    try:
+                        size = response.raw.readinto(view[: end - segment[2]])
+                    except urllib3.exceptions.HTTPError as err:
+                        raise requests.exceptions.ConnectionError(err) from err
+                    if not size:
+                        raise requests.exceptions.ConnectionError(
+                            f"range {start}-{end - 1} of {self.url} ended at byte "
+                            f"{segment[2]}"
+                        )
+                    _write_all(fd, view[:size])
+                    with self._lock:
+                        segment[2] += size
+                        self.progress.update(size)
+                        if time.monotonic() - self._saved > 1.0:
+                            self._save_state()
+                    if self._callback is not None:
+                        self._callback(self.progress)
+            finally:
+                os.close(fd)
+                view.release()
+
+    def _finish(self, size: Optional[int] = None) -> None:
+        # verify the file before it replaces the target
+        actual = os.path.getsize(self.part_file)
+        if size is not None and actual != size:
+            raise requests.exceptions.ConnectionError(
+                f"{self.part_file} has {actual} bytes, expected {size}"
+            )
+        os.replace(self.part_file, self.filename)
+        self._remove(self.state_file)
+        if not self.progress.done:
+            self.progress.finish()
+            if self._callback is not None:
+                self._callback(self.progress)
+
+    def _get(self, **headers: str) -> requests.Response:
+        kwargs = dict(self._kwargs)
+        kwargs["headers"] = {**kwargs.get("headers", {}), **headers}
+        return self.session.get(self.url, stream=True, **kwargs)
+
+    def _new_state(self, size: int, validator: Optional[str]) -> dict:
+        count = max(1, min(self.parallel, size // MIN_SEGMENT_SIZE))
+        bounds = [size * i // count for i in range(count + 1)]
+        fd = os.open(self.part_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY)
+        try:
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+        return {
+            "url": self.url,
+            "size": size,
+            "validator": validator,
+            "segments": [[bounds[i], bounds[i + 1], bounds[i]] for i in range(count)],
+        }
+
+    def _load_state(self, size: int, validator: Optional[str]) -> Optional[dict]:
+        try:
+            with open(self.state_file, "r", encoding="utf8") as file:
+                state = json.load(file)
+            part_size = os.path.getsize(self.part_file)
+        except (OSError, ValueError):
+            return None
+        same_file = (
+            state.get("validator") == validator
+            if validator
+            else state.get("url") == self.url
+        )
+        if not same_file or state.get("size") != size or part_size != size:
+            logging.info("%s changed on the server, restarting download", self.filename)
+            return None
+        return state
+
+    def _save_state(self) -> None:
+        # called with the lock held
+        if self._state is None:
+            return
+        self._saved = time.monotonic()
+        tmp_file = f"{self.state_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf8") as file:
+                json.dump(self._state, file)
+            os.replace(tmp_file, self.state_file)
+        except OSError as err:
+            logging.warning(
+                "unable to save download state %s: %s", self.state_file, err
+            )
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
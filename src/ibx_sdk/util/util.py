@@ -15,13 +15,33 @@ limitations under the License.
 """
 
 import csv
+import hashlib
 import io
+import json
 import logging
 import os
 import pprint
+import re
+import shutil
 import subprocess
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 
+import dns.exception
+import dns.inet
+import dns.name
+import dns.rdataclass
+import dns.rdatatype
+import dns.tokenizer
+import dns.ttl
+import dns.zone
+
+from ibx_sdk.nios.transfer import compression_from_filename, open_compressed
+
 
 def named_checkconf(chroot_path: str, conf_path: str) -> None:
     """
@@ -145,23 +165,406 @@ def named_compilezone(
 rewrite_zone_file = named_compilezone
 
 
+def dnspython_compilezone(
+    zone_name: str, zone_file: str, output_file: str
+) -> Optional[list]:
+    """
+    The function dnspython_compilezone loads a text DNS zone file with dnspython, in
+    process, and writes it in the full format of named-compilezone.
+
+    It follows the contract of named_compilezone: when the zone has errors, the output
+    file is not written and the numbers of the offending lines are returned. Loading a
+    zone this way avoids starting a named-compilezone process, which costs more than
+    loading the zone itself for small zones.
+
+    Constructs that are not checked the way named-compilezone checks them, like
+    `$INCLUDE` directives, zone-level errors such as a missing SOA record, errors in
+    `$GENERATE` directives, or files that are not UTF-8, are not handled and None is
+    returned, so that the caller can run named_compilezone instead.
+
+    Args:
+        zone_name (str): The name of the DNS zone being processed.
+        zone_file (str): The path to the text zone file.
+        output_file (str): The path where the canonicalized zone file will be written to.
+
+    Returns:
+        list: The numbers of the offending lines, an empty list if the zone was loaded and
+            written, or None if the zone could not be checked in process.
+
+    Usage:
+        >>> errors = dnspython_compilezone('my_zone', '/path/to/zone', '/path/to/output')
+        >>> if errors is None:
+        ...     errors = named_compilezone('my_zone', '/path/to/zone', '/path/to/output')
+    """
+    try:
+        with open(zone_file, "r", encoding="utf8") as file:
+            text = file.read()
+    except UnicodeDecodeError:
+        return None
+    try:
+        origin = dns.name.from_text(zone_name)
+        zone = dns.zone.from_text(
+            text, origin=origin, relativize=False, filename=zone_file
+        )
+    except dns.exception.DNSException:
+        # the position of the first error is not reliable, check record by record
+        return _zone_bad_lines(text, zone_file, zone_name) or None
+    except ValueError:
+        return None
+
+    for rdataset in _ns_rdatasets(zone):
+        if any(_is_address_name(rdata.target, origin) for rdata in rdataset):
+            return _zone_bad_lines(text, zone_file, zone_name) or None
+    zone.to_file(output_file, sorted=True, relativize=False)
+    return []
+
+
+def compilezone(
+    zone_name: str, zone_file: str, output_file: str, input_format: str = "text"
+) -> list:
+    """
+    The function compilezone canonicalizes a DNS zone file like named_compilezone, in
+    process with dnspython when possible, and with named-compilezone otherwise.
+
+    Args:
+        zone_name (str): The name of the DNS zone being processed.
+        zone_file (str): The path to the file containing the DNS zone information.
+        output_file (str): The path where the canonicalized zone file will be written to.
+        input_format (str, optional): The format of the zone file, 'text' or 'raw'. Raw
+                                      zone files are always passed to named-compilezone.
+                                      Defaults to 'text'.
+
+    Returns:
+        list: The numbers of the lines with errors that prevented the zone from being
+            loaded, or an empty list.
+
+    Raises:
+        ValueError: If `input_format` is neither 'text' or 'raw'
+
+    Usage:
+        >>> errors = compilezone('my_zone', '/path/to/my_zone_file', '/path/to/output_file')
+        >>> if errors:
+        ...     remove_lines_from_file('/path/to/my_zone_file', errors)
+    """
+    return _compilezone(zone_name, zone_file, output_file, input_format)[0]
+
+
+def _compilezone(
+    zone_name: str, zone_file: str, output_file: str, input_format: str
+) -> Tuple[list, str]:
+    if input_format not in ["raw", "text"]:
+        raise ValueError('specify one of "text" or "raw" value')
+    if input_format == "text":
+        bad_lines = dnspython_compilezone(zone_name, zone_file, output_file)
+        if bad_lines is not None:
+            return bad_lines, "dnspython"
+        logging.debug("%s: falling back to named-compilezone", zone_name)
+    return (
+        named_compilezone(zone_name, zone_file, output_file, input_format),
+        "named-compilezone",
+    )
+
+
+def _ns_rdatasets(zone: dns.zone.Zone) -> Iterator:
+    for node in zone.values():
+        rdataset = node.get_rdataset(dns.rdataclass.IN, dns.rdatatype.NS)
+        if rdataset:
+            yield rdataset
+
+
+def _is_address_name(name: dns.name.Name, origin: dns.name.Name) -> bool:
+    # named rejects NS targets written as an address, like "@ NS 192.0.2.1", which
+    # dnspython reads as the name 192.0.2.1.<origin>
+    if not name.is_subdomain(origin) or name == origin:
+        return False
+    return dns.inet.is_address(name.relativize(origin).to_text())
+
+
+def _zone_bad_lines(text: str, zone_file: str, zone_name: str) -> list:
+    """
+    Load the records of a zone one at a time and return the lines of the bad ones.
+
+    Every record is loaded on its own, with the `$ORIGIN`, `$TTL` and owner name in
+    effect at its position, and its first line is reported if it fails to load.
+
+    Returns:
+        list: The numbers of the offending lines, or an empty list if they could not
+            be found.
+    """
+    tok = dns.tokenizer.Tokenizer(text, zone_file)
+    origin = dns.name.from_text(zone_name)
+    ttl = None
+    owner = None
+    bad_lines = []
+    try:
+        while True:
+            token = tok.get(want_leading=True)
+            if token.is_eof():
+                break
+            if token.is_eol():
+                continue
+            line = tok.where()[1]
+            inherit_owner = token.is_whitespace()
+            tokens = [] if inherit_owner else [token]
+            token = tok.get()
+            while not token.is_eol_or_eof():
+                tokens.append(token)
+                token = tok.get()
+            if token.is_eof():
+                tok.unget(token)
+            if not tokens:
+                continue
+
+            keyword = tokens[0].value.upper()
+            if keyword == "$INCLUDE":
+                return []
+            if keyword == "$GENERATE":
+                continue
+            if keyword in ("$ORIGIN", "$TTL"):
+                try:
+                    if keyword == "$ORIGIN":
+                        origin = dns.name.from_text(tokens[1].value, origin)
+                    else:
+                        ttl = dns.ttl.from_text(tokens[1].value)
+                except (dns.exception.DNSException, IndexError):
+                    bad_lines.append(line)
+                continue
+
+            if not inherit_owner:
+                try:
+                    owner = dns.name.from_text(tokens.pop(0).value, origin)
+                except dns.exception.DNSException:
+                    owner = None
+            if owner is None or not _load_record(owner, tokens, origin, ttl):
+                bad_lines.append(line)
+    except dns.exception.SyntaxError:
+        # unbalanced parentheses or quotes, the records cannot be told apart
+        return []
+    return bad_lines
+
+
+def _load_record(
+    owner: dns.name.Name, tokens: list, origin: dns.name.Name, ttl: Optional[int]
+) -> bool:
+    values = [f'"{t.value}"' if t.is_quoted_string() else t.value for t in tokens]
+    record = f"$TTL {ttl or 0}\n{owner.to_text()} {' '.join(values)}\n"
+    try:
+        zone = dns.zone.from_text(
+            record, origin=origin, relativize=False, check_origin=False
+        )
+    except (dns.exception.DNSException, ValueError):
+        return False
+    for rdataset in _ns_rdatasets(zone):
+        if any(_is_address_name(rdata.target, origin) for rdata in rdataset):
+            return False
+    return True
+
+
+MANIFEST_SAVE_INTERVAL = 5.0
+
+
+def compile_zones(
+    zone_list: Iterable[Tuple[str, str, str]],
+    workers: int = None,
+    manifest: str = None,
+    input_format: str = "text",
+    fast: bool = True,
+) -> Iterator[dict]:
+    """
+    The function compile_zones compiles many zones in a pool of worker processes, and
+    yields the result of each zone as soon as it completes.
+
+    Text zones are loaded in process with dnspython_compilezone when `fast` is True, and
+    with named_compilezone when it is False or when the zone cannot be checked in
+    process.
+
+    When a manifest file is given, the result and the SHA-256 hash of the input of every
+    zone are saved in it as the zones complete. Running compile_zones again with the same
+    manifest skips the zones whose input file is unchanged and whose output file exists,
+    yielding their saved result instead.
+
+    Args:
+        zone_list (Iterable[tuple]): The `(zone_name, zone_file, output_file)` of each zone.
+                                     It is consumed lazily, so it can be a generator.
+        workers (int, optional): The number of worker processes. Defaults to the number of
+                                 CPUs.
+        manifest (str, optional): The path of the JSON manifest of the results. Defaults to
+                                  None, no manifest.
+        input_format (str, optional): The format of the zone files, 'text' or 'raw'.
+                                      Defaults to 'text'.
+        fast (bool, optional): Load text zones in process when possible. Defaults to
+                               True.
+
+    Returns:
+        Iterator[dict]: The result of each zone, in completion order, with its `zone`,
+            `input` and `output` file, input `sha256`, the `bad_lines` of the zone, the
+            `engine` that compiled it, 'dnspython' or 'named-compilezone', and `status`:
+            'ok', 'errors' when the zone has bad lines, or 'failed' with the `error` when
+            the zone file could not be read or compiled. `skipped` is True for the results
+            taken from the manifest.
+
+    Usage:
+        >>> zones = [('example.com', 'db.example.com', 'out/db.example.com')]
+        >>> for result in compile_zones(zones, manifest='compile.json'):
+        ...     if result['bad_lines']:
+        ...         remove_lines_from_file(result['input'], result['bad_lines'])
+    """
+    if input_format not in ["raw", "text"]:
+        raise ValueError('specify one of "text" or "raw" value')
+    workers = workers or os.cpu_count() or 1
+    state = {}
+    if manifest:
+        try:
+            with open(manifest, "r", encoding="utf8") as file:
+                state = json.load(file).get("zones", {})
+        except (OSError, ValueError):
+            state = {}
+
+    max_pending = workers * 4
+    pending = set()
+    completed = 0
+    last_save = time.monotonic()
+
+    def collect(limit: int) -> Iterator[dict]:
+        nonlocal pending, completed, last_save
+        while len(pending) > limit:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                state[result["input"]] = result
+                completed += 1
+                yield result
+            if manifest and time.monotonic() - last_save > MANIFEST_SAVE_INTERVAL:
+                _save_json(manifest, {"zones": state})
+                last_save = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            for zone_name, zone_file, output_file in zone_list:
+                try:
+                    digest = _file_sha256(zone_file)
+                except OSError as err:
+                    logging.error("%s: %s", zone_name, err)
+                    result = {
+                        "zone": zone_name,
+                        "input": zone_file,
+                        "output": output_file,
+                        "sha256": None,
+                        "bad_lines": [],
+                        "status": "failed",
+                        "error": str(err),
+                    }
+                    state[zone_file] = result
+                    completed += 1
+                    yield result
+                    continue
+                previous = state.get(zone_file)
+                if (
+                    previous
+                    and previous.get("sha256") == digest
+                    and previous.get("output") == output_file
+                    and previous.get("status") != "failed"
+                    and os.path.exists(output_file)
+                ):
+                    yield {**previous, "skipped": True}
+                    continue
+                pending.add(
+                    executor.submit(
+                        _compile_zone,
+                        zone_name,
+                        zone_file,
+                        output_file,
+                        input_format,
+                        digest,
+                        fast,
+                    )
+                )
+                yield from collect(max_pending - 1)
+            yield from collect(0)
+        finally:
+            for future in pending:
+                future.cancel()
+            if manifest:
+                _save_json(manifest, {"zones": state})
+    logging.info("compiled %d zones", completed)
+
+
+def _compile_zone(
+    zone_name: str,
+    zone_file: str,
+    output_file: str,
+    input_format: str,
+    digest: str,
+    fast: bool,
+) -> dict:
+    result = {
+        "zone": zone_name,
+        "input": zone_file,
+        "output": output_file,
+        "sha256": digest,
+        "bad_lines": [],
+    }
+    try:
+        if fast:
+            result["bad_lines"], result["engine"] = _compilezone(
+                zone_name, zone_file, output_file, input_format
+            )
+        else:
+            result["engine"] = "named-compilezone"
+            result["bad_lines"] = named_compilezone(
+                zone_name, zone_file, output_file, input_format
+            )
+    except (OSError, subprocess.SubprocessError, ValueError) as err:
+        logging.error("%s: %s", zone_name, err)
+        result["status"] = "failed"
+        result["error"] = str(err)
+        return result
+    result["status"] = "errors" if result["bad_lines"] else "ok"
+    return result
+
+
+def _file_sha256(filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _save_json(filename: str, data: dict) -> None:
+    # write to a temp file and rename it, so that an interruption never leaves a
+    # partial file
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(filename)), suffix=".tmp"
+    )
+    with os.fdopen(fd, "w", encoding="utf8") as file:
+        json.dump(data, file, indent=2)
+    os.replace(tmp_path, filename)
+
+
 def remove_lines_from_file(
-    file_path: str, lines_to_remove: list, output_path: str = None
-) -> None:
+    file_path: str, lines_to_remove: Iterable[int], output_path: str = None
+) -> int:
     """
     The function remove_lines_from_file removes specific lines from a file.
 
+    The file is read one line at a time and checked against a set of the line numbers, so
+    the time taken only grows with the size of the file. Once the last line to remove is
+    passed, the rest of the file is copied in blocks. The result is written to a
+    temporary file in the same directory, which then replaces the output file, so the
+    output is never left partially written.
+
     Args:
         file_path (str): The fully qualified path to the file from which lines are to be removed.
-        lines_to_remove (list): A list of integers, with each integer being a line
-                                number (1-indexed) of the line to be removed from the file.
+        lines_to_remove (Iterable[int]): The line numbers (1-indexed) of the lines to be removed
+                                         from the file, e.g. as returned by named_compilezone.
         output_path (str, optional): Path to the output file. If provided, the function will
                                      write result to this file.
                                      If not provided, the function will overwrite the original
                                      file. Defaults to None.
 
     Returns:
-        None
+        int: The number of lines removed.
 
     Logging:
         This function logs warning messages for each line that it removes from the file.
@@ -180,20 +583,71 @@ def remove_lines_from_file(
 
     if not output_path:
         output_path = file_path
-    logging.warning("file: %s lines to remove: %s", file_path, lines_to_remove)
-    with open(file_path, "r", encoding="utf8") as fin:
-        lines = fin.readlines()
-        ptr = 1
-        with open(output_path, "w", encoding="utf8") as fout:
-            for line in lines:
-                if ptr not in lines_to_remove:
-                    fout.write(line)
-                else:
+    remove = set(lines_to_remove)
+    last = max(remove, default=0)
+    logging.warning("file: %s lines to remove: %d", file_path, len(remove))
+    logging.debug("file: %s lines to remove: %s", file_path, sorted(remove))
+
+    removed = 0
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(output_path)), suffix=".tmp"
+    )
+    try:
+        with (
+            open(file_path, "r", encoding="utf8") as fin,
+            os.fdopen(fd, "w", encoding="utf8") as fout,
+        ):
+            for ptr, line in enumerate(fin, start=1):
+                if ptr in remove:
                     logging.warning(
                         "file: %s - removing line: %s", output_path, line.strip()
                     )
-                ptr += 1
-            logging.info("file %s rewritten", output_path)
+                    removed += 1
+                else:
+                    fout.write(line)
+                if ptr >= last:
+                    shutil.copyfileobj(fin, fout, 1024 * 1024)
+                    break
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    logging.info("file %s rewritten", output_path)
+    return removed
+
+
+def remove_lines_from_files(
+    lines_by_file: Dict[str, Iterable[int]], output_dir: str = None
+) -> Dict[str, int]:
+    """
+    The function remove_lines_from_files removes specific lines from several files.
+
+    Args:
+        lines_by_file (dict): The line numbers (1-indexed) to remove, by file path.
+        output_dir (str, optional): The directory to write the results to, with the same file
+                                    names. If not provided, the files are overwritten.
+                                    Defaults to None.
+
+    Returns:
+        dict: The number of lines removed, by file path.
+
+    Usage:
+        >>> remove_lines_from_files({'db.example.com': [12, 40], 'db.example.net': [7]})
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    removed = {}
+    for file_path, lines_to_remove in lines_by_file.items():
+        output_path = (
+            os.path.join(output_dir, os.path.basename(file_path))
+            if output_dir
+            else None
+        )
+        removed[file_path] = remove_lines_from_file(
+            file_path, lines_to_remove, output_path
+        )
+    return removed
 
 
 def _parse_named_checkzone_log(error_output: str) -> list:
@@ -308,23 +762,43 @@ def extract_filename_from_url(url) -> str:
     return filename
 
 
-def ibx_csv_file_split(filename: str, output_path: str = "."):
+def ibx_csv_file_split(
+    filename: str,
+    output_path: str = ".",
+    max_rows: int = None,
+    max_open_files: int = 64,
+) -> dict:
     """
     The function ibx_csv_file_split splits a globally exported CSV file into separate CSV files
     based on the CSV object type(s).
 
+    The file is read one row at a time and every row is written as soon as it is read, so
+    files of any size can be split in constant memory. Each object type is written to
+    `<object type>.csv`, starting with its header row. The output files are kept open
+    between rows, up to `max_open_files` at a time; the least recently used file is closed
+    when the limit is reached and reopened for appending when needed.
+
     Args:
-        filename (str): The name of the source CSV file to be split.
+        filename (str): The name of the source CSV file to be split. A '.gz' or '.zst'
+            compressed file is decompressed on the fly.
         output_path (str, optional): The directory where the output CSV files will be written.
             If the directory does not exist, it will be created. Defaults to the current directory.
+        max_rows (int, optional): Split each object type further into files of at most this
+            many rows, named `<object type>_<number>.csv`. Defaults to None, one file per
+            object type.
+        max_open_files (int, optional): The maximum number of output files open at the same
+            time. Defaults to 64.
+
+    Returns:
+        dict: The number of rows written for each object type.
 
     Raises:
         Exception: An exception is raised if the output directory cannot be created.
 
     Logging:
         This function logs warning messages when a CSV object type has no associated objects in
-        the source CSV.
-        It also logs informational messages when it creates output CSV files.
+        the source CSV, and when a row of an object type without a header row is skipped.
+        It also logs informational messages for the output CSV files it creates.
 
     Usage:
         Use this function to split a `Infoblox` exported CSV file into separate CSV files for
@@ -340,66 +814,376 @@ def ibx_csv_file_split(filename: str, output_path: str = "."):
             logging.error(err)
             raise
 
-    # build the struct using the csv object type as the key
-    csv_objects = {}
-    with open(filename, "r", encoding="utf8") as handle:
-        myreader = csv.reader(handle)
-        for row in myreader:
-            if row[0].lower().startswith("header-"):
-                obj_type = row[0].lower().replace("header-", "")
-                csv_output_file = f"{obj_type}.csv"
-                csv_output_file_path = os.path.join(output_path, csv_output_file)
-                csv_objects[obj_type] = {}
-                csv_objects[obj_type]["filename"] = csv_output_file
-                csv_objects[obj_type]["filepath"] = csv_output_file_path
-                csv_objects[obj_type]["data"] = [row]
-            else:
+    headers = {}
+    counts = {}
+    parts = {}
+    skipped = 0
+    writers = _CsvWriterCache(max_open_files)
+    try:
+        with _open_csv(filename) as handle:
+            for lineno, row in enumerate(csv.reader(handle), start=1):
+                if not any(value.strip() for value in row):
+                    continue
                 obj_type = row[0].lower()
-                csv_objects[obj_type]["data"].append(row)
-
-    # output the struct
-    for obj_type, obj_data in csv_objects.items():
-        num_of_objects = len(obj_data["data"])
-        if num_of_objects == 1:
+                if obj_type.startswith("header-"):
+                    obj_type = obj_type.replace("header-", "", 1)
+                    headers[obj_type] = row
+                    counts.setdefault(obj_type, 0)
+                    # a new header row is written before the next row of its type
+                    parts.pop(obj_type, None)
+                    continue
+                if obj_type not in headers:
+                    logging.warning(
+                        "%s line %d: skipping %s row without a header row",
+                        filename,
+                        lineno,
+                        obj_type,
+                    )
+                    skipped += 1
+                    continue
+
+                count = counts[obj_type]
+                part = parts.get(obj_type)
+                if max_rows and count and count % max_rows == 0:
+                    part = None
+                if part is None:
+                    if max_rows:
+                        name = f"{obj_type}_{count // max_rows + 1:04d}.csv"
+                    else:
+                        name = f"{obj_type}.csv"
+                    part = os.path.join(output_path, name)
+                    parts[obj_type] = part
+                    writers.get(part).writerow(headers[obj_type])
+                writers.get(part).writerow(row)
+                counts[obj_type] = count + 1
+    finally:
+        writers.close()
+
+    for obj_type, count in counts.items():
+        if count:
+            logging.info("created output file(s) with %s %s objects", count, obj_type)
+        else:
             logging.warning(
-                "skipping creating output file %s, no %s objects",
-                obj_data["filename"],
+                "skipping creating output file %s.csv, no %s objects",
                 obj_type,
-            )
-        else:
-            logging.info(
-                "creating output file %s with %s %s objects",
-                obj_data["filename"],
-                num_of_objects,
                 obj_type,
             )
-            with open(obj_data["filepath"], "w", encoding="utf8") as fh_out:
-                mywriter = csv.writer(fh_out)
-                for row in obj_data["data"]:
-                    mywriter.writerow(row)
-                fh_out.close()
-
-
-def _get_include_data(chroot: str, include_file: str):
-    data = ""
-    full_path = f"{chroot}{include_file}"
-    if not os.path.exists(full_path):
-        logging.error("%s include file does not exist!", full_path)
-        return data
-    with open(full_path, "r", encoding="utf8") as file:
-        for line in file:
-            if "include " in line:
-                logging.warning("nested include file found in %s", include_file)
-                _, _inc_file, _ = line.split('"', 2)
-                content = _get_include_data(chroot, _inc_file)
-                if content:
-                    data += content
+    if skipped:
+        logging.warning("skipped %d rows without a header row", skipped)
+    return counts
+
+
+def _open_csv(filename: str) -> io.TextIOWrapper:
+    compression = compression_from_filename(filename)
+    if compression:
+        return io.TextIOWrapper(
+            open_compressed(filename, "rb", compression),
+            encoding="utf-8-sig",
+            newline="",
+        )
+    return open(filename, "r", encoding="utf-8-sig", newline="")
+
+
+class _CsvWriterCache:
+    """LRU of open CSV writers, closing the least recently used one past `max_open`."""
+
+    def __init__(self, max_open: int) -> None:
+        if max_open < 1:
+            raise ValueError("max_open_files must be a positive integer")
+        self.max_open = max_open
+        self._open = OrderedDict()
+        self._created = set()
+
+    def get(self, path: str):
+        entry = self._open.get(path)
+        if entry is not None:
+            self._open.move_to_end(path)
+            return entry[1]
+        if len(self._open) >= self.max_open:
+            _, (handle, _) = self._open.popitem(last=False)
+            handle.close()
+        mode = "a" if path in self._created else "w"
+        if mode == "w":
+            logging.info("creating output file %s", path)
+        handle = open(path, mode, encoding="utf8", newline="")
+        self._created.add(path)
+        writer = csv.writer(handle)
+        self._open[path] = (handle, writer)
+        return writer
+
+    def close(self) -> None:
+        while self._open:
+            _, (handle, _) = self._open.popitem(last=False)
+            handle.close()
+
+
+# CSV object types by import level: objects of a level only depend on objects of the
+# levels before it, e.g. networks on network views and containers.
+CSV_IMPORT_ORDER = (
+    (
+        "networkview",
+        "view",
+        "nsgroup",
+        "delegationnsgroup",
+        "forwardingmembernsgroup",
+        "stubmembernsgroup",
+        "forwardstubservernsgroup",
+        "optionspace",
+        "ipv6optionspace",
+        "dhcpfingerprint",
+        "dhcpmacfilter",
+        "dhcpfailoverassociation",
+        "griddhcp",
+        "memberdhcp",
+        "memberdns",
+    ),
+    (
+        "networkcontainer",
+        "ipv6networkcontainer",
+        "optiondefinition",
+        "ipv6optiondefinition",
+        "optionfilter",
+        "relayagentfilter",
+        "dhcpfingerprintfilter",
+        "macfilteraddress",
+    ),
+    ("network", "ipv6network", "optionfiltermatchrule", "authzone"),
+    (
+        "sharednetwork",
+        "ipv6sharednetwork",
+        "dhcprange",
+        "ipv6dhcprange",
+        "forwardzone",
+        "stubzone",
+        "delegatedzone",
+    ),
+    ("fixedaddress", "ipv6fixedaddress", "hostrecord"),
+    (
+        "hostaddress",
+        "ipv6hostaddress",
+        "arecord",
+        "aaaarecord",
+        "aliasrecord",
+        "caarecord",
+        "cnamerecord",
+        "dnamerecord",
+        "mxrecord",
+        "naptrrecord",
+        "nsrecord",
+        "ptrrecord",
+        "srvrecord",
+        "tlsarecord",
+        "txtrecord",
+    ),
+)
+
+
+def csv_import_level(obj_type: str) -> int:
+    """
+    The function csv_import_level returns the import level of a CSV object type.
+
+    Args:
+        obj_type (str): The CSV object type, e.g. `network` for `header-network` rows.
+
+    Returns:
+        int: The index of the object type in CSV_IMPORT_ORDER. Unknown object types are
+             imported last.
+    """
+    obj_type = obj_type.lower()
+    for level, obj_types in enumerate(CSV_IMPORT_ORDER):
+        if obj_type in obj_types:
+            return level
+    return len(CSV_IMPORT_ORDER)
+
+
+def ibx_csv_file_shard(filename: str, output_path: str = ".", max_rows: int = 100000):
+    """
+    The function ibx_csv_file_shard splits a CSV import file into shards of one CSV object
+    type and at most `max_rows` rows, in import order.
+
+    The file is split with `ibx_csv_file_split`, so files of any size can be split in
+    constant memory. Each shard starts with the header row of its object type and is named
+    `<object type>_<number>.csv`.
+
+    Args:
+        filename (str): The name of the CSV file to be split. A '.gz' or '.zst' compressed
+                        file is decompressed on the fly.
+        output_path (str, optional): The directory where the shards will be written. It is
+                                     created if it does not exist. Defaults to the current
+                                     directory.
+        max_rows (int, optional): The maximum number of data rows of a shard. Defaults to
+                                  100000.
+
+    Returns:
+        list: A dict for each shard, with its `file` name, `object` type, import `level`
+              and number of `rows`, sorted by import level (see `csv_import_level`) and
+              then by position in the source file.
+
+    Raises:
+        ValueError: If max_rows is not a positive integer.
+
+    Usage:
+        >>> for shard in ibx_csv_file_shard('/path/to/import.csv', '/path/to/shards', 50000):
+        ...     print(shard['file'], shard['rows'])
+    """
+    if max_rows < 1:
+        raise ValueError("max_rows must be a positive integer")
+    counts = ibx_csv_file_split(filename, output_path, max_rows=max_rows)
+
+    shards = []
+    for obj_type, count in counts.items():
+        for part, first_row in enumerate(range(0, count, max_rows), start=1):
+            shards.append(
+                {
+                    "file": f"{obj_type}_{part:04d}.csv",
+                    "object": obj_type,
+                    "level": csv_import_level(obj_type),
+                    "rows": min(max_rows, count - first_row),
+                }
+            )
+    # counts is in order of appearance in the file, which the stable sort keeps
+    shards.sort(key=lambda item: item["level"])
+    logging.info("split %s into %d shards in %s", filename, len(shards), output_path)
+    return shards
+
+
+INCLUDE_CACHE_SIZE = 64 * 1024 * 1024
+INCLUDE_CACHE_MAX_SIZE = 4 * 1024 * 1024
+
+_INCLUDE_RE = re.compile(r'[ \t]*include[ \t]+"([^"]+)"[^\n]*(?:\n|$)')
+
+
+def iter_from_includes(chroot: str, filepath: str) -> Iterator[str]:
+    """
+    The function iter_from_includes yields the contents of a configuration file, with the
+    include directives replaced by the contents of the included files.
+
+    Includes are expanded recursively, at any indentation, and the contents are yielded in
+    chunks as they are read, so that large configurations are never held in memory as a
+    whole. The files of up to INCLUDE_CACHE_MAX_SIZE bytes are parsed once and kept in
+    memory, up to INCLUDE_CACHE_SIZE bytes in total, for the files included several times.
+    A file is parsed again when its modification time or size changes. An include of a
+    file that is already being expanded, directly or not, is skipped with an error.
+
+    Args:
+        chroot (str): The path to the chroot environment where the config file to process exists.
+        filepath (str): Path to the initial config file to process, relative to chroot. The
+                        included files are also looked up in chroot.
+
+    Returns:
+        Iterator[str]: The chunks of the full contents of the config file. Nothing is yielded
+            if the file does not exist.
+
+    Usage:
+        >>> with open('named.conf.full', 'w') as f:
+        ...     f.writelines(iter_from_includes('/path/to/chroot', '/etc/named.conf'))
+    """
+    path = os.path.join(chroot, filepath.lstrip("/"))
+    logging.info("processing file %s", path)
+    if not os.path.exists(path):
+        logging.error("file %s does not exist!", path)
+        return
+    yield from _expand_includes(chroot, path, [])
+
+
+def _expand_includes(chroot: str, path: str, stack: list) -> Iterator[str]:
+    stack.append(os.path.realpath(path))
+    try:
+        for segment in _include_segments(path):
+            if isinstance(segment, str):
+                yield segment
+                continue
+            include_file = segment[0]
+            logging.info("processing include file %s", include_file)
+            full_path = os.path.join(chroot, include_file.lstrip("/"))
+            if not os.path.exists(full_path):
+                logging.error("%s include file does not exist!", full_path)
+            elif os.path.realpath(full_path) in stack:
+                logging.error("include cycle, %s includes %s", path, include_file)
             else:
-                data += line
-        return data
+                yield from _expand_includes(chroot, full_path, stack)
+    finally:
+        stack.pop()
+
+
+def _include_segments(path: str) -> Iterable:
+    # the segments of a file are its text chunks and the (include_file,) of its include
+    # directives, in order
+    stat = os.stat(path)
+    if stat.st_size > INCLUDE_CACHE_MAX_SIZE:
+        return _stream_include_segments(path)
+    return _include_cache.get(path, stat.st_mtime_ns, stat.st_size)
+
+
+class _IncludeCache:
+    """LRU of parsed include files, evicting the least recently used past `max_size`."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self._files = OrderedDict()
+
+    def get(self, path: str, mtime_ns: int, size: int) -> tuple:
+        entry = self._files.get(path)
+        if entry is not None and entry[:2] == (mtime_ns, size):
+            self._files.move_to_end(path)
+            return entry[2]
+        if entry is not None:
+            self._evict(path)
+        segments = _read_include_segments(path)
+        self._files[path] = (mtime_ns, size, segments)
+        self.size += size
+        while self.size > self.max_size and len(self._files) > 1:
+            self._evict(next(iter(self._files)))
+        return segments
+
+    def clear(self) -> None:
+        self._files.clear()
+        self.size = 0
+
+    def _evict(self, path: str) -> None:
+        self.size -= self._files.pop(path)[1]
+
+
+_include_cache = _IncludeCache(INCLUDE_CACHE_SIZE)
+
+
+def _read_include_segments(path: str) -> tuple:
+    with open(path, "r", encoding="utf8") as file:
+        return tuple(_split_includes(file.read()))
+
+
+def _stream_include_segments(path: str) -> Iterator:
+    with open(path, "r", encoding="utf8") as file:
+        while True:
+            lines = file.readlines(1024 * 1024)
+            if not lines:
+                break
+            yield from _split_includes("".join(lines))
+
+
+def _split_includes(content: str) -> Iterator:
+    # only the lines with "include" in them are matched against the directive
+    pos = 0
+    found = content.find("include")
+    while found >= 0:
+        line_start = content.rfind("\n", 0, found) + 1
+        match = _INCLUDE_RE.match(content, line_start)
+        if match:
+            if line_start > pos:
+                yield content[pos:line_start]
+            yield (match.group(1),)
+            pos = next_line = match.end()
+        else:
+            next_line = content.find("\n", found) + 1
+            if not next_line:
+                break
+        found = content.find("include", next_line)
+    if pos < len(content):
+        yield content[pos:]
 
 
-def generate_from_includes(chroot: str, filepath: str) -> str:
+def generate_from_includes(chroot: str, filepath: str, output_file: str = None) -> str:
     """
     The function generate_from_includes generates a configuration file from include(s) directives
     found in another configuration file.
@@ -409,42 +1193,30 @@ def generate_from_includes(chroot: str, filepath: str) -> str:
         filepath (str): Path to the initial config file to process. The path is relative to
                         chroot if
                             it starts with '/'.
+        output_file (str, optional): The path of the file to write the full contents to,
+                                     instead of returning them. Defaults to None.
 
     Returns:
         str: A single string containing the full contents of the config file. This includes data
         from
             the initial config file and all files included with include directives. If the file
             specified
-            in the filepath parameter does not exist, an empty string is returned.
+            in the filepath parameter does not exist, an empty string is returned. When
+            output_file is given, the contents are streamed to it and its path is returned.
 
     Logging:
         This function logs informational messages indicating the files it's processing and any
         'include'
         directives it encounters. An error message is logged if it attempts to process a file
-        that doesn't exist.
+        that doesn't exist, or an include cycle.
 
     Usage:
         Use this function to generate a full config file from one that includes other files with
         include directives:
         >>> full_config = generate_from_includes('/path/to/chroot', '/path/to/my_config')
     """
-
-    if filepath.startswith("/"):
-        filepath = filepath.lstrip("/")
-    logging.info("processing file %s", f"{chroot}{filepath}")
-    data = ""
-    if os.path.exists(os.path.join(chroot, filepath)):
-        with open(os.path.join(chroot, filepath), "r", encoding="utf8") as file:
-            for line in file:
-                if line.startswith("include "):
-                    logging.debug(line.strip())
-                    _, include_file, _ = line.split('"', 2)
-                    logging.info("processing include file %s", include_file)
-                    contents = _get_include_data(chroot, include_file)
-                    if contents:
-                        data += contents
-                else:
-                    data += line
-    else:
-        logging.error("file %s does not exist!", os.path.join(chroot, filepath))
-    return data
+    if output_file is None:
+        return "".join(iter_from_includes(chroot, filepath))
+    with open(output_file, "w", encoding="utf8") as file:
+        file.writelines(iter_from_includes(chroot, filepath))
+    return output_file
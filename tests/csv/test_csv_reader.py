@@ -0,0 +1,114 @@
+# File: tests/csv/test_csv_reader.py
+
+import io
+from ipaddress import IPv4Address
+
+import pytest
+from pydantic import ValidationError
+
+from ibx_sdk.nios.csv.dhcp import IPv4Network
+from ibx_sdk.nios.csv.dns import AuthZone
+from ibx_sdk.nios.csv.dns_records import ARecord, HostRecord
+from ibx_sdk.nios.csv.reader import (
+    count_rows,
+    model_for_header,
+    read_csv,
+    row_to_model,
+)
+
+EXPORT = (
+    "﻿header-network,address*,netmask*,comment,enable_ddns,"
+    "threshold_email_addresses,EA-Site\r\n"
+    'network,10.0.0.0,255.255.255.0,"core, lab",TRUE,"a@example.com,b@example.com",HQ\r\n'
+    "network,10.1.0.0,255.255.0.0,,,,\r\n"
+    "\r\n"
+    "header-arecord,fqdn*,address*,_new_fqdn,ttl\r\n"
+    "arecord,a.example.com,10.0.0.1,b.example.com,300\r\n"
+    "header-unknownobject,name\r\n"
+    "unknownobject,skipped\r\n"
+    "header-authzone,fqdn*,zone_format*,view\r\n"
+    "authzone,example.com,FORWARD,default\r\n"
+)
+
+
+def test_model_for_header():
+    assert model_for_header("header-network") is IPv4Network
+    assert model_for_header("HEADER-AUTHZONE") is AuthZone
+    assert model_for_header("header-hostrecord") is HostRecord
+    assert model_for_header("header-unknownobject") is None
+
+
+def test_read_csv_sections():
+    models = list(read_csv(io.StringIO(EXPORT, newline="")))
+
+    assert [type(model) for model in models] == [
+        IPv4Network,
+        IPv4Network,
+        ARecord,
+        AuthZone,
+    ]
+    network = models[0]
+    assert network.address == IPv4Address("10.0.0.0")
+    assert network.comment == "core, lab"
+    assert network.enable_ddns is True
+    assert network.threshold_email_addresses == ["a@example.com", "b@example.com"]
+    assert network.model_extra == {"EA-Site": "HQ"}
+    assert models[1].comment is None
+    assert models[2].new_fqdn == "b.example.com"
+    assert models[2].ttl == 300
+    assert models[3].fqdn == "example.com"
+
+
+def test_read_csv_round_trip():
+    network = row_to_model(
+        IPv4Network,
+        {
+            "header-network": "network",
+            "address*": "10.2.0.0",
+            "netmask*": "255.255.255.0",
+        },
+    )
+
+    assert network.model_dump(by_alias=True, exclude_none=True) == {
+        "header-network": "network",
+        "address": IPv4Address("10.2.0.0"),
+        "netmask": IPv4Address("255.255.255.0"),
+    }
+
+
+def test_read_csv_is_lazy():
+    def lines():
+        yield "header-network,address*,netmask*\r\n"
+        yield "network,10.0.0.0,255.255.255.0\r\n"
+        raise AssertionError("read past the first row")
+
+    assert next(read_csv(lines())).address == IPv4Address("10.0.0.0")
+
+
+def test_read_csv_invalid_row():
+    data = "header-network,address*,netmask*\r\nnetwork,not-an-address,255.0.0.0\r\n"
+
+    with pytest.raises(ValidationError):
+        list(read_csv(io.StringIO(data, newline="")))
+
+
+def test_read_csv_empty_value():
+    data = (
+        "header-network,address*,netmask*,zone_associations,vlans\r\n"
+        "network,100.64.40.0,255.255.255.0,<empty>,<empty>\r\n"
+        "   \r\n"
+    )
+
+    (network,) = read_csv(io.StringIO(data, newline=""))
+
+    assert network.zone_associations == []
+    assert network.model_extra == {}
+
+
+def test_count_rows():
+    data = (
+        EXPORT
+        + 'header-txtrecord,fqdn*,text*\r\ntxtrecord,t.example.com,"two\nlines"\r\n'
+    )
+
+    assert count_rows(io.StringIO(data, newline="")) == 6
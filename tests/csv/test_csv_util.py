@@ -0,0 +1,96 @@
+# File: tests/csv/test_csv_util.py
+
+import csv
+
+from ibx_sdk.nios.csv import util as csv_util
+from ibx_sdk.nios.csv.dns_records import ARecord, HostRecord
+from ibx_sdk.nios.csv.util import dump_row, get_header, output_to_file
+
+
+def make_hosts(count):
+    hosts = []
+    for i in range(count):
+        host = HostRecord(
+            fqdn=f"host{i}.example.com",
+            addresses=f"10.0.{i // 256 % 256}.{i % 256}",
+            view="default",
+            comment="imported" if i % 3 else None,
+            ttl=300 if i % 5 == 0 else None,
+            configure_for_dns=True,
+        )
+        if i % 7 == 0:
+            host.add_property("EA-Site", "HQ")
+        hosts.append(host)
+    return hosts
+
+
+def reference_output(filename, data):
+    # the header of every item, then every item dumped again to write it
+    def dump(item):
+        return item.model_dump(by_alias=True, exclude_defaults=False, exclude_none=True)
+
+    header = []
+    for item in data:
+        for col in dump(item):
+            if col not in header:
+                header.append(col)
+    with open(filename, "w") as f:
+        writer = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
+        writer.writeheader()
+        for item in data:
+            writer.writerow(dump(item))
+
+
+def test_get_header():
+    records = [
+        ARecord(fqdn="a.example.com", address="10.0.0.1"),
+        ARecord(fqdn="b.example.com", address="10.0.0.2", ttl=300, comment="b"),
+        ARecord(fqdn="c.example.com", address="10.0.0.3", comment="c"),
+    ]
+    rows = []
+
+    header = get_header(data=records, rows=rows)
+
+    assert header == ["header-arecord", "fqdn", "address", "comment", "ttl"]
+    assert rows[1] == {
+        "header-arecord": "arecord",
+        "fqdn": "b.example.com",
+        "address": records[1].address,
+        "comment": "b",
+        "ttl": 300,
+    }
+    assert get_header(data=records) == header
+
+
+def test_output_to_file_import_action(tmp_path):
+    records = [ARecord(fqdn="a.example.com", address="10.0.0.1")]
+
+    output_to_file(
+        filename="arecord", data=records, import_action="IO", output_dir=str(tmp_path)
+    )
+
+    with open(tmp_path / "arecord.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["header-arecord", "import-action", "fqdn", "address"]
+    assert rows[1][0] == "arecord"
+    assert rows[1][2:] == ["a.example.com", "10.0.0.1"]
+    assert records[0].import_action == "IO"
+
+
+def test_output_to_file_dumps_once(tmp_path, monkeypatch):
+    hosts = make_hosts(50)
+    dumped = []
+
+    def counting_dump_row(item):
+        dumped.append(item)
+        return dump_row(item)
+
+    monkeypatch.setattr(csv_util, "dump_row", counting_dump_row)
+    output_to_file(filename="hostrecord", data=hosts, output_dir=str(tmp_path))
+
+    assert len(dumped) == len(hosts)
+    assert {id(item) for item in dumped} == {id(item) for item in hosts}
+    reference_output(tmp_path / "reference.csv", hosts)
+    assert (tmp_path / "hostrecord.csv").read_text() == (
+        tmp_path / "reference.csv"
+    ).read_text()
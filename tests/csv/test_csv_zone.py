@@ -0,0 +1,118 @@
+# File: tests/csv/test_csv_zone.py
+
+import csv
+from collections import Counter
+
+import pytest
+
+from ibx_sdk.nios.csv.dns_records import ARecord, HostRecord
+from ibx_sdk.nios.csv.reader import read_csv
+from ibx_sdk.nios.csv.zone import iter_zone_records, zone_to_csv, zones_to_csv
+
+ZONE = """example.com. 3600 IN SOA ns1.example.com. hostmaster.example.com. 1 3600 600 86400 300
+example.com. 3600 IN NS ns1.example.com.
+example.com. 3600 IN MX 10 mail.example.com.
+example.com. 3600 IN TXT "v=spf1 -all"
+_sip._tcp.example.com. 300 IN SRV 10 5 5060 sip.example.com.
+a.example.com. 3600 IN A 10.0.0.1
+a.example.com. 3600 IN A 10.0.0.2
+a.example.com. 3600 IN AAAA 2001:db8::1
+caa.example.com. 3600 IN CAA 0 issue "letsencrypt.org"
+multi.example.com. 3600 IN TXT "a" "b c"
+www.example.com. 0 IN CNAME a.example.com.
+x.example.com. 3600 IN HINFO "a" "b"
+bad.example.com. 3600 IN A nope
+"""
+
+
+@pytest.fixture
+def zone_file(tmp_path):
+    path = tmp_path / "db.example.com"
+    path.write_text(ZONE)
+    return str(path)
+
+
+def read_rows(path):
+    with open(path, newline="") as file:
+        return list(csv.DictReader(file))
+
+
+def test_iter_zone_records(zone_file):
+    stats = Counter()
+    records = list(
+        iter_zone_records("example.com", zone_file, view="internal", stats=stats)
+    )
+    by_type = {}
+    for record in records:
+        by_type.setdefault(type(record).__name__, []).append(record)
+
+    assert [str(r.address) for r in by_type["ARecord"]] == ["10.0.0.1", "10.0.0.2"]
+    assert by_type["ARecord"][0].view == "internal"
+    assert by_type["MXRecord"][0].mx == "mail.example.com"
+    assert by_type["MXRecord"][0].priority == 10
+    assert by_type["SRVRecord"][0].target == "sip.example.com"
+    assert by_type["CNAMERecord"][0].canonical_name == "a.example.com"
+    assert by_type["CNAMERecord"][0].ttl is None
+    assert [r.text for r in by_type["TXTRecord"]] == ["v=spf1 -all", '"a" "b c"']
+    assert "CAARecord" not in by_type
+    assert stats["invalid"] == 2
+    assert stats["skipped"] == 3
+    assert stats["arecord"] == 2
+
+
+def test_iter_zone_records_hosts(zone_file):
+    records = list(iter_zone_records("example.com", zone_file, host_records=True))
+
+    hosts = [r for r in records if isinstance(r, HostRecord)]
+    assert len(hosts) == 1
+    assert str(hosts[0].addresses) == "10.0.0.1"
+    assert str(hosts[0].ipv6_addresses) == "2001:db8::1"
+    assert hosts[0].configure_for_dns is True
+    assert [str(r.address) for r in records if isinstance(r, ARecord)] == ["10.0.0.2"]
+
+
+def test_zone_to_csv(zone_file, tmp_path):
+    output_dir = tmp_path / "csv"
+
+    counts = zone_to_csv("example.com", zone_file, str(output_dir), batch_size=1)
+
+    assert counts == {
+        "mxrecord": 1,
+        "txtrecord": 2,
+        "srvrecord": 1,
+        "arecord": 2,
+        "aaaarecord": 1,
+        "cnamerecord": 1,
+        "skipped": 3,
+        "invalid": 2,
+    }
+    assert sorted(p.name for p in output_dir.glob("example.com-arecord_*")) == [
+        "example.com-arecord_0001.csv",
+        "example.com-arecord_0002.csv",
+    ]
+    assert read_rows(output_dir / "example.com-mxrecord_0001.csv") == [
+        {
+            "header-mxrecord": "mxrecord",
+            "fqdn": "example.com",
+            "mx": "mail.example.com",
+            "priority": "10",
+            "ttl": "3600",
+        }
+    ]
+    with open(output_dir / "example.com-txtrecord_0002.csv", newline="") as file:
+        assert [r.text for r in read_csv(file)] == ['"a" "b c"']
+
+
+def test_zones_to_csv(zone_file, tmp_path):
+    zones = [("example.com", zone_file), ("missing.com", str(tmp_path / "missing"))]
+
+    results = {
+        r["zone"]: r
+        for r in zones_to_csv(zones, str(tmp_path / "csv"), workers=2, keep_ttl=False)
+    }
+
+    assert results["example.com"]["status"] == "ok"
+    assert results["example.com"]["counts"]["arecord"] == 2
+    assert results["missing.com"]["status"] == "failed"
+    rows = read_rows(tmp_path / "csv" / "example.com-arecord_0001.csv")
+    assert "ttl" not in rows[0]
@@ -0,0 +1,202 @@
+# File: tests/util/test_compile_zones.py
+
+import json
+import os
+import stat
+
+import pytest
+
+from ibx_sdk.util.util import (
+    compile_zones,
+    compilezone,
+    dnspython_compilezone,
+    named_compilezone,
+)
+
+# stand-in for named-compilezone: copies the zone to the -o file and reports the lines
+# containing BAD the way named-compilezone does
+FAKE_COMPILEZONE = """#!/bin/sh
+while [ $# -gt 2 ]; do
+    if [ "$1" = "-o" ]; then out="$2"; fi
+    shift
+done
+zone="$1"; file="$2"
+echo "$file" >> "$(dirname "$0")/calls"
+bad=$(grep -n BAD "$file" | cut -d: -f1)
+if [ -n "$bad" ]; then
+    for n in $bad; do
+        echo "dns_master_load: $file:$n: unknown RR type 'BAD'"
+    done
+    echo "zone $zone/IN: not loaded due to errors."
+    exit 1
+fi
+cp "$file" "$out"
+echo "zone $zone/IN: loaded serial 1"
+echo "OK"
+"""
+
+
+@pytest.fixture
+def fake_compilezone(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "named-compilezone"
+    script.write_text(FAKE_COMPILEZONE)
+    os.chmod(script, stat.S_IRWXU)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return bin_dir / "calls"
+
+
+def make_zones(tmp_path, count, bad=()):
+    zones = []
+    (tmp_path / "out").mkdir(exist_ok=True)
+    for i in range(count):
+        zone_file = tmp_path / f"db.zone{i}.com"
+        lines = ["@ IN SOA ns1 hostmaster 1 3600 600 86400 300", "@ IN NS ns1"]
+        if i in bad:
+            lines += ["www IN BAD 10.0.0.1", "ftp IN A 10.0.0.2", "mail IN BAD x"]
+        zone_file.write_text("\n".join(lines) + "\n")
+        zones.append((f"zone{i}.com", str(zone_file), str(tmp_path / "out" / f"db{i}")))
+    return zones
+
+
+def test_compile_zones(tmp_path, fake_compilezone):
+    zones = make_zones(tmp_path, 6, bad={2})
+    manifest = str(tmp_path / "compile.json")
+
+    results = {r["zone"]: r for r in compile_zones(zones, workers=2, manifest=manifest)}
+
+    assert len(results) == 6
+    assert results["zone2.com"]["status"] == "errors"
+    assert results["zone2.com"]["bad_lines"] == [3, 5]
+    assert results["zone0.com"]["status"] == "ok"
+    assert results["zone0.com"]["bad_lines"] == []
+    assert results["zone0.com"]["engine"] == "dnspython"
+    assert os.path.exists(results["zone0.com"]["output"])
+    saved = json.load(open(manifest))["zones"]
+    assert len(saved) == 6
+    assert saved[zones[2][1]]["bad_lines"] == [3, 5]
+
+
+def test_compile_zones_resume(tmp_path, fake_compilezone):
+    zones = make_zones(tmp_path, 4)
+    manifest = str(tmp_path / "compile.json")
+    list(compile_zones(zones, workers=2, manifest=manifest, fast=False))
+    assert len(fake_compilezone.read_text().splitlines()) == 4
+    fake_compilezone.unlink()
+
+    with open(zones[1][1], "a") as file:
+        file.write("new IN A 10.0.0.3\n")
+    os.unlink(zones[3][2])
+    results = {
+        r["zone"]: r for r in compile_zones(zones, manifest=manifest, fast=False)
+    }
+
+    assert sorted(fake_compilezone.read_text().splitlines()) == [
+        zones[1][1],
+        zones[3][1],
+    ]
+    assert results["zone0.com"]["skipped"] is True
+    assert "skipped" not in results["zone1.com"]
+
+
+def test_compile_zones_failed(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    zones = make_zones(tmp_path, 1)
+
+    results = list(compile_zones(zones, workers=1, fast=False))
+
+    assert results[0]["status"] == "failed"
+    assert results[0]["error"]
+
+
+def test_compile_zones_missing_input(tmp_path, fake_compilezone):
+    zones = make_zones(tmp_path, 2)
+    zones.insert(0, ("missing.com", str(tmp_path / "db.missing.com"), "out"))
+    manifest = str(tmp_path / "compile.json")
+
+    results = {r["zone"]: r for r in compile_zones(zones, workers=1, manifest=manifest)}
+
+    assert results["missing.com"]["status"] == "failed"
+    assert results["missing.com"]["error"]
+    assert results["zone0.com"]["status"] == "ok"
+    assert results["zone1.com"]["status"] == "ok"
+    saved = json.load(open(manifest))["zones"]
+    assert saved[zones[0][1]]["status"] == "failed"
+
+
+def test_compile_zones_input_format():
+    with pytest.raises(ValueError):
+        list(compile_zones([], input_format="json"))
+
+
+ZONE = """$TTL 3600
+@ IN SOA ns1 hostmaster ( 1 3600
+    600 86400 300 )
+@ IN NS ns1
+  IN NS 10.1.1.1
+ns1 IN A 10.0.0.1
+www IN A notanip
+ftp IN A
+mail IN BAD x
+txt IN TXT ( "a\\"q"
+    "b" ) ; comment
+mx IN MX 10 mail
+$ORIGIN sub
+a 300 IN A 10.0.0.9
+  IN AAAA zz
+"""
+
+
+def test_dnspython_compilezone(tmp_path):
+    zone_file = tmp_path / "db.example.com"
+    zone_file.write_text(ZONE)
+    output_file = tmp_path / "out"
+
+    bad_lines = dnspython_compilezone("example.com", str(zone_file), str(output_file))
+
+    assert bad_lines == [5, 7, 8, 9, 15]
+    assert not output_file.exists()
+
+    lines = ZONE.splitlines()
+    for n in reversed(bad_lines):
+        del lines[n - 1]
+    zone_file.write_text("\n".join(lines) + "\n")
+
+    assert dnspython_compilezone("example.com", str(zone_file), str(output_file)) == []
+    assert output_file.read_text().splitlines() == [
+        "example.com. 3600 IN SOA ns1.example.com. hostmaster.example.com. "
+        "1 3600 600 86400 300",
+        "example.com. 3600 IN NS ns1.example.com.",
+        "mx.example.com. 3600 IN MX 10 mail.example.com.",
+        "ns1.example.com. 3600 IN A 10.0.0.1",
+        "a.sub.example.com. 300 IN A 10.0.0.9",
+        'txt.example.com. 3600 IN TXT "a\\"q" "b"',
+    ]
+
+
+def test_compilezone_fallback(tmp_path, fake_compilezone):
+    zone_file = tmp_path / "db.example.com"
+    output_file = tmp_path / "out"
+
+    zone_file.write_text("$INCLUDE db.records\nwww IN BAD x\n")
+    assert (
+        dnspython_compilezone("example.com", str(zone_file), str(output_file)) is None
+    )
+    assert compilezone("example.com", str(zone_file), str(output_file)) == [2]
+    assert fake_compilezone.read_text().splitlines() == [str(zone_file)]
+
+    zone_file.write_text("www IN A 10.0.0.1\n")
+    assert (
+        dnspython_compilezone("example.com", str(zone_file), str(output_file)) is None
+    )
+
+
+def test_compilezone_engines(tmp_path, fake_compilezone):
+    zones = make_zones(tmp_path, 3)
+
+    for zone_name, zone_file, output_file in zones:
+        assert named_compilezone(zone_name, zone_file, output_file) == []
+        assert dnspython_compilezone(zone_name, zone_file, output_file) == []
+        assert os.path.exists(output_file)
+    assert len(fake_compilezone.read_text().splitlines()) == 3
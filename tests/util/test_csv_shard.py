@@ -0,0 +1,81 @@
+# File: tests/util/test_csv_shard.py
+
+import csv
+import gzip
+
+import pytest
+
+from ibx_sdk.util.util import csv_import_level, ibx_csv_file_shard
+
+DATA = (
+    "header-hostrecord,fqdn*,addresses\r\n"
+    "hostrecord,h1.example.com,10.0.0.1\r\n"
+    "hostrecord,h2.example.com,10.0.0.2\r\n"
+    "hostrecord,h3.example.com,10.0.0.3\r\n"
+    "header-network,address*,netmask*,comment\r\n"
+    'network,10.0.0.0,255.255.255.0,"a, ""quoted""\nnote"\r\n'
+    "\r\n"
+    "header-networkview,name*\r\n"
+    "networkview,default\r\n"
+    "header-network,address*,netmask*\r\n"
+    "network,10.1.0.0,255.255.255.0\r\n"
+)
+
+
+def _rows(path):
+    with open(path, newline="", encoding="utf8") as f:
+        return list(csv.reader(f))
+
+
+def test_csv_import_level():
+    assert csv_import_level("networkview") < csv_import_level("networkcontainer")
+    assert csv_import_level("networkcontainer") < csv_import_level("network")
+    assert csv_import_level("network") < csv_import_level("dhcprange")
+    assert csv_import_level("dhcprange") < csv_import_level("hostrecord")
+    assert csv_import_level("unknownobject") > csv_import_level("txtrecord")
+
+
+def test_shard_order_and_size(tmp_path):
+    source = tmp_path / "import.csv"
+    source.write_text(DATA, encoding="utf8", newline="")
+
+    shards = ibx_csv_file_shard(str(source), str(tmp_path / "shards"), max_rows=2)
+
+    assert [(s["file"], s["rows"]) for s in shards] == [
+        ("networkview_0001.csv", 1),
+        ("network_0001.csv", 2),
+        ("hostrecord_0001.csv", 2),
+        ("hostrecord_0002.csv", 1),
+    ]
+    assert _rows(tmp_path / "shards" / "hostrecord_0002.csv") == [
+        ["header-hostrecord", "fqdn*", "addresses"],
+        ["hostrecord", "h3.example.com", "10.0.0.3"],
+    ]
+    network = _rows(tmp_path / "shards" / "network_0001.csv")
+    assert network[1][3] == 'a, "quoted"\nnote'
+    assert network[2:] == [
+        ["header-network", "address*", "netmask*"],
+        ["network", "10.1.0.0", "255.255.255.0"],
+    ]
+
+
+def test_shard_compressed(tmp_path):
+    source = tmp_path / "import.csv.gz"
+    with gzip.open(source, "wt", encoding="utf8", newline="") as f:
+        f.write(DATA)
+
+    shards = ibx_csv_file_shard(str(source), str(tmp_path), max_rows=100)
+
+    assert sum(s["rows"] for s in shards) == 6
+
+
+def test_shard_row_before_header(tmp_path):
+    source = tmp_path / "import.csv"
+    source.write_text("network,10.0.0.0,255.255.255.0\r\n", encoding="utf8")
+
+    assert ibx_csv_file_shard(str(source), str(tmp_path / "shards")) == []
+
+
+def test_shard_max_rows(tmp_path):
+    with pytest.raises(ValueError):
+        ibx_csv_file_shard(str(tmp_path / "import.csv"), str(tmp_path), max_rows=0)
@@ -0,0 +1,84 @@
+# File: tests/util/test_csv_split.py
+
+import csv
+
+from ibx_sdk.util.util import ibx_csv_file_split
+
+DATA = (
+    "\ufeffheader-network,address*,netmask*\r\n"
+    "network,10.0.0.0,255.255.255.0\r\n"
+    "header-arecord,fqdn*,address*\r\n"
+    "arecord,a1.example.com,10.0.0.1\r\n"
+    "network,10.0.1.0,255.255.255.0\r\n"
+    "arecord,a2.example.com,10.0.0.2\r\n"
+    "arecord,a3.example.com,10.0.0.3\r\n"
+    "header-authzone,fqdn*,zone_format*\r\n"
+    "header-network,address*,netmask*,comment\r\n"
+    'network,10.0.2.0,255.255.255.0,"multi\nline"\r\n'
+)
+
+
+def _rows(path):
+    with open(path, newline="", encoding="utf8") as f:
+        return list(csv.reader(f))
+
+
+def test_split(tmp_path):
+    source = tmp_path / "export.csv"
+    source.write_text(DATA, encoding="utf8", newline="")
+
+    counts = ibx_csv_file_split(str(source), str(tmp_path / "out"))
+
+    assert counts == {"network": 3, "arecord": 3, "authzone": 0}
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [
+        "arecord.csv",
+        "network.csv",
+    ]
+    assert _rows(tmp_path / "out" / "network.csv") == [
+        ["header-network", "address*", "netmask*"],
+        ["network", "10.0.0.0", "255.255.255.0"],
+        ["network", "10.0.1.0", "255.255.255.0"],
+        ["header-network", "address*", "netmask*", "comment"],
+        ["network", "10.0.2.0", "255.255.255.0", "multi\nline"],
+    ]
+
+
+def test_split_max_rows_and_open_files(tmp_path):
+    source = tmp_path / "export.csv"
+    source.write_text(DATA, encoding="utf8", newline="")
+
+    counts = ibx_csv_file_split(
+        str(source), str(tmp_path), max_rows=2, max_open_files=1
+    )
+
+    assert counts["arecord"] == 3
+    assert _rows(tmp_path / "arecord_0001.csv") == [
+        ["header-arecord", "fqdn*", "address*"],
+        ["arecord", "a1.example.com", "10.0.0.1"],
+        ["arecord", "a2.example.com", "10.0.0.2"],
+    ]
+    assert _rows(tmp_path / "arecord_0002.csv") == [
+        ["header-arecord", "fqdn*", "address*"],
+        ["arecord", "a3.example.com", "10.0.0.3"],
+    ]
+    assert _rows(tmp_path / "network_0002.csv")[0] == [
+        "header-network",
+        "address*",
+        "netmask*",
+        "comment",
+    ]
+
+
+def test_split_row_without_header(tmp_path):
+    source = tmp_path / "export.csv"
+    source.write_text(
+        "header-network,address*,netmask*\r\n"
+        "network,10.0.0.0,255.255.255.0\r\n"
+        "hostrecord,h.example.com,10.0.0.1\r\n",
+        encoding="utf8",
+    )
+
+    counts = ibx_csv_file_split(str(source), str(tmp_path))
+
+    assert counts == {"network": 1}
+    assert not (tmp_path / "hostrecord.csv").exists()
@@ -0,0 +1,101 @@
+# File: tests/util/test_includes.py
+
+import os
+
+import pytest
+
+from ibx_sdk.util import util
+from ibx_sdk.util.util import generate_from_includes, iter_from_includes
+
+
+@pytest.fixture
+def chroot(tmp_path):
+    etc = tmp_path / "etc"
+    etc.mkdir()
+    (etc / "named.conf").write_text(
+        'options { directory "/var/named"; };\n'
+        'include "/etc/named.conf.zones";\n'
+        'include "/etc/missing.conf";\n'
+        "logging { };\n"
+    )
+    (etc / "named.conf.zones").write_text(
+        'view "internal" {\n'
+        '    include "/etc/zones.internal";\n'
+        "};\n"
+        'view "external" {\n'
+        '\tinclude "/etc/zones.internal";\n'
+        "};\n"
+    )
+    (etc / "zones.internal").write_text('zone "example.com" { type master; };\n')
+    return str(tmp_path)
+
+
+def test_generate_from_includes(chroot):
+    data = generate_from_includes(chroot, "/etc/named.conf")
+
+    assert data == (
+        'options { directory "/var/named"; };\n'
+        'view "internal" {\n'
+        'zone "example.com" { type master; };\n'
+        "};\n"
+        'view "external" {\n'
+        'zone "example.com" { type master; };\n'
+        "};\n"
+        "logging { };\n"
+    )
+
+
+def test_generate_from_includes_output_file(chroot, tmp_path):
+    output_file = str(tmp_path / "named.conf.full")
+
+    assert generate_from_includes(chroot, "etc/named.conf", output_file) == output_file
+    with open(output_file) as file:
+        assert file.read() == generate_from_includes(chroot, "etc/named.conf")
+
+
+def test_generate_from_includes_missing(chroot):
+    assert generate_from_includes(chroot, "/etc/nothere.conf") == ""
+
+
+def test_iter_from_includes_cycle(tmp_path):
+    (tmp_path / "a.conf").write_text('a1;\ninclude "/b.conf";\na2;\n')
+    (tmp_path / "b.conf").write_text('b1;\n  include "/a.conf";\nb2;\n')
+
+    assert (
+        "".join(iter_from_includes(str(tmp_path), "a.conf")) == "a1;\nb1;\nb2;\na2;\n"
+    )
+
+
+def test_iter_from_includes_modified(chroot):
+    before = generate_from_includes(chroot, "/etc/named.conf")
+    zones = os.path.join(chroot, "etc", "zones.internal")
+    with open(zones, "a") as file:
+        file.write('zone "example.net" { type master; };\n')
+
+    after = generate_from_includes(chroot, "/etc/named.conf")
+
+    assert after.count("example.net") == 2
+    assert len(after) > len(before)
+
+
+def test_iter_from_includes_large_file(chroot, monkeypatch):
+    monkeypatch.setattr(util, "INCLUDE_CACHE_MAX_SIZE", 10)
+    util._include_cache.clear()
+
+    streamed = generate_from_includes(chroot, "/etc/named.conf")
+    monkeypatch.undo()
+
+    assert util._include_cache.size == 0
+    assert streamed == generate_from_includes(chroot, "/etc/named.conf")
+    assert 0 < util._include_cache.size <= util.INCLUDE_CACHE_SIZE
+
+
+def test_include_cache_eviction(tmp_path):
+    cache = util._IncludeCache(max_size=20)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_text(f"{name * 9}\n")
+        stat = os.stat(tmp_path / name)
+        cache.get(str(tmp_path / name), stat.st_mtime_ns, stat.st_size)
+
+    assert cache.size == 20
+    assert list(cache._files) == [str(tmp_path / "b"), str(tmp_path / "c")]
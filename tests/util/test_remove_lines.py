@@ -0,0 +1,45 @@
+# File: tests/util/test_remove_lines.py
+
+import os
+import stat
+
+from ibx_sdk.util.util import remove_lines_from_file, remove_lines_from_files
+
+ZONE = "".join(f"host{i} IN A 10.0.0.{i}\n" for i in range(1, 11))
+
+
+def test_remove_lines(tmp_path):
+    zone = tmp_path / "db.example.com"
+    zone.write_text(ZONE, encoding="utf8")
+    os.chmod(zone, 0o640)
+
+    assert remove_lines_from_file(str(zone), [2, 3, 10, 42]) == 3
+
+    lines = zone.read_text(encoding="utf8").splitlines()
+    assert lines == [f"host{i} IN A 10.0.0.{i}" for i in (1, 4, 5, 6, 7, 8, 9)]
+    assert stat.S_IMODE(os.stat(zone).st_mode) == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["db.example.com"]
+
+
+def test_remove_lines_output_path(tmp_path):
+    zone = tmp_path / "db.example.com"
+    zone.write_text(ZONE, encoding="utf8")
+
+    assert remove_lines_from_file(str(zone), [], str(tmp_path / "out")) == 0
+
+    assert (tmp_path / "out").read_text(encoding="utf8") == ZONE
+    assert zone.read_text(encoding="utf8") == ZONE
+
+
+def test_remove_lines_from_files(tmp_path):
+    for name in ("db.a", "db.b"):
+        (tmp_path / name).write_text(ZONE, encoding="utf8")
+
+    removed = remove_lines_from_files(
+        {str(tmp_path / "db.a"): [1], str(tmp_path / "db.b"): {5, 6}},
+        output_dir=str(tmp_path / "out"),
+    )
+
+    assert removed == {str(tmp_path / "db.a"): 1, str(tmp_path / "db.b"): 2}
+    assert len((tmp_path / "out" / "db.b").read_text().splitlines()) == 8
+    assert (tmp_path / "db.a").read_text(encoding="utf8") == ZONE
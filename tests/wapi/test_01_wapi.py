@@ -6,7 +6,9 @@ import os
 
 import pytest
 import urllib3
+from urllib3.exceptions import ConnectTimeoutError
 
+from ibx_sdk.nios.adapter import WapiHTTPAdapter, WapiRetry
 from ibx_sdk.nios.exceptions import WapiInvalidParameterException, WapiRequestException
 from ibx_sdk.nios.gift import Gift
 
@@ -51,6 +53,38 @@ def test_instantiate_wapi_with_dictionary_of_arguments():
     assert wapi.ssl_verify == SSL_VERIFY
 
 
+def test_instantiate_wapi_with_pool_options():
+    wapi = Gift(pool_connections=2, pool_maxsize=32, keep_alive=False, tcp_nodelay=False)
+    assert wapi.pool_connections == 2
+    assert wapi.pool_maxsize == 32
+    assert wapi.keep_alive is False
+    assert wapi.tcp_nodelay is False
+
+
+def test_wapi_connection_uses_pooled_adapter(get_wapi):
+    wapi = get_wapi
+    adapter = wapi.conn.get_adapter(wapi.url)
+    assert isinstance(adapter, WapiHTTPAdapter)
+    assert adapter._pool_maxsize == wapi.pool_maxsize
+
+
+def test_wapi_retry_policy_does_not_retry_post_by_default():
+    retry = WapiRetry(total=3)
+    assert 'GET' in retry.allowed_methods
+    assert 'POST' not in retry.allowed_methods
+    assert 'POST' in WapiRetry(total=3, retry_post=True).allowed_methods
+    assert retry.respect_retry_after_header is True
+
+
+def test_wapi_retry_policy_shares_stats():
+    retry = WapiRetry(total=3)
+    new_retry = retry.increment(method='GET', url='/wapi/v2.12/grid', error=ConnectTimeoutError())
+    assert new_retry.stats is retry.stats
+    assert new_retry.total == 2
+    assert retry.stats.as_dict() == {'connect': 1}
+    assert retry.stats.total == 1
+
+
 def test_wapi_connect_with_bogus_server():
     wapi = Gift(grid_mgr='1.1.1.1')
     with pytest.raises(WapiRequestException):
@@ -202,3 +236,62 @@ def test_wapi_max_version(get_wapi):
     wapi = get_wapi
     wapi.max_wapi_ver()
     assert wapi.wapi_ver != '1.0'
+
+
+def test_wapi_iter_objects(get_wapi):
+    wapi = get_wapi
+    objects = list(wapi.iter_objects('networkview', page_size=1))
+    assert len(objects) >= 1
+    assert all('_ref' in obj for obj in objects)
+
+
+def test_wapi_iter_objects_invalid_page_size(get_wapi):
+    wapi = get_wapi
+    with pytest.raises(WapiInvalidParameterException):
+        list(wapi.iter_objects('networkview', page_size=0))
+
+
+def test_wapi_batch_create_and_delete(get_wapi):
+    wapi = get_wapi
+    with wapi.batch(chunk_size=2) as batch:
+        created = [
+            batch.post('record:a', data={'name': f'batch{i}.example.com', 'ipv4addr': f'192.0.2.{i + 10}'})
+            for i in range(3)
+        ]
+    refs = [item.result() for item in created]
+    assert all(isinstance(ref, str) for ref in refs)
+
+    with wapi.batch() as batch:
+        deleted = [batch.delete(ref) for ref in refs]
+    assert [item.result() for item in deleted] == refs
+
+
+def test_wapi_batch_item_error(get_wapi):
+    wapi = get_wapi
+    with wapi.batch() as batch:
+        good = batch.get('grid')
+        bad = batch.get('invalid_object')
+    assert isinstance(good.result(), list)
+    with pytest.raises(WapiRequestException):
+        bad.result()
+
+
+def test_wapi_map_get_in_order(get_wapi):
+    wapi = get_wapi
+    items = ['grid', 'networkview', 'grid']
+    responses = wapi.map('get', items, workers=3)
+    assert [res.status_code for res in responses] == [200, 200, 200]
+    assert responses[0].json() == responses[2].json()
+
+
+def test_wapi_map_collect_errors(get_wapi):
+    wapi = get_wapi
+    responses = wapi.map('get', ['grid', 'invalid_object'], workers=2, on_error='collect')
+    assert responses[0].status_code == 200
+    assert isinstance(responses[1], WapiRequestException)
+
+
+def test_wapi_map_raise_errors(get_wapi):
+    wapi = get_wapi
+    with pytest.raises(WapiRequestException):
+        wapi.map('get', ['grid', 'invalid_object'], workers=2)
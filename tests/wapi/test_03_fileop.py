@@ -105,6 +105,39 @@ def test_wapi_member_config(get_wapi):
     os.remove('dnsconf.tar.gz')
 
 
+def test_wapi_get_log_files_bulk(get_wapi, tmp_path):
+    wapi = get_wapi
+    manifest = wapi.get_log_files_bulk(
+        log_type='SYSLOG', members=[GRID_MEMBER], output_dir=str(tmp_path), workers=2
+    )
+    assert manifest['total'] == 1
+    assert manifest['failed'] == 0
+    assert os.path.exists(tmp_path / manifest['members'][0]['file'])
+    assert os.path.exists(tmp_path / 'manifest.json')
+
+
+def test_wapi_csv_export_bulk(get_wapi, tmp_path):
+    wapi = get_wapi
+    manifest = wapi.csv_export_bulk(
+        ['network', 'zone_auth'], output_dir=str(tmp_path), workers=2
+    )
+    assert manifest['failed'] == 0
+    assert [obj['object'] for obj in manifest['objects']] == ['network', 'zone_auth']
+    assert manifest['objects'][0]['rows'] >= 0
+    assert os.path.exists(tmp_path / 'zone_auth.csv')
+
+
+def test_wapi_member_config_bulk_unknown_member(get_wapi, tmp_path):
+    wapi = get_wapi
+    manifest = wapi.member_config_bulk(
+        conf_type='DNS_CFG',
+        members=[GRID_MEMBER, 'no-such-member.example.com'],
+        output_dir=str(tmp_path),
+    )
+    assert manifest['failed'] == 1
+    assert manifest['members'][1]['status'] == 'failed'
+
+
 def test_wapi_grid_backup(get_wapi):
     wapi = get_wapi
     wapi.grid_backup()
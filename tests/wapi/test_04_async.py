@@ -0,0 +1,42 @@
+"""
+WAPI test module
+"""
+import asyncio
+import logging
+import os
+
+import urllib3
+
+from ibx_sdk.nios.async_gift import AsyncGift
+
+log = logging.getLogger(__name__)
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+GRID_MGR = os.environ.get('GRID_MGR')
+WAPI_VER = os.environ.get('WAPI_VER')
+PASSWORD = os.environ.get('PASSWORD')
+USERNAME = os.environ.get('USERNAME')
+SSL_VERIFY = False if os.environ.get('SSL_VERIFY') == 'False' else True
+
+
+def test_async_wapi_concurrent_get():
+    async def run():
+        async with AsyncGift(GRID_MGR, WAPI_VER, SSL_VERIFY, max_concurrency=4) as wapi:
+            await wapi.connect(username=USERNAME, password=PASSWORD)
+            assert wapi.grid_ref is not None
+            return await asyncio.gather(*(wapi.get('grid') for _ in range(8)))
+
+    responses = asyncio.run(run())
+    assert len(responses) == 8
+    assert all(res.status_code == 200 for res in responses)
+
+
+def test_async_wapi_getone_and_fields():
+    async def run():
+        async with AsyncGift(GRID_MGR, WAPI_VER, SSL_VERIFY) as wapi:
+            await wapi.connect(username=USERNAME, password=PASSWORD)
+            return await wapi.getone('grid'), await wapi.object_fields('grid')
+
+    grid_ref, fields = asyncio.run(run())
+    assert isinstance(grid_ref, str)
+    assert isinstance(fields, str)
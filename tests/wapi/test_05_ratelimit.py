@@ -0,0 +1,91 @@
+"""
+WAPI rate limiter test module
+"""
+import time
+
+import pytest
+import requests
+
+from ibx_sdk.nios.async_gift import AsyncGift
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+from ibx_sdk.nios.gift import Gift
+from ibx_sdk.nios.ratelimit import RateLimiter
+
+
+def test_rate_limiter_invalid_rate():
+    with pytest.raises(WapiInvalidParameterException):
+        RateLimiter(rate=0)
+
+
+def test_rate_limiter_default_burst():
+    limiter = RateLimiter(rate=2.5)
+    assert limiter.burst == 3
+
+
+def test_rate_limiter_burst_does_not_wait():
+    limiter = RateLimiter(rate=1, burst=5)
+    waits = [limiter.acquire() for _ in range(5)]
+    assert all(wait == 0 for wait in waits)
+
+
+def test_rate_limiter_waits_when_empty():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_limiter_adaptive_decrease_and_recover():
+    limiter = RateLimiter(rate=10, adaptive=True, latency_target=0.5, min_rate=2)
+    limiter.update(latency=1.0)
+    assert limiter.current_rate == 5
+    # a second slow response within latency_target seconds does not halve again
+    limiter.update(latency=1.0)
+    assert limiter.current_rate == 5
+    for _ in range(10):
+        limiter.update(latency=0.1)
+    assert limiter.current_rate == 10
+
+
+def test_rate_limiter_adaptive_overload_status():
+    limiter = RateLimiter(rate=8, adaptive=True)
+    limiter.update(latency=0.1, status_code=503)
+    assert limiter.current_rate == 4
+
+
+def test_rate_limiter_not_adaptive():
+    limiter = RateLimiter(rate=8)
+    limiter.update(latency=60, status_code=503)
+    assert limiter.current_rate == 8
+
+
+def test_wapi_with_shared_rate_limiter():
+    limiter = RateLimiter(rate=10)
+    first = Gift(rate_limiter=limiter)
+    second = Gift(rate_limiter=limiter)
+    assert first.rate_limiter is second.rate_limiter
+
+
+def test_async_gift_installs_rate_limiter_on_wapi():
+    limiter = RateLimiter(rate=5)
+    wapi = Gift(grid_mgr='gm.example.com', wapi_ver='2.12', pool_maxsize=4)
+    async_wapi = AsyncGift(wapi=wapi, max_concurrency=8, rate_limiter=limiter)
+    async_wapi.close()
+    assert wapi.rate_limiter is limiter
+    assert wapi.pool_maxsize == 8
+
+
+def test_async_gift_rejects_conflicting_rate_limiter():
+    wapi = Gift(grid_mgr='gm.example.com', wapi_ver='2.12', rate_limiter=RateLimiter(rate=5))
+    with pytest.raises(WapiInvalidParameterException):
+        AsyncGift(wapi=wapi, rate_limiter=RateLimiter(rate=10))
+
+
+def test_async_gift_rejects_connected_wapi():
+    wapi = Gift(grid_mgr='gm.example.com', wapi_ver='2.12', pool_maxsize=4)
+    wapi.conn = requests.Session()
+    with pytest.raises(WapiInvalidParameterException):
+        AsyncGift(wapi=wapi, max_concurrency=8)
+    with pytest.raises(WapiInvalidParameterException):
+        AsyncGift(wapi=wapi, max_concurrency=4, rate_limiter=RateLimiter(rate=5))
@@ -0,0 +1,86 @@
+"""
+WAPI schema cache test module
+"""
+import time
+
+import pytest
+
+from ibx_sdk.nios.schema_cache import SchemaCache
+
+SCHEMA = {'fields': [{'name': 'name', 'supports': 'rwus'}]}
+
+
+def test_schema_cache_miss(tmp_path):
+    cache = SchemaCache(cache_dir=str(tmp_path))
+    assert cache.get('gm.example.com', '2.12', 'record:host') is None
+
+
+def test_schema_cache_persists_across_instances(tmp_path):
+    SchemaCache(cache_dir=str(tmp_path)).set('gm.example.com', '2.12', 'record:host', SCHEMA)
+    cache = SchemaCache(cache_dir=str(tmp_path))
+    assert cache.get('gm.example.com', '2.12', 'record:host') == SCHEMA
+
+
+def test_schema_cache_keyed_by_version_and_build(tmp_path):
+    cache = SchemaCache(cache_dir=str(tmp_path))
+    cache.set('gm.example.com', '2.12', 'record:host', SCHEMA, nios_build='9.0.3-50212')
+    assert cache.get('gm.example.com', '2.12', 'record:host', nios_build='9.0.3-50212') == SCHEMA
+    assert cache.get('gm.example.com', '2.12', 'record:host', nios_build='9.0.4-51000') is None
+    assert cache.get('gm.example.com', '2.11', 'record:host', nios_build='9.0.3-50212') is None
+
+
+def test_schema_cache_ttl(tmp_path):
+    cache = SchemaCache(cache_dir=str(tmp_path), ttl=0)
+    cache.set('gm.example.com', '2.12', 'record:host', SCHEMA)
+    time.sleep(0.01)
+    assert cache.get('gm.example.com', '2.12', 'record:host') is None
+
+
+def test_schema_cache_invalidate(tmp_path):
+    cache = SchemaCache(cache_dir=str(tmp_path))
+    cache.set('gm1.example.com', '2.12', 'record:host', SCHEMA)
+    cache.set('gm2.example.com', '2.12', 'record:host', SCHEMA)
+    cache.invalidate('gm1.example.com', '2.12')
+    assert cache.get('gm1.example.com', '2.12', 'record:host') is None
+    assert cache.get('gm2.example.com', '2.12', 'record:host') == SCHEMA
+    cache.invalidate()
+    assert cache.get('gm2.example.com', '2.12', 'record:host') is None
+
+
+def test_schema_cache_invalidate_grid_all_versions(tmp_path):
+    cache = SchemaCache(cache_dir=str(tmp_path))
+    cache.set('gm1.example.com', '2.11', 'record:host', SCHEMA)
+    cache.set('gm1.example.com', '2.12', 'record:host', SCHEMA, nios_build='9.0.3-50212')
+    cache.set('gm1-v2.example.com', '2.12', 'record:host', SCHEMA)
+    cache.invalidate('gm1.example.com')
+    fresh = SchemaCache(cache_dir=str(tmp_path))
+    assert fresh.get('gm1.example.com', '2.11', 'record:host') is None
+    assert fresh.get('gm1.example.com', '2.12', 'record:host', nios_build='9.0.3-50212') is None
+    assert fresh.get('gm1-v2.example.com', '2.12', 'record:host') == SCHEMA
+
+
+def test_schema_cache_invalidate_keeps_other_files(tmp_path):
+    (tmp_path / 'notes.txt').write_text('keep')
+    (tmp_path / 'other').mkdir()
+    (tmp_path / 'other' / 'data.json').write_text('{}')
+    cache = SchemaCache(cache_dir=str(tmp_path))
+    cache.set('gm.example.com', '2.12', 'record:host', SCHEMA)
+    cache.invalidate()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['notes.txt', 'other']
+    assert (tmp_path / 'other' / 'data.json').exists()
+
+
+def test_schema_cache_set_removes_temp_file(tmp_path):
+    cache = SchemaCache(cache_dir=str(tmp_path))
+    with pytest.raises(TypeError):
+        cache.set('gm.example.com', '2.12', 'record:host', {'bad': object()})
+    assert [p.name for p in tmp_path.rglob('*') if p.is_file()] == []
+
+
+def test_schema_cache_lru_without_persistence(tmp_path):
+    cache = SchemaCache(cache_dir=str(tmp_path), maxsize=2, persist=False)
+    for wapi_object in ['network', 'record:a', 'record:host']:
+        cache.set('gm.example.com', '2.12', wapi_object, SCHEMA)
+    assert cache.get('gm.example.com', '2.12', 'network') is None
+    assert cache.get('gm.example.com', '2.12', 'record:host') == SCHEMA
+    assert list(tmp_path.iterdir()) == []
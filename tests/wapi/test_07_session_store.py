@@ -0,0 +1,64 @@
+"""
+WAPI session store test module
+"""
+import os
+import stat
+
+import pytest
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+from ibx_sdk.nios.session_store import SessionStore
+
+
+def test_session_store_missing_session(tmp_path):
+    store = SessionStore(store_dir=str(tmp_path), allow_plaintext=True)
+    assert store.load('gm.example.com', 'admin') is None
+
+
+def test_session_store_save_and_load(tmp_path, monkeypatch):
+    monkeypatch.delenv('IBX_SESSION_KEY', raising=False)
+    store = SessionStore(store_dir=str(tmp_path), allow_plaintext=True)
+    store.save('gm.example.com', 'admin', 'cookie-value')
+    assert store.encrypted is False
+    assert store.load('gm.example.com', 'admin') == 'cookie-value'
+    assert store.load('gm.example.com', 'other') is None
+    assert store.load('gm2.example.com', 'admin') is None
+
+
+def test_session_store_file_permissions(tmp_path):
+    store = SessionStore(store_dir=str(tmp_path), allow_plaintext=True)
+    store.save('gm.example.com', 'admin', 'cookie-value')
+    (session_file,) = list(tmp_path.iterdir())
+    assert stat.S_IMODE(os.stat(session_file).st_mode) == 0o600
+
+
+def test_session_store_delete(tmp_path):
+    store = SessionStore(store_dir=str(tmp_path), allow_plaintext=True)
+    store.save('gm.example.com', 'admin', 'cookie-value')
+    store.delete('gm.example.com', 'admin')
+    store.delete('gm.example.com', 'admin')
+    assert store.load('gm.example.com', 'admin') is None
+
+
+def test_session_store_encrypted(tmp_path):
+    fernet = pytest.importorskip('cryptography.fernet')
+    key = fernet.Fernet.generate_key()
+    store = SessionStore(store_dir=str(tmp_path), key=key)
+    store.save('gm.example.com', 'admin', 'cookie-value')
+    (session_file,) = list(tmp_path.iterdir())
+    assert b'cookie-value' not in session_file.read_bytes()
+    assert store.load('gm.example.com', 'admin') == 'cookie-value'
+    other = SessionStore(store_dir=str(tmp_path), key=fernet.Fernet.generate_key())
+    assert other.load('gm.example.com', 'admin') is None
+
+
+def test_session_store_invalid_key(tmp_path):
+    pytest.importorskip('cryptography.fernet')
+    with pytest.raises(WapiInvalidParameterException):
+        SessionStore(store_dir=str(tmp_path), key='not-a-valid-key')
+
+
+def test_session_store_requires_key(tmp_path, monkeypatch):
+    monkeypatch.delenv('IBX_SESSION_KEY', raising=False)
+    with pytest.raises(WapiInvalidParameterException):
+        SessionStore(store_dir=str(tmp_path))
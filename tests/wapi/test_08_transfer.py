@@ -0,0 +1,341 @@
+"""
+WAPI file transfer test module
+"""
+import gzip
+import io
+import os
+
+import pytest
+import requests
+import urllib3
+
+from ibx_sdk.nios.exceptions import WapiInvalidParameterException
+from ibx_sdk.nios.transfer import (
+    MultipartFileStream,
+    RangeDownload,
+    TransferProgress,
+    check_compression,
+    compressed_filename,
+    compression_from_filename,
+    open_compressed,
+    uncompressed_size,
+    write_response,
+)
+
+
+def _write(path, size):
+    data = os.urandom(size)
+    path.write_bytes(data)
+    return data
+
+
+def _response(body, headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers or {'Content-Length': str(len(body))})
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body),
+        headers=response.headers,
+        preload_content=False,
+        decode_content=False,
+    )
+    return response
+
+
+def test_multipart_stream_body(tmp_path):
+    data = _write(tmp_path / 'upload.bin', 100_000)
+    with open(tmp_path / 'upload.bin', 'rb') as fh:
+        body = MultipartFileStream(fh, chunk_size=4096)
+        content = b''.join(body)
+    boundary = body.boundary.encode()
+    assert len(content) == len(body)
+    assert body.content_type == f'multipart/form-data; boundary={body.boundary}'
+    assert content.startswith(
+        b'--' + boundary + b'\r\nContent-Disposition: form-data; name="file"; filename="file"\r\n\r\n'
+    )
+    assert content.endswith(b'\r\n--' + boundary + b'--\r\n')
+    assert data in content
+
+
+def test_multipart_stream_chunk_size(tmp_path):
+    _write(tmp_path / 'upload.bin', 10_000)
+    with open(tmp_path / 'upload.bin', 'rb') as fh:
+        chunks = list(MultipartFileStream(fh, chunk_size=4096))
+    assert max(len(chunk) for chunk in chunks) == 4096
+
+
+def test_multipart_stream_rewind(tmp_path):
+    _write(tmp_path / 'upload.bin', 10_000)
+    with open(tmp_path / 'upload.bin', 'rb') as fh:
+        body = MultipartFileStream(fh, chunk_size=1024)
+        first = b''.join(body)
+        assert body.tell() == len(body)
+        body.seek(0)
+        assert b''.join(body) == first
+
+
+def test_multipart_stream_progress(tmp_path):
+    _write(tmp_path / 'upload.bin', 10_000)
+    updates = []
+    with open(tmp_path / 'upload.bin', 'rb') as fh:
+        body = MultipartFileStream(fh, chunk_size=1024, progress=updates.append)
+        b''.join(body)
+    progress = updates[-1]
+    assert progress.done
+    assert progress.transferred == progress.total == len(body)
+    assert progress.percent == 100.0
+    assert progress.rate > 0
+
+
+def test_transfer_progress_unknown_total():
+    progress = TransferProgress('file.bin')
+    progress.update(10)
+    assert progress.percent is None
+    assert not progress.done
+    progress.finish()
+    assert progress.done
+
+
+def test_write_response(tmp_path):
+    data = os.urandom(3_000_000)
+    updates = []
+    progress = write_response(
+        _response(data),
+        str(tmp_path / 'download.bin'),
+        buffer_size=1024,
+        max_buffer_size=65536,
+        progress=updates.append,
+    )
+    assert (tmp_path / 'download.bin').read_bytes() == data
+    assert progress.done
+    assert progress.transferred == progress.total == len(data)
+    # the buffer grows from 1 KiB to 64 KiB, so far fewer writes than 1 KiB chunks
+    assert len(updates) < len(data) // 65536 + 10
+
+
+def test_write_response_incomplete(tmp_path):
+    response = _response(b'x' * 100, headers={'Content-Length': '1000'})
+    with pytest.raises(requests.exceptions.ConnectionError):
+        write_response(response, str(tmp_path / 'download.bin'))
+
+
+def test_write_response_content_encoding(tmp_path):
+    data = b'header-network,address,netmask\n' * 1000
+    body = gzip.compress(data)
+    response = _response(
+        body, headers={'Content-Length': str(len(body)), 'Content-Encoding': 'gzip'}
+    )
+    write_response(response, str(tmp_path / 'download.csv'))
+    assert (tmp_path / 'download.csv').read_bytes() == data
+
+
+class RangeSession:
+    """Fake session serving a file with (or without) range request support."""
+
+    def __init__(self, data, ranges=True, etag='"v1"', fail_after=None):
+        self.data = data
+        self.ranges = ranges
+        self.etag = etag
+        self.fail_after = fail_after
+        self.requests = []
+
+    def get(self, url, stream=True, headers=None, **kwargs):
+        range_header = (headers or {}).get('Range')
+        self.requests.append(range_header)
+        if not (self.ranges and range_header):
+            return _response(self.data)
+        start, end = range_header[len('bytes='):].split('-')
+        start, end = int(start), min(int(end), len(self.data) - 1)
+        body = self.data[start:end + 1]
+        headers = {
+            'Content-Length': str(len(body)),
+            'Content-Range': f'bytes {start}-{end}/{len(self.data)}',
+            'ETag': self.etag,
+        }
+        if self.fail_after is not None and len(body) > 1:
+            # send part of the range, then drop the connection
+            body, self.fail_after = body[:self.fail_after], None
+        response = _response(body, headers=headers)
+        response.status_code = 206
+        return response
+
+
+def test_range_download_parallel(tmp_path, monkeypatch):
+    monkeypatch.setattr('ibx_sdk.nios.transfer.MIN_SEGMENT_SIZE', 1000)
+    data = os.urandom(10_000)
+    session = RangeSession(data)
+    target = str(tmp_path / 'bundle.tar.gz')
+    progress = RangeDownload(session, 'https://gm/file', target, parallel=4).run()
+    assert (tmp_path / 'bundle.tar.gz').read_bytes() == data
+    assert not os.path.exists(target + '.part')
+    assert not os.path.exists(target + '.part.json')
+    assert progress.done and progress.transferred == len(data)
+    assert len(session.requests) == 5
+
+
+def test_range_download_without_range_support(tmp_path):
+    data = os.urandom(10_000)
+    session = RangeSession(data, ranges=False)
+    target = str(tmp_path / 'bundle.tar.gz')
+    RangeDownload(session, 'https://gm/file', target, parallel=4).run()
+    assert (tmp_path / 'bundle.tar.gz').read_bytes() == data
+    assert len(session.requests) == 1
+
+
+def test_range_download_retries_from_last_byte(tmp_path, monkeypatch):
+    monkeypatch.setattr('ibx_sdk.nios.transfer.time.sleep', lambda seconds: None)
+    data = os.urandom(10_000)
+    session = RangeSession(data, fail_after=4000)
+    target = str(tmp_path / 'bundle.tar.gz')
+    RangeDownload(session, 'https://gm/file', target).run()
+    assert (tmp_path / 'bundle.tar.gz').read_bytes() == data
+    assert session.requests[-1] == 'bytes=4000-9999'
+
+
+def test_range_download_resume(tmp_path):
+    data = os.urandom(10_000)
+    target = str(tmp_path / 'bundle.tar.gz')
+    with pytest.raises(requests.exceptions.ConnectionError):
+        RangeDownload(
+            RangeSession(data, fail_after=6000), 'https://gm/file', target, retries=0
+        ).run()
+    assert not os.path.exists(target)
+    assert os.path.exists(target + '.part.json')
+
+    session = RangeSession(data)
+    progress = RangeDownload(session, 'https://gm/other-token', target).run()
+    assert (tmp_path / 'bundle.tar.gz').read_bytes() == data
+    assert session.requests[-1] == 'bytes=6000-9999'
+    assert progress.resumed == 6000
+
+
+def test_range_download_restarts_changed_file(tmp_path):
+    target = str(tmp_path / 'bundle.tar.gz')
+    with pytest.raises(requests.exceptions.ConnectionError):
+        RangeDownload(
+            RangeSession(os.urandom(10_000), fail_after=6000),
+            'https://gm/file',
+            target,
+            retries=0,
+        ).run()
+
+    data = os.urandom(10_000)
+    session = RangeSession(data, etag='"v2"')
+    RangeDownload(session, 'https://gm/file', target).run()
+    assert (tmp_path / 'bundle.tar.gz').read_bytes() == data
+    assert session.requests[-1] == 'bytes=0-9999'
+
+
+def test_compression_filenames():
+    assert compression_from_filename('networks.csv.gz') == 'gzip'
+    assert compression_from_filename('networks.CSV.ZST') == 'zstd'
+    assert compression_from_filename('networks.csv') is None
+    assert compressed_filename('networks.csv', 'gzip') == 'networks.csv.gz'
+    assert compressed_filename('networks.csv.gz', 'gzip') == 'networks.csv.gz'
+    assert compressed_filename('networks.csv', 'zstd') == 'networks.csv.zst'
+
+
+def test_check_compression_unsupported():
+    with pytest.raises(WapiInvalidParameterException):
+        check_compression('bzip2')
+
+
+def test_write_response_compressed(tmp_path):
+    data = b'header-network,address,netmask\n' * 10_000
+    target = str(tmp_path / 'networks.csv.gz')
+    write_response(_response(data), target, compress='gzip')
+    assert gzip.decompress((tmp_path / 'networks.csv.gz').read_bytes()) == data
+
+
+@pytest.mark.parametrize('compression', ['gzip', 'zstd'])
+def test_multipart_stream_decompressed(tmp_path, compression):
+    if compression == 'zstd':
+        try:
+            check_compression('zstd')
+        except WapiInvalidParameterException:
+            pytest.skip('zstd is not available')
+    data = b'header-network,address,netmask\n' * 10_000
+    source = str(tmp_path / f'networks.csv.{compression}')
+    with open_compressed(source, 'wb', compression) as file:
+        file.write(data)
+    size = uncompressed_size(source, compression)
+    assert size == len(data)
+    with open_compressed(source, 'rb', compression) as fh:
+        body = MultipartFileStream(fh, chunk_size=4096, size=size)
+        content = b''.join(body)
+    assert len(content) == len(body)
+    assert data in content
+
+
+def test_range_download_compressed(tmp_path):
+    data = os.urandom(1000) * 10
+    session = RangeSession(data)
+    target = str(tmp_path / 'leases.csv.gz')
+    RangeDownload(session, 'https://gm/file', target, compress='gzip').run()
+    assert gzip.decompress((tmp_path / 'leases.csv.gz').read_bytes()) == data
+    assert session.requests == [None]
+
+
+class ExportSession:
+    """Fake session running a CSV export of a single object."""
+
+    def __init__(self, body):
+        self.body = body
+        self.posts = []
+        self.cookies = {'ibapauth': 'cookie'}
+
+    def request(self, method, url, json=None, **kwargs):
+        self.posts.append((url, kwargs.get('params'), json))
+        response = requests.Response()
+        response.status_code = 200
+        if kwargs.get('params', {}).get('_function') == 'csv_export':
+            response._content = (
+                b'{"token": "tok", "url": "https://gm/http_direct_file_io/req_id-DOWNLOAD/Networks.csv"}'
+            )
+        else:
+            response._content = b'{}'
+        return response
+
+    def get(self, url, stream=True, **kwargs):
+        return _response(self.body)
+
+
+EXPORT_BODY = (
+    '﻿header-network,address*,netmask*,comment\r\n'
+    'network,10.0.0.0,255.255.255.0,first\r\n'
+    'network,10.1.0.0,255.255.0.0,second\r\n'
+).encode('utf-8')
+
+
+def test_csv_export_iter(caplog):
+    from ibx_sdk.nios.csv.dhcp import IPv4Network
+    from ibx_sdk.nios.gift import Gift
+
+    body = EXPORT_BODY
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = ExportSession(body)
+
+    networks = list(wapi.csv_export_iter('network'))
+
+    assert [type(network) for network in networks] == [IPv4Network, IPv4Network]
+    assert [network.comment for network in networks] == ['first', 'second']
+    functions = [params['_function'] for _, params, _ in wapi.conn.posts]
+    assert functions == ['csv_export', 'downloadcomplete']
+    assert 'parsed 2 network object(s)' in caplog.messages
+    assert 'file networks.csv download complete' in caplog.messages
+
+
+def test_csv_export_iter_stopped(caplog):
+    from ibx_sdk.nios.gift import Gift
+
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = ExportSession(EXPORT_BODY)
+
+    networks = wapi.csv_export_iter('network')
+    next(networks)
+    networks.close()
+
+    functions = [params['_function'] for _, params, _ in wapi.conn.posts]
+    assert functions == ['csv_export', 'downloadcomplete']
+    assert 'file networks.csv download aborted' in caplog.messages
+    assert not [m for m in caplog.messages if m.startswith('parsed 1')]
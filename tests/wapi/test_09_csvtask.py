@@ -0,0 +1,314 @@
+"""
+WAPI CSV import task monitor test module
+"""
+import io
+import json
+
+import pytest
+import requests
+import urllib3
+
+from ibx_sdk.nios.csvtask import CsvImportProgress
+from ibx_sdk.nios.exceptions import WapiRequestException
+from ibx_sdk.nios.gift import Gift
+
+
+class Clock:
+    """Fake monotonic clock advanced by time.sleep."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('time.monotonic', clock.monotonic)
+    monkeypatch.setattr('time.sleep', clock.sleep)
+    return clock
+
+
+def _task(ref, file_name='networks.csv', import_id=1):
+    return {
+        'csv_import_task': {
+            '_ref': ref,
+            'file_name': file_name,
+            'import_id': import_id,
+            'status': 'PENDING',
+        }
+    }
+
+
+class TaskSession:
+    """Fake session serving a sequence of csvimporttask states per task."""
+
+    def __init__(self, states, fail=0):
+        self.states = states
+        self.fail = fail
+        self.cookies = {'ibapauth': 'cookie'}
+        self.polls = []
+        self.posts = []
+
+    def request(self, method, url, json=None, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        if method == 'get':
+            ref = url.rsplit('/', 2)[-2] + '/' + url.rsplit('/', 1)[-1]
+            self.polls.append(ref)
+            if self.fail:
+                self.fail -= 1
+                response.status_code = 503
+                response._content = b'{"Error": "busy"}'
+                return response
+            states = self.states[ref]
+            state = states.pop(0) if len(states) > 1 else states[0]
+            response._content = _json(state)
+        else:
+            self.posts.append(kwargs.get('params', {}).get('_function'))
+            response._content = b'{"token": "tok", "url": "https://gm/dl/csv-errors.csv"}'
+        return response
+
+    def get(self, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        body = b'header-network,address*\r\n'
+        response.raw = urllib3.HTTPResponse(
+            body=io.BytesIO(body),
+            headers={'Content-Length': str(len(body))},
+            preload_content=False,
+        )
+        return response
+
+
+def _json(obj):
+    return json.dumps(obj).encode()
+
+
+def _state(status, processed=0, failed=0):
+    return {'status': status, 'lines_processed': processed, 'lines_failed': failed}
+
+
+def test_progress_rate_and_eta(clock):
+    progress = CsvImportProgress(_task('csvimporttask/a'), total=1000)
+    progress.update(_state('RUNNING', 100))
+    clock.now += 10
+    progress.update(_state('RUNNING', 300))
+
+    assert progress.rate == pytest.approx(20.0)
+    assert progress.eta == pytest.approx(35.0)
+    assert progress.percent == pytest.approx(30.0)
+    assert not progress.done
+
+
+def test_progress_backoff(clock):
+    progress = CsvImportProgress(_task('csvimporttask/a'), max_interval=10)
+    intervals = []
+    for _ in range(8):
+        progress.update(_state('PENDING'))
+        intervals.append(progress.interval)
+
+    assert intervals == sorted(intervals)
+    assert intervals[0] == pytest.approx(1.5)
+    assert intervals[-1] == 10
+
+
+def test_progress_polls_sooner_near_the_end(clock):
+    progress = CsvImportProgress(_task('csvimporttask/a'), total=1000)
+    progress.interval = 30
+    progress.update(_state('RUNNING', 0))
+    clock.now += 10
+    progress.update(_state('RUNNING', 900))
+
+    assert progress.interval == pytest.approx(1.0)
+
+
+def test_progress_failed():
+    progress = CsvImportProgress(_task('csvimporttask/a'))
+    progress.update(_state('COMPLETED', 10, failed=2))
+    assert progress.done
+    assert progress.failed
+
+
+def test_wait_csv_import(clock, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = TaskSession(
+        {
+            'csvimporttask/a': [
+                _state('PENDING'),
+                _state('RUNNING', 100),
+                _state('RUNNING', 500),
+                _state('COMPLETED', 1000),
+            ]
+        }
+    )
+    seen = []
+
+    result = wapi.wait_csv_import(
+        _task('csvimporttask/a'), total=1000, progress=lambda p: seen.append(p.status)
+    )
+
+    assert result.status == 'COMPLETED'
+    assert not result.failed
+    assert seen == ['RUNNING', 'RUNNING', 'COMPLETED']
+    assert wapi.conn.posts == []
+
+
+def test_wait_csv_imports_fetches_errors(clock, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = TaskSession(
+        {
+            'csvimporttask/a': [_state('RUNNING', 10), _state('COMPLETED', 20)],
+            'csvimporttask/b': [
+                _state('RUNNING', 5),
+                _state('RUNNING', 6),
+                _state('FAILED', 6, failed=1),
+            ],
+        }
+    )
+
+    results = wapi.wait_csv_imports(
+        [_task('csvimporttask/a'), _task('csvimporttask/b', 'hosts.csv', 2)]
+    )
+
+    assert [result.status for result in results] == ['COMPLETED', 'FAILED']
+    assert results[1].errors_file == 'csv-errors-hosts.csv.csv'
+    assert (tmp_path / 'csv-errors-hosts.csv.csv').exists()
+    assert wapi.conn.posts == ['csv_error_log', 'downloadcomplete']
+
+
+def test_wait_csv_import_tolerates_transient_errors(clock):
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = TaskSession({'csvimporttask/a': [_state('COMPLETED', 1)]}, fail=2)
+
+    assert wapi.wait_csv_import(_task('csvimporttask/a')).status == 'COMPLETED'
+    assert len(wapi.conn.polls) == 3
+
+
+def test_wait_csv_import_timeout(clock):
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = TaskSession({'csvimporttask/a': [_state('RUNNING', 1)]})
+
+    with pytest.raises(WapiRequestException):
+        wapi.wait_csv_import(_task('csvimporttask/a'), timeout=60)
+    assert clock.now <= 1060
+
+
+class ImportSession(TaskSession):
+    """Fake session running CSV import tasks, failing the shards in `fail`."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.cookies = {'ibapauth': 'cookie'}
+        self.uploads = []
+        self.imports = []
+        self.tasks = {}
+
+    def request(self, method, url, json=None, params=None, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        function = (params or {}).get('_function')
+        if method == 'get':
+            ref = 'csvimporttask/' + url.rsplit('/', 1)[-1]
+            file_name = self.tasks[ref]
+            status = 'FAILED' if file_name in self.fail else 'COMPLETED'
+            response._content = _json(_state(status, 1, failed=int(status == 'FAILED')))
+        elif function == 'uploadinit':
+            self.uploads.append(json['filename'])
+            response._content = _json({'url': 'https://gm/upload', 'token': json['filename']})
+        elif function == 'csv_import':
+            ref = f'csvimporttask/{len(self.imports)}'
+            self.imports.append(json['token'])
+            self.tasks[ref] = json['token']
+            response._content = _json(
+                {'csv_import_task': {'_ref': ref, 'file_name': json['token'], 'status': 'PENDING'}}
+            )
+        elif function == 'csv_error_log':
+            response._content = b'{"token": "tok", "url": "https://gm/dl/csv-errors.csv"}'
+        else:
+            response._content = b'{}'
+        return response
+
+    def post(self, url, data=None, **kwargs):
+        b''.join(data)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b''
+        return response
+
+
+SOURCE = (
+    'header-hostrecord,fqdn*,addresses\r\n'
+    'hostrecord,h1.example.com,10.0.0.1\r\n'
+    'hostrecord,h2.example.com,10.0.0.2\r\n'
+    'hostrecord,h3.example.com,10.0.0.3\r\n'
+    'header-network,address*,netmask*\r\n'
+    'network,10.0.0.0,255.255.255.0\r\n'
+    'header-networkview,name*\r\n'
+    'networkview,default\r\n'
+)
+
+
+def test_csv_import_sharded(clock, tmp_path):
+    source = tmp_path / 'import.csv'
+    source.write_text(SOURCE, encoding='utf8')
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = ImportSession()
+
+    checkpoint = wapi.csv_import_sharded('INSERT', str(source), shard_rows=2)
+
+    assert wapi.conn.imports == [
+        'networkview_0001.csv',
+        'network_0001.csv',
+        'hostrecord_0001.csv',
+        'hostrecord_0002.csv',
+    ]
+    assert {shard['status'] for shard in checkpoint['shards']} == {'completed'}
+    assert (tmp_path / 'import.csv.shards' / 'checkpoint.json').exists()
+
+
+def test_csv_import_sharded_resume(clock, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / 'import.csv'
+    source.write_text(SOURCE, encoding='utf8')
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = ImportSession(fail=['hostrecord_0001.csv'])
+
+    with pytest.raises(WapiRequestException):
+        wapi.csv_import_sharded('INSERT', str(source), shard_rows=2)
+    assert wapi.conn.imports[-1] == 'hostrecord_0001.csv'
+
+    wapi.conn = ImportSession()
+    checkpoint = wapi.csv_import_sharded('INSERT', str(source), shard_rows=2)
+
+    assert wapi.conn.imports == ['hostrecord_0001.csv', 'hostrecord_0002.csv']
+    assert {shard['status'] for shard in checkpoint['shards']} == {'completed'}
+
+
+def test_csv_import_sharded_waits_for_submitted_shard(clock, tmp_path):
+    source = tmp_path / 'import.csv'
+    source.write_text(SOURCE, encoding='utf8')
+    wapi = Gift(grid_mgr='gm', wapi_ver='2.12')
+    wapi.conn = ImportSession()
+    wapi.csv_import_sharded('INSERT', str(source), shard_rows=2)
+
+    checkpoint_file = tmp_path / 'import.csv.shards' / 'checkpoint.json'
+    state = json.loads(checkpoint_file.read_text())
+    state['shards'][-1]['status'] = 'submitted'
+    checkpoint_file.write_text(json.dumps(state))
+    tasks = wapi.conn.tasks
+    wapi.conn = ImportSession()
+    wapi.conn.tasks = tasks
+
+    wapi.csv_import_sharded('INSERT', str(source), shard_rows=2)
+
+    assert wapi.conn.imports == []
@@ -0,0 +1,110 @@
+"""
+WAPI multi-request batch test module
+"""
+import json
+
+import pytest
+import requests
+
+from ibx_sdk.nios.batch import WapiBatch
+from ibx_sdk.nios.exceptions import WapiRequestException
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.text = json.dumps(body)
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class FakeConn:
+    """
+    Stand-in for the requests session of Gift, which rejects a multi-request with a 400
+    when it has a bad operation, like WAPI.
+    """
+
+    def __init__(self, status_code=None, error=None):
+        self.status_code = status_code
+        self.error = error
+        self.calls = []
+
+    def request(self, method, url, json=None, verify=None):
+        self.calls.append([item['object'] for item in json])
+        if self.error:
+            raise self.error
+        if self.status_code:
+            return FakeResponse(self.status_code, {'Error': 'internal error'})
+        if any(item['object'].startswith('bad') for item in json):
+            return FakeResponse(400, {'Error': 'AdmConDataError'})
+        return FakeResponse(200, [f"{item['object']}/ref" for item in json])
+
+
+class FakeWapi:
+    url = 'https://grid/wapi/v2.12'
+    ssl_verify = False
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+def test_batch_splits_rejected_chunk_in_halves():
+    conn = FakeConn()
+    batch = WapiBatch(FakeWapi(conn), chunk_size=8)
+    for name in ['a', 'b', 'c', 'bad', 'd', 'e', 'f', 'g']:
+        batch.post(name, data={})
+
+    assert [item.wapi_object for item in batch.errors] == ['bad']
+    assert [item.result() for item in batch.items if item.error is None] == [
+        'a/ref', 'b/ref', 'c/ref', 'd/ref', 'e/ref', 'f/ref', 'g/ref'
+    ]
+    assert conn.calls == [
+        ['a', 'b', 'c', 'bad', 'd', 'e', 'f', 'g'],
+        ['a', 'b', 'c', 'bad'],
+        ['a', 'b'],
+        ['c', 'bad'],
+        ['c'],
+        ['bad'],
+        ['d', 'e', 'f', 'g'],
+    ]
+
+
+def test_batch_does_not_resend_on_transport_error():
+    conn = FakeConn(error=requests.exceptions.ReadTimeout('read timed out'))
+    batch = WapiBatch(FakeWapi(conn), chunk_size=10)
+    for name in ['a', 'b', 'c']:
+        batch.post(name, data={})
+
+    with pytest.raises(WapiRequestException):
+        batch.flush()
+    assert conn.calls == [['a', 'b', 'c']]
+    assert len(batch.errors) == 3
+
+
+@pytest.mark.parametrize('status_code', [401, 403, 500])
+def test_batch_does_not_resend_on_other_errors(status_code):
+    conn = FakeConn(status_code=status_code)
+    batch = WapiBatch(FakeWapi(conn), chunk_size=10)
+    for name in ['a', 'b', 'c']:
+        batch.post(name, data={})
+
+    batch.flush()
+    assert conn.calls == [['a', 'b', 'c']]
+    assert len(batch.errors) == 3
+    with pytest.raises(WapiRequestException):
+        batch.items[0].result()
+
+
+def test_batch_get_sends_search_fields_as_data():
+    batch = WapiBatch(FakeWapi(FakeConn()), chunk_size=10)
+    item = batch.get('network', {'network': '10.0.0.0/24', '_return_fields': 'comment'})
+
+    assert item.payload == {
+        'method': 'GET',
+        'object': 'network',
+        'data': {'network': '10.0.0.0/24'},
+        'args': {'_return_fields': 'comment'},
+    }
+    assert batch.get('network').payload == {'method': 'GET', 'object': 'network'}